@@ -13,7 +13,11 @@ from brownie.convert.datatypes import Wei
 from brownie.network.state import Chain
 from brownie.convert import to_bytes
 from scripts.common import deployArtifact, get_vault_config, set_flags
+from scripts.balancer.strategy_config import BalancerStrategyConfig, VaultSettings
 from scripts.EnvironmentConfig import Environment
+from scripts.date_time import get_maturity
+from scripts.tx_pipeline import TxPipeline
+from scripts.view_cache import viewCache
 from eth_utils import keccak
 
 chain = Chain()
@@ -21,88 +25,93 @@ ETH_ADDRESS = "0x0000000000000000000000000000000000000000"
 
 StrategyConfig = {
     "balancer2TokenStrats": {
-        "StratStableETHstETH": {
-            "vaultConfig": get_vault_config(
+        "StratStableETHstETH": BalancerStrategyConfig(
+            vaultConfig=get_vault_config(
                 flags=set_flags(0, ENABLED=True, ALLOW_ROLL_POSITION=True),
                 currencyId=1,
                 minAccountBorrowSize=1,
                 maxBorrowMarketIndex=3,
                 secondaryBorrowCurrencies=[0,0]
             ),
-            "secondaryBorrowCurrency": None,
-            "maxPrimaryBorrowCapacity": 100_000_000e8,
-            "name": "Balancer Stable ETH-stETH Strategy",
-            "primaryCurrency": 1, # ETH
-            "poolId": "0x32296969ef14eb0c6d29669c550d4a0449130230000200000000000000000080",
-            "liquidityGauge": "0xcd4722b7c24c29e0413bdcd9e51404b4539d14ae",
-            "auraRewardPool": "0xdcee1c640cc270121faf145f231fd8ff1d8d5cd4",
-            "feeReceiver": "0x0190702d5e52e0269c9319144d3ad62a60ebe526",
-            "maxUnderlyingSurplus": 20e18, # 20 ETH
-            "maxBalancerPoolShare": Wei(1.5e3), # 15%
-            "settlementSlippageLimitPercent": Wei(0.15e6), # 0.15%
-            "postMaturitySettlementSlippageLimitPercent": Wei(0.4e6), # 0.4%
-            "emergencySettlementSlippageLimitPercent": Wei(0.3e6), # 0.3%
-            "maxRewardTradeSlippageLimitPercent": 2e6, # 2%
-            "settlementCoolDownInMinutes": 20, # 20 minute settlement cooldown
-            "settlementWindow": 172800,  # 1-week settlement
-            "oraclePriceDeviationLimitPercent": 200, # +/- 2%
-            "balancerPoolSlippageLimitPercent": 9975, # 0.25%
-        },
-        "StratBoostedPoolDAIPrimary": {
-            "vaultConfig": get_vault_config(
+            secondaryBorrowCurrency=None,
+            maxPrimaryBorrowCapacity=100_000_000e8,
+            name="Balancer Stable ETH-stETH Strategy",
+            primaryCurrency=1, # ETH
+            poolId="0x32296969ef14eb0c6d29669c550d4a0449130230000200000000000000000080",
+            liquidityGauge="0xcd4722b7c24c29e0413bdcd9e51404b4539d14ae",
+            auraRewardPool="0xdcee1c640cc270121faf145f231fd8ff1d8d5cd4",
+            feeReceiver="0x0190702d5e52e0269c9319144d3ad62a60ebe526",
+            settlementWindow=172800,  # 1-week settlement
+            settings=VaultSettings(
+                maxUnderlyingSurplus=20e18, # 20 ETH
+                maxBalancerPoolShare=Wei(1.5e3), # 15%
+                settlementSlippageLimitPercent=Wei(0.15e6), # 0.15%
+                postMaturitySettlementSlippageLimitPercent=Wei(0.4e6), # 0.4%
+                emergencySettlementSlippageLimitPercent=Wei(0.3e6), # 0.3%
+                maxRewardTradeSlippageLimitPercent=2e6, # 2%
+                settlementCoolDownInMinutes=20, # 20 minute settlement cooldown
+                oraclePriceDeviationLimitPercent=200, # +/- 2%
+                balancerPoolSlippageLimitPercent=9975, # 0.25%
+            )
+        ),
+        "StratBoostedPoolDAIPrimary": BalancerStrategyConfig(
+            vaultConfig=get_vault_config(
                 flags=set_flags(0, ENABLED=True, ALLOW_ROLL_POSITION=True),
                 currencyId=2,
                 minAccountBorrowSize=1,
                 maxBorrowMarketIndex=3,
                 secondaryBorrowCurrencies=[0,0]
             ),
-            "secondaryBorrowCurrency": None,
-            "maxPrimaryBorrowCapacity": 100_000_000e8,
-            "name": "Balancer Boosted Pool Strategy",
-            "primaryCurrency": 2, # DAI
-            "poolId": "0x7b50775383d3d6f0215a8f290f2c9e2eebbeceb20000000000000000000000fe",
-            "liquidityGauge": "0x68d019f64a7aa97e2d4e7363aee42251d08124fb",
-            "auraRewardPool": "0xcc2f52b57247f2bc58fec182b9a60dac5963d010",
-            "feeReceiver": "0x0190702d5e52e0269c9319144d3ad62a60ebe526",
-            "maxUnderlyingSurplus": 10000e18, # 10000 DAI
-            "maxBalancerPoolShare": 2e3, # 20%
-            "settlementSlippageLimitPercent": 5e6, # 5%
-            "postMaturitySettlementSlippageLimitPercent": 10e6, # 10%
-            "emergencySettlementSlippageLimitPercent": 10e6, # 10%
-            "maxRewardTradeSlippageLimitPercent": 5e6,
-            "settlementCoolDownInMinutes": 60 * 6, # 6 hour settlement cooldown
-            "settlementWindow": 3600 * 24 * 7,  # 1-week settlement
-            "oraclePriceDeviationLimitPercent": 50, # +/- 0.5%
-            "balancerPoolSlippageLimitPercent": 9900, # 1%
-        },
-        "StratBoostedPoolUSDCPrimary": {
-            "vaultConfig": get_vault_config(
+            secondaryBorrowCurrency=None,
+            maxPrimaryBorrowCapacity=100_000_000e8,
+            name="Balancer Boosted Pool Strategy",
+            primaryCurrency=2, # DAI
+            poolId="0x7b50775383d3d6f0215a8f290f2c9e2eebbeceb20000000000000000000000fe",
+            liquidityGauge="0x68d019f64a7aa97e2d4e7363aee42251d08124fb",
+            auraRewardPool="0xcc2f52b57247f2bc58fec182b9a60dac5963d010",
+            feeReceiver="0x0190702d5e52e0269c9319144d3ad62a60ebe526",
+            settlementWindow=3600 * 24 * 7,  # 1-week settlement
+            settings=VaultSettings(
+                maxUnderlyingSurplus=10000e18, # 10000 DAI
+                maxBalancerPoolShare=2e3, # 20%
+                settlementSlippageLimitPercent=5e6, # 5%
+                postMaturitySettlementSlippageLimitPercent=10e6, # 10%
+                emergencySettlementSlippageLimitPercent=10e6, # 10%
+                maxRewardTradeSlippageLimitPercent=5e6,
+                settlementCoolDownInMinutes=60 * 6, # 6 hour settlement cooldown
+                oraclePriceDeviationLimitPercent=50, # +/- 0.5%
+                balancerPoolSlippageLimitPercent=9900, # 1%
+            )
+        ),
+        "StratBoostedPoolUSDCPrimary": BalancerStrategyConfig(
+            vaultConfig=get_vault_config(
                 flags=set_flags(0, ENABLED=True, ALLOW_ROLL_POSITION=True),
                 currencyId=3,
                 minAccountBorrowSize=1,
                 maxBorrowMarketIndex=3,
                 secondaryBorrowCurrencies=[0,0]
             ),
-            "secondaryBorrowCurrency": None,
-            "maxPrimaryBorrowCapacity": 100_000_000e8,
-            "name": "Balancer Boosted Pool Strategy",
-            "primaryCurrency": 3, # USDC
-            "poolId": "0x7b50775383d3d6f0215a8f290f2c9e2eebbeceb20000000000000000000000fe",
-            "liquidityGauge": "0x68d019f64a7aa97e2d4e7363aee42251d08124fb",
-            "auraRewardPool": "0xcc2f52b57247f2bc58fec182b9a60dac5963d010",
-            "feeReceiver": "0x0190702d5e52e0269c9319144d3ad62a60ebe526",
-            "maxUnderlyingSurplus": 10000e6, # 10000 USDC
-            "oracleWindowInSeconds": 0,
-            "maxBalancerPoolShare": 2e3, # 20%
-            "settlementSlippageLimitPercent": 5e6, # 5%
-            "postMaturitySettlementSlippageLimitPercent": 10e6, # 10%
-            "emergencySettlementSlippageLimitPercent": 10e6, # 10%
-            "maxRewardTradeSlippageLimitPercent": 5e6,
-            "settlementCoolDownInMinutes": 60 * 6, # 6 hour settlement cooldown
-            "settlementWindow": 3600 * 24 * 7,  # 1-week settlement
-            "oraclePriceDeviationLimitPercent": 50, # +/- 0.5%
-            "balancerPoolSlippageLimitPercent": 9900, # 1%
-        }
+            secondaryBorrowCurrency=None,
+            maxPrimaryBorrowCapacity=100_000_000e8,
+            name="Balancer Boosted Pool Strategy",
+            primaryCurrency=3, # USDC
+            poolId="0x7b50775383d3d6f0215a8f290f2c9e2eebbeceb20000000000000000000000fe",
+            liquidityGauge="0x68d019f64a7aa97e2d4e7363aee42251d08124fb",
+            auraRewardPool="0xcc2f52b57247f2bc58fec182b9a60dac5963d010",
+            feeReceiver="0x0190702d5e52e0269c9319144d3ad62a60ebe526",
+            settlementWindow=3600 * 24 * 7,  # 1-week settlement
+            settings=VaultSettings(
+                maxUnderlyingSurplus=10000e6, # 10000 USDC
+                maxBalancerPoolShare=2e3, # 20%
+                settlementSlippageLimitPercent=5e6, # 5%
+                postMaturitySettlementSlippageLimitPercent=10e6, # 10%
+                emergencySettlementSlippageLimitPercent=10e6, # 10%
+                maxRewardTradeSlippageLimitPercent=5e6,
+                settlementCoolDownInMinutes=60 * 6, # 6 hour settlement cooldown
+                oraclePriceDeviationLimitPercent=50, # +/- 0.5%
+                balancerPoolSlippageLimitPercent=9900, # 1%
+            )
+        )
     }
 }
 
@@ -113,105 +122,60 @@ class BalancerEnvironment(Environment):
 
     def initializeBalancerVault(self, vault, strat):
         stratConfig = StrategyConfig["balancer2TokenStrats"][strat]
-        vault.initialize(
-            [
-                stratConfig["name"],
-                stratConfig["primaryCurrency"],
-                [
-                    stratConfig["maxUnderlyingSurplus"],
-                    stratConfig["settlementSlippageLimitPercent"], 
-                    stratConfig["postMaturitySettlementSlippageLimitPercent"], 
-                    stratConfig["emergencySettlementSlippageLimitPercent"], 
-                    stratConfig["maxRewardTradeSlippageLimitPercent"],
-                    stratConfig["maxBalancerPoolShare"],
-                    stratConfig["settlementCoolDownInMinutes"],
-                    stratConfig["oraclePriceDeviationLimitPercent"],
-                    stratConfig["balancerPoolSlippageLimitPercent"]
-                ]
-            ],
-            {"from": self.notional.owner()}
-        )        
+        vault.initialize(stratConfig.init_params(), {"from": self.notional.owner()})
 
         self.notional.updateVault(
             vault.address,
-            stratConfig["vaultConfig"],
-            stratConfig["maxPrimaryBorrowCapacity"],
+            stratConfig.vaultConfig,
+            stratConfig.maxPrimaryBorrowCapacity,
             {"from": self.notional.owner()}
         )
 
     def deployBalancerVault(self, strat, vaultContract, libs=None):
-        stratConfig = StrategyConfig["balancer2TokenStrats"][strat]
-
-        # Deploy external libs
-        if libs != None:
-            for lib in libs:
-                lib.deploy({"from": self.deployer})
-
-        impl = vaultContract.deploy(
-            self.addresses["notional"],
-            [
-                stratConfig["auraRewardPool"],
-                [
-                    stratConfig["primaryCurrency"],
-                    stratConfig["poolId"],
-                    stratConfig["liquidityGauge"],
-                    self.tradingModule.address,
-                    stratConfig["settlementWindow"]
-                ]
-            ],
-            {"from": self.deployer}
-        )
-
-        proxy = nProxy.deploy(impl.address, bytes(0), {"from": self.deployer})
-        vaultProxy = Contract.from_abi(stratConfig["name"], proxy.address, vaultContract.abi)
-
-        print(
-            vaultProxy.initialize.encode_input(
-                [
-                    stratConfig["name"],
-                    stratConfig["primaryCurrency"],
-                    [
-                        stratConfig["maxUnderlyingSurplus"],
-                        stratConfig["settlementSlippageLimitPercent"], 
-                        stratConfig["postMaturitySettlementSlippageLimitPercent"], 
-                        stratConfig["emergencySettlementSlippageLimitPercent"], 
-                        stratConfig["maxRewardTradeSlippageLimitPercent"],
-                        stratConfig["maxBalancerPoolShare"],
-                        stratConfig["settlementCoolDownInMinutes"],
-                        stratConfig["oraclePriceDeviationLimitPercent"],
-                        stratConfig["balancerPoolSlippageLimitPercent"]
-                    ]
-                ]
+        return self.deployBalancerVaults([(strat, vaultContract, libs)])[0]
+
+    def deployBalancerVaults(self, vaults):
+        """vaults: list of (strat, vaultContract, libs), the transactions of all vaults are
+        pipelined so each step takes one block cycle for the whole list"""
+        pipeline = TxPipeline()
+
+        # Deploy external libs, vault contracts are linked against the last deployment
+        libs = dict.fromkeys(lib for (_, _, vaultLibs) in vaults for lib in (vaultLibs or []))
+        for lib in libs:
+            pipeline.deploy(lib, sender=self.deployer)
+        pipeline.run()
+
+        proxies = []
+        for (strat, vaultContract, _) in vaults:
+            stratConfig = StrategyConfig["balancer2TokenStrats"][strat]
+            impl = pipeline.deploy(
+                vaultContract,
+                self.addresses["notional"],
+                stratConfig.deployment_params(self.tradingModule.address),
+                sender=self.deployer
             )
-        )
-
-        vaultProxy.initialize(
-            [
-                stratConfig["name"],
-                stratConfig["primaryCurrency"],
-                [
-                    stratConfig["maxUnderlyingSurplus"],
-                    stratConfig["settlementSlippageLimitPercent"], 
-                    stratConfig["postMaturitySettlementSlippageLimitPercent"], 
-                    stratConfig["emergencySettlementSlippageLimitPercent"], 
-                    stratConfig["maxRewardTradeSlippageLimitPercent"],
-                    stratConfig["maxBalancerPoolShare"],
-                    stratConfig["settlementCoolDownInMinutes"],
-                    stratConfig["oraclePriceDeviationLimitPercent"],
-                    stratConfig["balancerPoolSlippageLimitPercent"]
-                ]
-            ],
-            {"from": self.notional.owner()}
-        )
-
-        self.notional.updateVault(
-            proxy.address,
-            stratConfig["vaultConfig"],
-            stratConfig["maxPrimaryBorrowCapacity"],
-            {"from": self.notional.owner()}
-        )
+            proxies.append(pipeline.deploy(nProxy, impl, bytes(0), sender=self.deployer))
+        pipeline.run()
+
+        vaultProxies = []
+        for ((strat, vaultContract, _), proxy) in zip(vaults, proxies):
+            stratConfig = StrategyConfig["balancer2TokenStrats"][strat]
+            vaultProxy = viewCache.wrap(Contract.from_abi(stratConfig.name, proxy.result.address, vaultContract.abi))
+            print("0x" + stratConfig.initialize_calldata().hex())
+
+            initialize = pipeline.transact(vaultProxy.initialize, stratConfig.init_params(), sender=self.owner)
+            pipeline.transact(
+                self.notional.updateVault,
+                vaultProxy.address,
+                stratConfig.vaultConfig,
+                stratConfig.maxPrimaryBorrowCapacity,
+                sender=self.owner,
+                after=[initialize]
+            )
+            vaultProxies.append(vaultProxy)
+        pipeline.run()
 
-        return vaultProxy
+        return vaultProxies
 
     def deployLiquidator(self):
         liquidator = FlashLiquidator.deploy(
@@ -233,7 +197,7 @@ def main():
     if networkName == "hardhat-fork":
         networkName = "mainnet"
     env = BalancerEnvironment(networkName)
-    maturity = env.notional.getActiveMarkets(1)[0][1]
+    maturity = get_maturity(chain.time(), 1)
 
     vault1 = env.deployBalancerVault(
         "StratStableETHstETH", 
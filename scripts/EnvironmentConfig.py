@@ -12,25 +12,14 @@ from brownie import (
 )
 from brownie.network.contract import Contract
 from brownie.network.state import Chain
+from scripts.abi_store import abis
 from scripts.common import deployArtifact
+from scripts.tx_pipeline import TxPipeline
+from scripts.token_funding import tokenFunder
+from scripts.view_cache import viewCache
 
 chain = Chain()
 
-with open("abi/nComptroller.json", "r") as a:
-    Comptroller = json.load(a)
-
-with open("abi/nCErc20.json") as a:
-    cToken = json.load(a)
-
-with open("abi/nCEther.json") as a:
-    cEther = json.load(a)
-
-with open("abi/ERC20.json") as a:
-    ERC20ABI = json.load(a)
-
-with open("abi/Notional.json") as a:
-    NotionalABI = json.load(a)
-
 networks = {}
 
 with open("v2.mainnet.json", "r") as f:
@@ -45,9 +34,9 @@ class Environment:
         addresses = networks[network]
         self.addresses = addresses
         self.deployer = accounts.at(addresses["deployer"], force=True)
-        self.notional = Contract.from_abi(
-            "Notional", addresses["notional"], NotionalABI
-        )
+        self.notional = viewCache.wrap(Contract.from_abi(
+            "Notional", addresses["notional"], abis["Notional"]
+        ))
 
         self.notional.upgradeTo("0x2C67B0C0493e358cF368073bc0B5fA6F01E981e0", {"from": self.notional.owner()})
         self.notional.updateAssetRate(1, "0x8E3D447eBE244db6D28E2303bCa86Ef3033CFAd6", {"from": self.notional.owner()})
@@ -59,9 +48,9 @@ class Environment:
         self.tokens = {}
         for (symbol, obj) in addresses["tokens"].items():
             if symbol.startswith("c"):
-                self.tokens[symbol] = Contract.from_abi(symbol, obj, cToken["abi"])
+                self.tokens[symbol] = viewCache.wrap(Contract.from_abi(symbol, obj, abis["nCErc20"]))
             else:
-                self.tokens[symbol] = Contract.from_abi(symbol, obj, ERC20ABI)
+                self.tokens[symbol] = viewCache.wrap(Contract.from_abi(symbol, obj, abis["ERC20"]))
 
         self.whales = {}
         for (name, addr) in addresses["whales"].items():
@@ -71,6 +60,16 @@ class Environment:
         self.balancerVault = interface.IBalancerVault(addresses["balancer"]["vault"])
 
         self.deployTradingModule()
+        viewCache.wrap(self.tradingModule)
+
+    def fundAccounts(self, accounts, amounts):
+        """amounts: token symbol (or "ETH") => amount added to the balance of each account,
+        balances are written to storage so no transactions are sent"""
+        tokenFunder.fund([
+            (ZERO_ADDRESS if symbol == "ETH" else self.tokens[symbol].address, account, amount)
+            for account in accounts
+            for (symbol, amount) in amounts.items()
+        ])
 
     def upgradeNotional(self):
         self.notional.upgradeTo("0xD7c3Dc1C36d19cF4e8cea4eA143a2f4458Dd1937", {'from': self.notional.owner()})
@@ -80,97 +79,70 @@ class Environment:
             self.tradingModule = Contract.from_abi("TradingModule", self.addresses["trading"]["proxy"], TradingModule.abi)
             self.tradingModule.initialize(3600 * 24, {"from": self.notional.owner()})
         else:
-            emptyImpl = EmptyProxy.deploy({"from": self.deployer})
-            self.proxy = nProxy.deploy(emptyImpl.address, bytes(0), {"from": self.deployer})
-
-            impl = TradingModule.deploy(self.notional.address, self.proxy.address, {"from": self.deployer})
-            emptyProxy = Contract.from_abi("EmptyProxy", self.proxy.address, EmptyProxy.abi)
-            emptyProxy.upgradeTo(impl.address, {"from": self.deployer})
+            pipeline = TxPipeline()
+            emptyImpl = pipeline.deploy(EmptyProxy, sender=self.deployer)
+            proxy = pipeline.deploy(nProxy, emptyImpl, bytes(0), sender=self.deployer)
 
-            self.tradingModule = Contract.from_abi("TradingModule", self.proxy.address, TradingModule.abi)
-
-            self.tradingModule.initialize(3600 * 24, {"from": self.notional.owner()})
-
-            # ETH/USD oracle
-            self.tradingModule.setPriceOracle(
-                ZERO_ADDRESS, 
-                "0x5f4ec3df9cbd43714fe2740f5e3616155c5b8419", 
-                {"from": self.notional.owner()}
-            )
-
-            # WETH/USD oracle
-            self.tradingModule.setPriceOracle(
-                self.tokens["WETH"].address, 
-                "0x5f4ec3df9cbd43714fe2740f5e3616155c5b8419", 
-                {"from": self.notional.owner()}
-            )
-            # DAI/USD oracle
-            self.tradingModule.setPriceOracle(
-                self.tokens["DAI"].address,
-                "0xaed0c38402a5d19df6e4c03f4e2dced6e29c1ee9",
-                {"from": self.notional.owner()}
-            )
-            # USDC/USD oracle
-            self.tradingModule.setPriceOracle(
-                self.tokens["USDC"].address,
-                "0x8fffffd4afb6115b954bd326cbe7b4ba576818f6",
-                {"from": self.notional.owner()}
-            )
-            # USDT/USD oracle
-            self.tradingModule.setPriceOracle(
-                self.tokens["USDT"].address,
-                "0x3e7d1eab13ad0104d2750b8863b489d65364e32d",
-                {"from": self.notional.owner()}
-            )
-            # WBTC/USD oracle
-            self.tradingModule.setPriceOracle(
-                self.tokens["WBTC"].address,
-                "0xF4030086522a5bEEa4988F8cA5B36dbC97BeE88c",
-                {"from": self.notional.owner()}
-            )
-            # BAL/USD oracle
-            self.tradingModule.setPriceOracle(
-                self.tokens["BAL"].address,
-                "0xdf2917806e30300537aeb49a7663062f4d1f2b5f",
-                {"from": self.notional.owner()}
-            )
-            # stETH/USD oracle
-            self.tradingModule.setPriceOracle(
-                self.tokens["stETH"].address,
-                "0xcfe54b5cd566ab89272946f602d76ea879cab4a8",
-                {"from": self.notional.owner()}
-            )
+            # Oracle adapters do not depend on the trading module
             # wstETH/USD oracle
-            wstETHAdapater = WstETHChainlinkOracle.deploy(
+            wstETHAdapter = pipeline.deploy(
+                WstETHChainlinkOracle,
                 "0xcfe54b5cd566ab89272946f602d76ea879cab4a8",
                 self.tokens["wstETH"].address,
-                {"from": self.notional.owner()}
-            )
-            self.tradingModule.setPriceOracle(
-                self.tokens["wstETH"].address,
-                wstETHAdapater.address,
-                {"from": self.notional.owner()}
+                sender=self.owner
             )
             # AURA/USD oracle
-            auraETHAdapter = BalancerPoolChainlinkAdapter.deploy(
+            auraETHAdapter = pipeline.deploy(
+                BalancerPoolChainlinkAdapter,
                 self.notional,
                 "0xc29562b045d80fd77c69bec09541f5c16fe20d9d", 
                 "AURA/ETH Chainlink Adapter", 
                 3600,
                 True,
-                {"from": self.notional.owner()}    
+                sender=self.owner
             )
-            auraUSDAdapter = ChainlinkAdapter.deploy(
+            auraUSDAdapter = pipeline.deploy(
+                ChainlinkAdapter,
                 "0x5f4ec3df9cbd43714fe2740f5e3616155c5b8419",
-                auraETHAdapter.address,
+                auraETHAdapter,
                 "AURA/USD Chainlink Adapter",
-                {"from": self.notional.owner()}
+                sender=self.owner
             )
-            self.tradingModule.setPriceOracle(
-                self.tokens["AURA"].address,
-                auraUSDAdapter.address,
-                {"from": self.notional.owner()}
-            )        
+            pipeline.run()
+
+            self.proxy = proxy.result
+            emptyProxy = Contract.from_abi("EmptyProxy", self.proxy.address, EmptyProxy.abi)
+            impl = pipeline.deploy(TradingModule, self.notional.address, self.proxy.address, sender=self.deployer)
+            pipeline.transact(emptyProxy.upgradeTo, impl, sender=self.deployer)
+            pipeline.run()
+
+            self.tradingModule = Contract.from_abi("TradingModule", self.proxy.address, TradingModule.abi)
+
+            pipeline.transact(self.tradingModule.initialize, 3600 * 24, sender=self.owner)
+
+            oracles = [
+                # ETH/USD oracle
+                (ZERO_ADDRESS, "0x5f4ec3df9cbd43714fe2740f5e3616155c5b8419"),
+                # WETH/USD oracle
+                (self.tokens["WETH"].address, "0x5f4ec3df9cbd43714fe2740f5e3616155c5b8419"),
+                # DAI/USD oracle
+                (self.tokens["DAI"].address, "0xaed0c38402a5d19df6e4c03f4e2dced6e29c1ee9"),
+                # USDC/USD oracle
+                (self.tokens["USDC"].address, "0x8fffffd4afb6115b954bd326cbe7b4ba576818f6"),
+                # USDT/USD oracle
+                (self.tokens["USDT"].address, "0x3e7d1eab13ad0104d2750b8863b489d65364e32d"),
+                # WBTC/USD oracle
+                (self.tokens["WBTC"].address, "0xF4030086522a5bEEa4988F8cA5B36dbC97BeE88c"),
+                # BAL/USD oracle
+                (self.tokens["BAL"].address, "0xdf2917806e30300537aeb49a7663062f4d1f2b5f"),
+                # stETH/USD oracle
+                (self.tokens["stETH"].address, "0xcfe54b5cd566ab89272946f602d76ea879cab4a8"),
+                (self.tokens["wstETH"].address, wstETHAdapter.result.address),
+                (self.tokens["AURA"].address, auraUSDAdapter.result.address)
+            ]
+            for (token, oracle) in oracles:
+                pipeline.transact(self.tradingModule.setPriceOracle, token, oracle, sender=self.owner)
+            pipeline.run()
 
 
 def getEnvironment(network = "mainnet"):
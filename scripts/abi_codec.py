@@ -0,0 +1,40 @@
+# Precompiled ABI encoders and decoders
+#
+# eth_abi.encode_abi and decode_abi build and validate a new TupleEncoder (or
+# TupleDecoder) around the registry coders on every call. AbiSchema builds it once
+# per list of types and reuses it for every call. encode_abi(types, args) and
+# get_schema(*types).encode(*args) return the same bytes.
+
+from functools import lru_cache
+from eth_abi.decoding import ContextFramesBytesIO, TupleDecoder
+from eth_abi.encoding import TupleEncoder
+from eth_abi.registry import registry, registry_packed
+
+class AbiSchema:
+    def __init__(self, types, packed=False):
+        self.types = tuple(types)
+        encoderRegistry = registry_packed if packed else registry
+        self.encoder = TupleEncoder(encoders=[encoderRegistry.get_encoder(t) for t in self.types])
+        self.decoder = None if packed else TupleDecoder(decoders=[registry.get_decoder(t) for t in self.types])
+
+    def encode(self, *args):
+        return self.encoder(args)
+
+    def encode_many(self, argsList):
+        """argsList: iterable of argument tuples, one per encoding"""
+        encoder = self.encoder
+        return [encoder(tuple(args)) for args in argsList]
+
+    def decode(self, data):
+        return self.decoder(ContextFramesBytesIO(bytes(data)))
+
+    def decode_many(self, dataList):
+        return [self.decode(data) for data in dataList]
+
+@lru_cache(maxsize=None)
+def get_schema(*types):
+    return AbiSchema(types)
+
+@lru_cache(maxsize=None)
+def get_packed_schema(*types):
+    return AbiSchema(types, packed=True)
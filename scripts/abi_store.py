@@ -0,0 +1,89 @@
+# Lazy ABI loading for the json files in abi/
+#
+# Some of the files in abi/ are full build artifacts (nComptroller, nCErc20 and
+# nCEther are over 2MB each) even though only their "abi" section is used. The
+# store loads an ABI on first access and keeps a compact copy of it on disk keyed
+# by the sha256 of the source file, so later runs parse a few KB instead of the
+# whole artifact. The index maps each source file to its size, mtime and hash so
+# unchanged files are not re-hashed either.
+
+import hashlib
+import json
+import os
+
+ABI_DIR = "abi"
+CACHE_DIR = ".abi_cache"
+
+def write_atomic(path, data):
+    # Several processes can share the cache directory, readers never see a partial file
+    tmpPath = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmpPath, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmpPath, path)
+
+def extract_abi(artifact):
+    return artifact["abi"] if isinstance(artifact, dict) else artifact
+
+class AbiStore:
+    def __init__(self, abiDir=ABI_DIR, cacheDir=CACHE_DIR):
+        self.abiDir = abiDir
+        self.cacheDir = cacheDir
+        self.indexPath = os.path.join(cacheDir, "index.json")
+        self._index = None
+        self._abis = {}
+
+    def _read_index(self):
+        try:
+            with open(self.indexPath) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _load_index(self):
+        if self._index is None:
+            self._index = self._read_index()
+        return self._index
+
+    def get_hash(self, path):
+        stat = os.stat(path)
+        index = self._load_index()
+        entry = index.get(path)
+        if entry is not None and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+            return entry["hash"]
+
+        with open(path, "rb") as f:
+            contentHash = hashlib.sha256(f.read()).hexdigest()
+        # Other stores and processes sharing the cache directory write the same index,
+        # their entries are merged in so that this write does not drop them
+        index = self._read_index()
+        index.update(self._index)
+        index[path] = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "hash": contentHash}
+        self._index = index
+        os.makedirs(self.cacheDir, exist_ok=True)
+        write_atomic(self.indexPath, index)
+        return contentHash
+
+    def get(self, name):
+        """name is the path of the json file relative to abiDir without the extension,
+        e.g. "nCErc20" or "balancer/poolFactory" """
+        if name in self._abis:
+            return self._abis[name]
+
+        path = os.path.join(self.abiDir, name + ".json")
+        cachePath = os.path.join(self.cacheDir, self.get_hash(path) + ".json")
+        try:
+            with open(cachePath) as f:
+                abi = json.load(f)
+        except (OSError, ValueError):
+            with open(path) as f:
+                abi = extract_abi(json.load(f))
+            os.makedirs(self.cacheDir, exist_ok=True)
+            write_atomic(cachePath, abi)
+
+        self._abis[name] = abi
+        return abi
+
+    def __getitem__(self, name):
+        return self.get(name)
+
+abis = AbiStore()
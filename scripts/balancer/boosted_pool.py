@@ -0,0 +1,182 @@
+# Python port of contracts/vaults/balancer/internal/pool/Boosted3TokenPoolUtils.sol
+#
+# Context arguments are mappings with the same field names as the solidity
+# structs, so the values returned by vault.getStrategyContext() can be passed in
+# directly. Values that the contract reads on chain (oracle prices and the cached
+# protocol swap fee) are passed in explicitly.
+
+from brownie import Wei, interface
+from scripts.balancer.constants import (
+    BALANCER_PRECISION,
+    BALANCER_PRECISION_SQUARED,
+    VAULT_PERCENT_BASIS
+)
+from scripts.balancer.errors import BalancerPoolShareTooHigh, InvalidPrice
+from scripts.balancer.math import fixed_point as fp
+from scripts.balancer.math import stable_math
+from scripts.balancer.math.fixed_point_array import Uint256Array
+
+MAX_TOKEN_BALANCE = 2**112 - 1
+
+def get_virtual_supply(oracleContext):
+    # The preminted BPT held by the pool does not belong to anyone, see the solidity comments
+    return MAX_TOKEN_BALANCE - oracleContext["bptBalance"] + oracleContext["dueProtocolFeeBptAmount"]
+
+def get_virtual_supply_and_balances(poolContext, oracleContext):
+    balances = [
+        poolContext["basePool"]["primaryBalance"],
+        poolContext["basePool"]["secondaryBalance"],
+        poolContext["tertiaryBalance"]
+    ]
+    return (get_virtual_supply(oracleContext), balances)
+
+def get_spot_price(ampParam, invariant, balances, tokenIndexIn, tokenIndexOut):
+    # Trade 1 unit of tokenIn for tokenOut to get the spot price
+    return stable_math.calc_out_given_in(
+        ampParam, balances, tokenIndexIn, tokenIndexOut, BALANCER_PRECISION, invariant
+    )
+
+def validate_spot_price(strategyContext, oraclePrice, balances, ampParam, invariant, tokenIndexOut):
+    spotPrice = get_spot_price(ampParam, invariant, balances, 0, tokenIndexOut)
+    deviation = strategyContext["vaultSettings"]["oraclePriceDeviationLimitPercent"]
+    lowerLimit = oraclePrice * (VAULT_PERCENT_BASIS - deviation) // VAULT_PERCENT_BASIS
+    upperLimit = oraclePrice * (VAULT_PERCENT_BASIS + deviation) // VAULT_PERCENT_BASIS
+    if spotPrice < lowerLimit or upperLimit < spotPrice:
+        raise InvalidPrice(oraclePrice, spotPrice)
+
+def get_validated_pool_data(poolContext, oracleContext, strategyContext, oraclePrices):
+    """oraclePrices: (secondary, tertiary) oracle prices in terms of the primary underlying, as
+    returned by tradingModule.getOraclePrice(secondaryUnderlying, primaryUnderlying) etc."""
+    (virtualSupply, balances) = get_virtual_supply_and_balances(poolContext, oracleContext)
+
+    # Since we need a bigger new invariant, we round the current one up
+    invariant = stable_math.calculate_invariant(oracleContext["ampParam"], balances, True)
+
+    validate_spot_price(strategyContext, oraclePrices[0], balances, oracleContext["ampParam"], invariant, 1)
+    validate_spot_price(strategyContext, oraclePrices[1], balances, oracleContext["ampParam"], invariant, 2)
+    return (virtualSupply, balances, invariant)
+
+def get_due_protocol_fee_by_bpt(bptAmount, protocolSwapFeePercentage):
+    # Amount plus fee amount, rounded up to favor a higher fee
+    feeAmount = fp.sub(fp.div_up(bptAmount, fp.sub(fp.ONE, protocolSwapFeePercentage)), bptAmount)
+    return fp.mul_down(feeAmount, protocolSwapFeePercentage)
+
+def get_time_weighted_primary_balance(poolContext, oracleContext, strategyContext, oraclePrices, bptAmount):
+    (virtualSupply, balances, invariant) = get_validated_pool_data(
+        poolContext, oracleContext, strategyContext, oraclePrices
+    )
+    return _scale_primary_amount(
+        poolContext, _get_primary_value_of_one_bpt(oracleContext, virtualSupply, balances, invariant), bptAmount
+    )
+
+def get_min_bpt(poolContext, oracleContext, strategyContext, oraclePrices, protocolSwapFeePercentage, primaryAmount):
+    (virtualSupply, balances, invariant) = get_validated_pool_data(
+        poolContext, oracleContext, strategyContext, oraclePrices
+    )
+
+    # Balancer math functions expect all amounts to be in BALANCER_PRECISION
+    primaryPrecision = 10 ** poolContext["basePool"]["primaryDecimals"]
+    amountsIn = [primaryAmount * BALANCER_PRECISION // primaryPrecision, 0, 0]
+
+    minBPT = stable_math.calc_bpt_out_given_exact_tokens_in(
+        oracleContext["ampParam"], balances, amountsIn, virtualSupply, 0, invariant
+    )
+    return _apply_fee_and_slippage(strategyContext, protocolSwapFeePercentage, minBPT)
+
+def check_pool_share(poolContext, oracleContext, strategyContext, bptMinted):
+    """Mirrors the BalancerPoolShareTooHigh check in _joinPoolAndStake"""
+    bptThreshold = get_bpt_threshold(oracleContext, strategyContext)
+    bptHeldAfterJoin = strategyContext["vaultState"]["totalBPTHeld"] + bptMinted
+    if bptHeldAfterJoin > bptThreshold:
+        raise BalancerPoolShareTooHigh(bptHeldAfterJoin, bptThreshold)
+
+def get_bpt_threshold(oracleContext, strategyContext):
+    maxBalancerPoolShare = strategyContext["vaultSettings"]["maxBalancerPoolShare"]
+    return get_virtual_supply(oracleContext) * maxBalancerPoolShare // VAULT_PERCENT_BASIS
+
+def _get_primary_value_of_one_bpt(oracleContext, virtualSupply, balances, invariant):
+    # Use virtual total supply and zero swap fees for joins
+    return stable_math.calc_token_out_given_exact_bpt_in(
+        oracleContext["ampParam"], balances, 0, BALANCER_PRECISION, virtualSupply, 0, invariant
+    )
+
+def _scale_primary_amount(poolContext, primaryValueOfOneBPT, bptAmount):
+    primaryPrecision = 10 ** poolContext["basePool"]["primaryDecimals"]
+    return (primaryValueOfOneBPT * bptAmount * primaryPrecision) // BALANCER_PRECISION_SQUARED
+
+def _apply_fee_and_slippage(strategyContext, protocolSwapFeePercentage, minBPT):
+    if protocolSwapFeePercentage > 0:
+        minBPT = fp.sub(minBPT, get_due_protocol_fee_by_bpt(minBPT, protocolSwapFeePercentage))
+    return minBPT * strategyContext["vaultSettings"]["balancerPoolSlippageLimitPercent"] // VAULT_PERCENT_BASIS
+
+class Boosted3TokenPoolModel:
+    """Snapshot of a Boosted3Token pool that values many hypothetical deposits and BPT amounts
+    without RPC calls. The virtual supply, invariant and oracle price validation are computed
+    once and shared by every candidate."""
+
+    def __init__(self, poolContext, oracleContext, strategyContext, oraclePrices, protocolSwapFeePercentage):
+        self.poolContext = poolContext
+        self.oracleContext = oracleContext
+        self.strategyContext = strategyContext
+        self.oraclePrices = oraclePrices
+        self.protocolSwapFeePercentage = protocolSwapFeePercentage
+        (self.virtualSupply, self.balances, self.invariant) = get_validated_pool_data(
+            poolContext, oracleContext, strategyContext, oraclePrices
+        )
+        self.primaryValueOfOneBPT = _get_primary_value_of_one_bpt(
+            oracleContext, self.virtualSupply, self.balances, self.invariant
+        )
+
+    @classmethod
+    def from_vault(cls, vault, context=None):
+        if context is None:
+            context = vault.getStrategyContext()
+        poolContext = context["poolContext"]
+        strategyContext = context["baseStrategy"]
+        tradingModule = interface.ITradingModule(strategyContext["tradingModule"])
+
+        primaryUnderlying = interface.IBoostedPool(poolContext["basePool"]["primaryToken"]).getMainToken()
+        oraclePrices = []
+        for token in [poolContext["basePool"]["secondaryToken"], poolContext["tertiaryToken"]]:
+            underlying = interface.IBoostedPool(token).getMainToken()
+            (answer, decimals) = tradingModule.getOraclePrice(underlying, primaryUnderlying)
+            if decimals != BALANCER_PRECISION:
+                raise ValueError("invalid oracle decimals")
+            oraclePrices.append(answer)
+
+        protocolSwapFeePercentage = interface.IBoostedPool(
+            poolContext["basePool"]["basePool"]["pool"]
+        ).getCachedProtocolSwapFeePercentage()
+        return cls(poolContext, context["oracleContext"], strategyContext, oraclePrices, protocolSwapFeePercentage)
+
+    def time_weighted_primary_balance(self, bptAmount):
+        return _scale_primary_amount(self.poolContext, self.primaryValueOfOneBPT, Wei(bptAmount))
+
+    def time_weighted_primary_balances(self, bptAmounts):
+        bptAmounts = Uint256Array([Wei(bptAmount) for bptAmount in bptAmounts])
+        return _scale_primary_amount(self.poolContext, self.primaryValueOfOneBPT, bptAmounts).tolist()
+
+    def min_bpt(self, primaryAmount):
+        return self.min_bpts([primaryAmount])[0]
+
+    def min_bpts(self, primaryAmounts):
+        """Vectorized _getMinBPT, evaluates every deposit size in one pass over the pool math"""
+        primaryPrecision = 10 ** self.poolContext["basePool"]["primaryDecimals"]
+        amountsIn = Uint256Array([Wei(amount) for amount in primaryAmounts]) * BALANCER_PRECISION
+        amountsIn = amountsIn.div_down(primaryPrecision)
+        zeros = Uint256Array.zeros(len(amountsIn))
+
+        bptOut = stable_math.calc_bpt_out_given_exact_tokens_in_array(
+            self.oracleContext["ampParam"], self.balances, [amountsIn, zeros, zeros],
+            self.virtualSupply, 0, self.invariant
+        )
+        return [
+            _apply_fee_and_slippage(self.strategyContext, self.protocolSwapFeePercentage, minBPT)
+            for minBPT in bptOut.tolist()
+        ]
+
+    def bpt_threshold(self):
+        return get_bpt_threshold(self.oracleContext, self.strategyContext)
+
+    def check_pool_share(self, bptMinted):
+        check_pool_share(self.poolContext, self.oracleContext, self.strategyContext, bptMinted)
@@ -0,0 +1,11 @@
+# Mirrors contracts/vaults/balancer/internal/BalancerConstants.sol
+
+BALANCER_PRECISION = 10**18
+BALANCER_PRECISION_SQUARED = 10**36
+SLIPPAGE_LIMIT_PRECISION = 10**8
+VAULT_PERCENT_BASIS = 10**4
+BALANCER_POOL_SHARE_BUFFER = 8 * 10**3
+MAX_SETTLEMENT_COOLDOWN_IN_MINUTES = 24 * 60
+
+# contracts/global/Constants.sol
+INTERNAL_TOKEN_PRECISION = 10**8
@@ -0,0 +1,91 @@
+# Plans the settleVaultEmergency calls needed to bring a vault back under its
+# maxBalancerPoolShare. Mirrors the BPT amount calculations in
+# contracts/vaults/balancer/internal/settlement/SettlementUtils.sol and replays
+# the state changes of each settlement so that the following call in the plan
+# sees the same totalBPTHeld, strategy token supply and BPT supply as the vault.
+
+from collections import namedtuple
+from brownie import interface
+from scripts.balancer import strategy_utils
+from scripts.balancer.boosted_pool import get_virtual_supply
+from scripts.balancer.constants import BALANCER_POOL_SHARE_BUFFER, VAULT_PERCENT_BASIS
+from scripts.balancer.errors import InvalidEmergencySettlement
+
+EmergencySettlement = namedtuple("EmergencySettlement", ["maturity", "bptToSettle", "redeemStrategyTokenAmount"])
+
+def get_bpt_threshold(vaultSettings, totalBPTSupply):
+    return totalBPTSupply * vaultSettings["maxBalancerPoolShare"] // VAULT_PERCENT_BASIS
+
+def get_emergency_settlement_bpt_amount(bptTotalSupply, maxBalancerPoolShare, totalBPTHeld, bptHeldInMaturity):
+    # desiredPoolShare = maxPoolShare * bufferPercentage
+    desiredPoolShare = maxBalancerPoolShare * BALANCER_POOL_SHARE_BUFFER // VAULT_PERCENT_BASIS
+    desiredBPTAmount = bptTotalSupply * desiredPoolShare // VAULT_PERCENT_BASIS
+    if totalBPTHeld < desiredBPTAmount:
+        raise OverflowError("uint256 overflow")
+    # Cannot settle more than the amount of BPT available in the maturity
+    return min(totalBPTHeld - desiredBPTAmount, bptHeldInMaturity)
+
+def get_bpt_held_in_maturity(vaultState, totalSupplyInMaturity, totalBPTHeld):
+    if vaultState["totalStrategyTokenGlobal"] == 0:
+        return 0
+    return totalBPTHeld * totalSupplyInMaturity // vaultState["totalStrategyTokenGlobal"]
+
+def get_emergency_settlement_params(strategyContext, totalSupplyInMaturity, totalBPTSupply):
+    """Mirrors _getEmergencySettlementParams, returns bptToSettle"""
+    vaultSettings = strategyContext["vaultSettings"]
+    vaultState = strategyContext["vaultState"]
+    if vaultState["totalBPTHeld"] <= get_bpt_threshold(vaultSettings, totalBPTSupply):
+        raise InvalidEmergencySettlement()
+
+    bptHeldInMaturity = get_bpt_held_in_maturity(vaultState, totalSupplyInMaturity, vaultState["totalBPTHeld"])
+    return get_emergency_settlement_bpt_amount(
+        totalBPTSupply, vaultSettings["maxBalancerPoolShare"], vaultState["totalBPTHeld"], bptHeldInMaturity
+    )
+
+def plan_emergency_settlement(strategyContext, totalSupplyInMaturity, totalBPTSupply, blockTime):
+    """Returns the shortest ordered list of EmergencySettlement calls that brings totalBPTHeld back
+    under the pool share threshold. totalSupplyInMaturity maps maturity => totalStrategyTokens.
+    Every call except the last settles all the BPT held in its maturity, so maturities are settled
+    largest first. Maturities inside their settlement window are skipped since settleVaultEmergency
+    reverts for them."""
+    vaultSettings = strategyContext["vaultSettings"]
+    vaultState = {
+        "totalBPTHeld": strategyContext["vaultState"]["totalBPTHeld"],
+        "totalStrategyTokenGlobal": strategyContext["vaultState"]["totalStrategyTokenGlobal"]
+    }
+    settlementPeriod = strategyContext["settlementPeriodInSeconds"]
+    supplies = {
+        maturity: supply for (maturity, supply) in totalSupplyInMaturity.items()
+        if supply > 0 and blockTime < maturity - settlementPeriod
+    }
+
+    plan = []
+    while vaultState["totalBPTHeld"] > get_bpt_threshold(vaultSettings, totalBPTSupply) and len(supplies) > 0:
+        maturity = max(supplies, key=lambda m: (supplies[m], -m))
+        context = {"vaultSettings": vaultSettings, "vaultState": vaultState}
+        bptToSettle = get_emergency_settlement_params(context, supplies.pop(maturity), totalBPTSupply)
+        redeemStrategyTokenAmount = strategy_utils.convert_bpt_claim_to_strategy_tokens(context, bptToSettle)
+        if redeemStrategyTokenAmount == 0:
+            break
+        plan.append(EmergencySettlement(maturity, bptToSettle, redeemStrategyTokenAmount))
+
+        # The vault redeems the strategy tokens, exiting the pool burns the BPT
+        bptClaim = strategy_utils.convert_strategy_tokens_to_bpt_claim(context, redeemStrategyTokenAmount)
+        vaultState = {
+            "totalBPTHeld": vaultState["totalBPTHeld"] - bptClaim,
+            "totalStrategyTokenGlobal": vaultState["totalStrategyTokenGlobal"] - redeemStrategyTokenAmount
+        }
+        totalBPTSupply -= bptClaim
+
+    return plan
+
+def plan_emergency_settlement_for_vault(notional, vault, maturities, blockTime):
+    context = vault.getStrategyContext()
+    if "tertiaryToken" in context["poolContext"].keys():
+        totalBPTSupply = get_virtual_supply(context["oracleContext"])
+    else:
+        totalBPTSupply = interface.IERC20(context["poolContext"]["basePool"]["pool"]).totalSupply()
+    totalSupplyInMaturity = {
+        maturity: notional.getVaultState(vault.address, maturity)["totalStrategyTokens"] for maturity in maturities
+    }
+    return plan_emergency_settlement(context["baseStrategy"], totalSupplyInMaturity, totalBPTSupply, blockTime)
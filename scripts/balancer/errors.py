@@ -0,0 +1,20 @@
+# Mirrors the reverts in contracts/global/Errors.sol so off-chain models can
+# report the same failure the vault would revert with
+
+class VaultError(Exception):
+    pass
+
+class InvalidPrice(VaultError):
+    def __init__(self, oraclePrice, poolPrice):
+        super().__init__(oraclePrice, poolPrice)
+        self.oraclePrice = oraclePrice
+        self.poolPrice = poolPrice
+
+class BalancerPoolShareTooHigh(VaultError):
+    def __init__(self, totalBPTHeld, bptThreshold):
+        super().__init__(totalBPTHeld, bptThreshold)
+        self.totalBPTHeld = totalBPTHeld
+        self.bptThreshold = bptThreshold
+
+class InvalidEmergencySettlement(VaultError):
+    pass
@@ -0,0 +1,33 @@
+# Python port of contracts/vaults/balancer/internal/math/FixedPoint.sol
+
+from scripts.balancer.math.solidity_math import checked
+
+ONE = 10**18
+
+def add(a, b):
+    return checked(a + b)
+
+def sub(a, b):
+    return checked(a - b)
+
+def mul_down(a, b):
+    return checked(a * b) // ONE
+
+def mul_up(a, b):
+    product = checked(a * b)
+    if product == 0:
+        return 0
+    return ((product - 1) // ONE) + 1
+
+def div_down(a, b):
+    if a == 0:
+        return 0
+    return checked(a * ONE) // b
+
+def div_up(a, b):
+    if a == 0:
+        return 0
+    return ((checked(a * ONE) - 1) // b) + 1
+
+def complement(x):
+    return ONE - x if x < ONE else 0
@@ -0,0 +1,191 @@
+# Vectorized uint256 array mirroring FixedPoint.sol and Math.sol
+#
+# Values are held in a numpy object array of python ints so that 512 bit
+# intermediate products (i.e. a * ONE before a division) stay exact while numpy
+# dispatches the elementwise operations. Every operation applies the same
+# checks and rounding as the scalar ports in fixed_point.py and solidity_math.py:
+# a checked operation that overflows in any element raises OverflowError for the
+# whole array, and a zero divisor raises ZeroDivisionError. Arrays can be packed
+# into (N, 4) uint64 little endian limbs for compact storage.
+
+import numpy as np
+from scripts.balancer.math.fixed_point import ONE
+from scripts.balancer.math.solidity_math import MAX_UINT256
+
+LIMB_BITS = 64
+LIMB_MASK = 2**LIMB_BITS - 1
+NUM_LIMBS = 4
+
+def _as_object_array(values):
+    if isinstance(values, Uint256Array):
+        return values.values
+    if isinstance(values, np.ndarray) and values.dtype == object:
+        return values
+    return np.array([int(v) for v in values], dtype=object)
+
+def _checked(values):
+    if len(values) > 0 and ((values < 0).any() or (values > MAX_UINT256).any()):
+        raise OverflowError("uint256 overflow")
+    return values
+
+class Uint256Array:
+    __slots__ = ("values",)
+    __hash__ = None
+
+    def __init__(self, values):
+        self.values = _checked(_as_object_array(values))
+
+    @classmethod
+    def _wrap(cls, values):
+        # Skips the range check for values that are known to be in range
+        array = cls.__new__(cls)
+        array.values = values
+        return array
+
+    @classmethod
+    def full(cls, length, value):
+        values = np.empty(length, dtype=object)
+        values.fill(int(value))
+        return cls(values)
+
+    @classmethod
+    def zeros(cls, length):
+        return cls.full(length, 0)
+
+    @classmethod
+    def from_limbs(cls, limbs):
+        limbs = np.asarray(limbs, dtype=np.uint64)
+        values = np.zeros(limbs.shape[0], dtype=object)
+        for i in range(NUM_LIMBS):
+            values = values + (limbs[:, i].astype(object) << (LIMB_BITS * i))
+        return cls._wrap(values)
+
+    def to_limbs(self):
+        limbs = np.empty((len(self), NUM_LIMBS), dtype=np.uint64)
+        for i in range(NUM_LIMBS):
+            limbs[:, i] = ((self.values >> (LIMB_BITS * i)) & LIMB_MASK).astype(np.uint64)
+        return limbs
+
+    def tolist(self):
+        return self.values.tolist()
+
+    def copy(self):
+        return Uint256Array._wrap(self.values.copy())
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return self.values[index]
+        return Uint256Array._wrap(self.values[index])
+
+    def __setitem__(self, index, value):
+        if isinstance(value, Uint256Array):
+            value = value.values
+        self.values[index] = value
+
+    def __repr__(self):
+        return "Uint256Array({})".format(self.tolist())
+
+    def _other(self, other):
+        if isinstance(other, Uint256Array):
+            return other.values
+        return other
+
+    def _divisor(self, other, isZero):
+        # Zero numerators divide by one instead so that they do not touch the divisor. Scalar
+        # divisors are broadcast first, np.where cannot coerce ints wider than 64 bits.
+        other = self._other(other)
+        if not isinstance(other, np.ndarray):
+            other = np.full(len(self.values), int(other), dtype=object)
+        return np.where(isZero, 1, other)
+
+    # Comparisons return numpy boolean arrays
+    def __eq__(self, other):
+        return (self.values == self._other(other)).astype(bool)
+
+    def __ne__(self, other):
+        return (self.values != self._other(other)).astype(bool)
+
+    def __lt__(self, other):
+        return (self.values < self._other(other)).astype(bool)
+
+    def __le__(self, other):
+        return (self.values <= self._other(other)).astype(bool)
+
+    def __gt__(self, other):
+        return (self.values > self._other(other)).astype(bool)
+
+    def __ge__(self, other):
+        return (self.values >= self._other(other)).astype(bool)
+
+    # Checked arithmetic, same as FixedPoint.add / sub and Math.add / sub / mul
+    def __add__(self, other):
+        return Uint256Array._wrap(_checked(self.values + self._other(other)))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return Uint256Array._wrap(_checked(self.values - self._other(other)))
+
+    def __rsub__(self, other):
+        return Uint256Array._wrap(_checked(self._other(other) - self.values))
+
+    def __mul__(self, other):
+        return Uint256Array._wrap(_checked(self.values * self._other(other)))
+
+    __rmul__ = __mul__
+
+    def __floordiv__(self, other):
+        return self.div_down(other)
+
+    def abs_diff(self, other):
+        return Uint256Array._wrap(np.abs(self.values - self._other(other)))
+
+    # Unchecked arithmetic, wraps around 2**256
+    def wrapping_add(self, other):
+        return Uint256Array._wrap((self.values + self._other(other)) & MAX_UINT256)
+
+    def wrapping_sub(self, other):
+        return Uint256Array._wrap((self.values - self._other(other)) & MAX_UINT256)
+
+    def wrapping_mul(self, other):
+        return Uint256Array._wrap((self.values * self._other(other)) & MAX_UINT256)
+
+    # Math.sol
+    def div_down(self, other):
+        return Uint256Array._wrap(self.values // self._other(other))
+
+    def div_up(self, other):
+        isZero = self.values == 0
+        divisor = self._divisor(other, isZero)
+        return Uint256Array._wrap(np.where(isZero, 0, 1 + (self.values - 1) // divisor))
+
+    def div(self, other, roundUp):
+        return self.div_up(other) if roundUp else self.div_down(other)
+
+    # FixedPoint.sol
+    def mul_down(self, other):
+        return Uint256Array._wrap(_checked(self.values * self._other(other)) // ONE)
+
+    def mul_up(self, other):
+        product = _checked(self.values * self._other(other))
+        return Uint256Array._wrap(np.where(product == 0, 0, ((product - 1) // ONE) + 1))
+
+    def fixed_div_down(self, other):
+        isZero = self.values == 0
+        divisor = self._divisor(other, isZero)
+        return Uint256Array._wrap(np.where(isZero, 0, _checked(self.values * ONE) // divisor))
+
+    def fixed_div_up(self, other):
+        isZero = self.values == 0
+        divisor = self._divisor(other, isZero)
+        aInflated = _checked(self.values * ONE)
+        return Uint256Array._wrap(np.where(isZero, 0, ((aInflated - 1) // divisor) + 1))
+
+    def complement(self):
+        return Uint256Array._wrap(np.where(self.values < ONE, ONE - self.values, 0))
@@ -0,0 +1,40 @@
+# Python port of contracts/vaults/balancer/internal/math/Math.sol
+#
+# All values are python ints interpreted as uint256. Checked operations raise
+# OverflowError where solidity would panic, unchecked operations wrap.
+
+MAX_UINT256 = 2**256 - 1
+
+def checked(x):
+    if x < 0 or x > MAX_UINT256:
+        raise OverflowError("uint256 overflow")
+    return x
+
+def unchecked(x):
+    return x & MAX_UINT256
+
+def add(a, b):
+    return checked(a + b)
+
+def sub(a, b):
+    return checked(a - b)
+
+def mul(a, b):
+    return checked(a * b)
+
+def max(a, b):
+    return a if a >= b else b
+
+def min(a, b):
+    return a if a < b else b
+
+def div(a, b, roundUp):
+    return div_up(a, b) if roundUp else div_down(a, b)
+
+def div_down(a, b):
+    return a // b
+
+def div_up(a, b):
+    if a == 0:
+        return 0
+    return 1 + (a - 1) // b
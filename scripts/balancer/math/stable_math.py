@@ -0,0 +1,317 @@
+# Python port of contracts/vaults/balancer/internal/math/StableMath.sol
+#
+# Mirrors the solidity implementation bit for bit, including rounding direction
+# and which operations are checked (raise OverflowError) versus unchecked (wrap).
+# The *_batch functions evaluate many points in a single call and share the
+# invariant calculation between points that have the same amp and balances.
+# The *_array functions operate on Uint256Array columns for large price grids and
+# deposit size sweeps.
+
+import numpy as np
+from functools import lru_cache
+from scripts.balancer.math import fixed_point as fp
+from scripts.balancer.math import solidity_math as m
+from scripts.balancer.math.fixed_point_array import Uint256Array
+
+AMP_PRECISION = 10**3
+
+class CalculationDidNotConverge(Exception):
+    pass
+
+def calculate_invariant(amplificationParameter, balances, roundUp):
+    return _calculate_invariant(amplificationParameter, tuple(balances), roundUp)
+
+@lru_cache(maxsize=4096)
+def _calculate_invariant(amplificationParameter, balances, roundUp):
+    total = 0
+    numTokens = len(balances)
+    for balance in balances:
+        total = fp.add(total, balance)
+    if total == 0:
+        return 0
+
+    prevInvariant = 0
+    invariant = total
+    ampTimesTotal = m.unchecked(amplificationParameter * numTokens)
+
+    for _ in range(255):
+        P_D = m.unchecked(balances[0] * numTokens)
+        for j in range(1, numTokens):
+            P_D = m.div(m.mul(m.mul(P_D, balances[j]), numTokens), invariant, roundUp)
+        prevInvariant = invariant
+        invariant = m.div(
+            fp.add(
+                m.mul(m.mul(numTokens, invariant), invariant),
+                m.div(m.mul(m.mul(ampTimesTotal, total), P_D), AMP_PRECISION, roundUp)
+            ),
+            fp.add(
+                m.mul(numTokens + 1, invariant),
+                m.div(m.mul(m.unchecked(ampTimesTotal - AMP_PRECISION), P_D), AMP_PRECISION, not roundUp)
+            ),
+            roundUp
+        )
+
+        if abs(invariant - prevInvariant) <= 1:
+            return invariant
+
+    raise CalculationDidNotConverge()
+
+def calc_spot_price(amplificationParameter, invariant, balanceX, balanceY):
+    """Calculates the spot price of token Y in token X"""
+    a = m.unchecked(amplificationParameter * 2) // AMP_PRECISION
+    b = fp.sub(m.mul(invariant, a), invariant)
+
+    axy2 = fp.mul_down(m.mul(m.unchecked(a * 2), balanceX), balanceY)
+
+    # dx = a.x.y.2 + a.y^2 - b.y
+    derivativeX = fp.sub(fp.add(axy2, fp.mul_down(m.mul(a, balanceY), balanceY)), fp.mul_down(b, balanceY))
+
+    # dy = a.x.y.2 + a.x^2 - b.x
+    derivativeY = fp.sub(fp.add(axy2, fp.mul_down(m.mul(a, balanceX), balanceX)), fp.mul_down(b, balanceX))
+
+    return fp.div_up(derivativeX, derivativeY)
+
+def get_token_balance_given_invariant_and_all_other_balances(
+    amplificationParameter, balances, invariant, tokenIndex
+):
+    # Rounds result up overall
+    numTokens = len(balances)
+    ampTimesTotal = m.unchecked(amplificationParameter * numTokens)
+    total = balances[0]
+    P_D = m.unchecked(balances[0] * numTokens)
+    for j in range(1, numTokens):
+        P_D = m.div_down(m.mul(m.mul(P_D, balances[j]), numTokens), invariant)
+        total = fp.add(total, balances[j])
+    total = m.unchecked(total - balances[tokenIndex])
+
+    inv2 = m.mul(invariant, invariant)
+    c = m.mul(
+        m.mul(m.div_up(inv2, m.mul(ampTimesTotal, P_D)), AMP_PRECISION),
+        balances[tokenIndex]
+    )
+    b = fp.add(total, m.mul(m.div_down(invariant, ampTimesTotal), AMP_PRECISION))
+
+    prevTokenBalance = 0
+    tokenBalance = m.div_up(fp.add(inv2, c), fp.add(invariant, b))
+
+    for _ in range(255):
+        prevTokenBalance = tokenBalance
+        tokenBalance = m.div_up(
+            fp.add(m.mul(tokenBalance, tokenBalance), c),
+            fp.sub(fp.add(m.mul(tokenBalance, 2), b), invariant)
+        )
+
+        if abs(tokenBalance - prevTokenBalance) <= 1:
+            return tokenBalance
+
+    raise CalculationDidNotConverge()
+
+def calc_token_out_given_exact_bpt_in(
+    amp, balances, tokenIndex, bptAmountIn, bptTotalSupply, swapFeePercentage, currentInvariant
+):
+    # Token out, so we round down overall
+    newInvariant = fp.mul_up(fp.div_up(fp.sub(bptTotalSupply, bptAmountIn), bptTotalSupply), currentInvariant)
+
+    newBalanceTokenIndex = get_token_balance_given_invariant_and_all_other_balances(
+        amp, balances, newInvariant, tokenIndex
+    )
+    amountOutWithoutFee = fp.sub(balances[tokenIndex], newBalanceTokenIndex)
+
+    sumBalances = 0
+    for balance in balances:
+        sumBalances = fp.add(sumBalances, balance)
+
+    currentWeight = fp.div_down(balances[tokenIndex], sumBalances)
+    taxablePercentage = fp.complement(currentWeight)
+
+    taxableAmount = fp.mul_up(amountOutWithoutFee, taxablePercentage)
+    nonTaxableAmount = fp.sub(amountOutWithoutFee, taxableAmount)
+
+    return fp.add(nonTaxableAmount, fp.mul_down(taxableAmount, m.unchecked(fp.ONE - swapFeePercentage)))
+
+def calc_out_given_in(
+    amplificationParameter, balances, tokenIndexIn, tokenIndexOut, tokenAmountIn, invariant
+):
+    # Amount out, so we round down overall. The solidity version mutates and then restores
+    # the balances array, work on a copy instead.
+    balances = list(balances)
+    balances[tokenIndexIn] = fp.add(balances[tokenIndexIn], tokenAmountIn)
+
+    finalBalanceOut = get_token_balance_given_invariant_and_all_other_balances(
+        amplificationParameter, balances, invariant, tokenIndexOut
+    )
+
+    return fp.sub(fp.sub(balances[tokenIndexOut], finalBalanceOut), 1)
+
+def calc_bpt_out_given_exact_tokens_in(
+    amp, balances, amountsIn, bptTotalSupply, swapFeePercentage, currentInvariant
+):
+    # BPT out, so we round down overall
+    sumBalances = 0
+    for balance in balances:
+        sumBalances = fp.add(sumBalances, balance)
+
+    balanceRatiosWithFee = []
+    invariantRatioWithFees = 0
+    for i in range(len(balances)):
+        currentWeight = fp.div_down(balances[i], sumBalances)
+        balanceRatiosWithFee.append(fp.div_down(fp.add(balances[i], amountsIn[i]), balances[i]))
+        invariantRatioWithFees = fp.add(invariantRatioWithFees, fp.mul_down(balanceRatiosWithFee[i], currentWeight))
+
+    newBalances = []
+    for i in range(len(balances)):
+        if balanceRatiosWithFee[i] > invariantRatioWithFees:
+            nonTaxableAmount = fp.mul_down(balances[i], fp.sub(invariantRatioWithFees, fp.ONE))
+            taxableAmount = fp.sub(amountsIn[i], nonTaxableAmount)
+            amountInWithoutFee = fp.add(
+                nonTaxableAmount, fp.mul_down(taxableAmount, m.unchecked(fp.ONE - swapFeePercentage))
+            )
+        else:
+            amountInWithoutFee = amountsIn[i]
+
+        newBalances.append(fp.add(balances[i], amountInWithoutFee))
+
+    newInvariant = calculate_invariant(amp, newBalances, False)
+    invariantRatio = fp.div_down(newInvariant, currentInvariant)
+
+    # If the invariant didn't increase for any reason, we simply don't mint BPT
+    if invariantRatio > fp.ONE:
+        return fp.mul_down(bptTotalSupply, invariantRatio - fp.ONE)
+    return 0
+
+def calculate_invariant_batch(points, roundUp):
+    """points: iterable of (amp, balances)"""
+    return [calculate_invariant(amp, b, roundUp) for (amp, b) in points]
+
+def calc_spot_price_batch(points):
+    """points: iterable of (amp, balanceX, balanceY), the invariant is rounded up
+    the same way Stable2TokenOracleMath._getSpotPrice does"""
+    return [
+        calc_spot_price(amp, calculate_invariant(amp, (x, y), True), x, y)
+        for (amp, x, y) in points
+    ]
+
+def calc_out_given_in_batch(points):
+    """points: iterable of (amp, balances, tokenIndexIn, tokenIndexOut, tokenAmountIn)"""
+    return [
+        calc_out_given_in(amp, b, indexIn, indexOut, amountIn, calculate_invariant(amp, b, True))
+        for (amp, b, indexIn, indexOut, amountIn) in points
+    ]
+
+def calc_token_out_given_exact_bpt_in_batch(points, swapFeePercentage=0):
+    """points: iterable of (amp, balances, tokenIndex, bptAmountIn, bptTotalSupply)"""
+    return [
+        calc_token_out_given_exact_bpt_in(
+            amp, b, tokenIndex, bptAmountIn, bptTotalSupply, swapFeePercentage,
+            calculate_invariant(amp, b, True)
+        )
+        for (amp, b, tokenIndex, bptAmountIn, bptTotalSupply) in points
+    ]
+
+def calc_bpt_out_given_exact_tokens_in_batch(points, swapFeePercentage=0):
+    """points: iterable of (amp, balances, amountsIn, bptTotalSupply)"""
+    return [
+        calc_bpt_out_given_exact_tokens_in(
+            amp, b, amountsIn, bptTotalSupply, swapFeePercentage,
+            calculate_invariant(amp, b, True)
+        )
+        for (amp, b, amountsIn, bptTotalSupply) in points
+    ]
+
+def calculate_invariant_array(amplificationParameter, balances, roundUp):
+    """Vectorized calculate_invariant, balances is a list of Uint256Array (one per token)
+    and amplificationParameter is either an int or a Uint256Array"""
+    numTokens = len(balances)
+    total = balances[0]
+    for balance in balances[1:]:
+        total = total + balance
+    length = len(total)
+    if not isinstance(amplificationParameter, Uint256Array):
+        amplificationParameter = Uint256Array.full(length, amplificationParameter)
+
+    invariant = total.copy()
+    ampTimesTotal = amplificationParameter.wrapping_mul(numTokens)
+    # Zero balances return zero, each point stops iterating once it converges
+    converged = total == 0
+
+    for _ in range(255):
+        active = np.flatnonzero(~converged)
+        if len(active) == 0:
+            return invariant
+
+        prevInvariant = invariant[active]
+        activeBalances = [balance[active] for balance in balances]
+        activeTotal = total[active]
+        activeAmpTimesTotal = ampTimesTotal[active]
+
+        P_D = activeBalances[0].wrapping_mul(numTokens)
+        for j in range(1, numTokens):
+            P_D = (P_D * activeBalances[j] * numTokens).div(prevInvariant, roundUp)
+
+        newInvariant = (
+            (prevInvariant * numTokens * prevInvariant) +
+            (activeAmpTimesTotal * activeTotal * P_D).div(AMP_PRECISION, roundUp)
+        ).div(
+            (prevInvariant * (numTokens + 1)) +
+            (activeAmpTimesTotal.wrapping_sub(AMP_PRECISION) * P_D).div(AMP_PRECISION, not roundUp),
+            roundUp
+        )
+
+        invariant[active] = newInvariant
+        converged[active] = newInvariant.abs_diff(prevInvariant) <= 1
+
+    if converged.all():
+        return invariant
+    raise CalculationDidNotConverge()
+
+def calc_spot_price_array(amplificationParameter, balancesX, balancesY):
+    """Vectorized spot price of token Y in token X over Uint256Array balance columns, the
+    invariant is rounded up the same way Stable2TokenOracleMath._getSpotPrice does"""
+    if not isinstance(amplificationParameter, Uint256Array):
+        amplificationParameter = Uint256Array.full(len(balancesX), amplificationParameter)
+    invariant = calculate_invariant_array(amplificationParameter, [balancesX, balancesY], True)
+
+    a = amplificationParameter.wrapping_mul(2).div_down(AMP_PRECISION)
+    b = (invariant * a) - invariant
+    axy2 = (a.wrapping_mul(2) * balancesX).mul_down(balancesY)
+    derivativeX = (axy2 + (a * balancesY).mul_down(balancesY)) - b.mul_down(balancesY)
+    derivativeY = (axy2 + (a * balancesX).mul_down(balancesX)) - b.mul_down(balancesX)
+
+    return derivativeX.fixed_div_up(derivativeY)
+
+def calc_bpt_out_given_exact_tokens_in_array(
+    amp, balances, amountsIn, bptTotalSupply, swapFeePercentage, currentInvariant
+):
+    """Vectorized calc_bpt_out_given_exact_tokens_in over many candidate joins into the same
+    pool, balances are ints shared by every point and amountsIn is a list of Uint256Array
+    (one per token)"""
+    length = len(amountsIn[0])
+    sumBalances = 0
+    for balance in balances:
+        sumBalances = fp.add(sumBalances, balance)
+
+    balanceRatiosWithFee = []
+    invariantRatioWithFees = Uint256Array.zeros(length)
+    for i in range(len(balances)):
+        currentWeight = fp.div_down(balances[i], sumBalances)
+        balanceRatiosWithFee.append((amountsIn[i] + balances[i]).fixed_div_down(balances[i]))
+        invariantRatioWithFees = invariantRatioWithFees + balanceRatiosWithFee[i].mul_down(currentWeight)
+
+    newBalances = []
+    for i in range(len(balances)):
+        amountInWithoutFee = amountsIn[i].copy()
+        taxed = np.flatnonzero(balanceRatiosWithFee[i] > invariantRatioWithFees)
+        if len(taxed) > 0:
+            nonTaxableAmount = (invariantRatioWithFees[taxed] - fp.ONE).mul_down(balances[i])
+            taxableAmount = amountsIn[i][taxed] - nonTaxableAmount
+            amountInWithoutFee[taxed] = nonTaxableAmount + \
+                taxableAmount.mul_down(m.unchecked(fp.ONE - swapFeePercentage))
+        newBalances.append(amountInWithoutFee + balances[i])
+
+    newInvariant = calculate_invariant_array(amp, newBalances, False)
+    invariantRatio = newInvariant.fixed_div_down(currentInvariant)
+
+    # If the invariant didn't increase for any reason, we simply don't mint BPT
+    minted = invariantRatio > fp.ONE
+    excessRatio = Uint256Array(np.where(minted, invariantRatio.values - fp.ONE, 0))
+    return excessRatio.mul_down(bptTotalSupply)
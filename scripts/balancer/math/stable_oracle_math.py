@@ -0,0 +1,84 @@
+# Python port of contracts/vaults/balancer/internal/math/Stable2TokenOracleMath.sol
+#
+# Context arguments are mappings with the same field names as the solidity
+# structs, so the values returned by vault.getStrategyContext() can be passed in
+# directly. Values that the contract reads on chain (the BPT total supply) are
+# passed in explicitly.
+
+from scripts.balancer.constants import BALANCER_PRECISION, VAULT_PERCENT_BASIS
+from scripts.balancer.errors import InvalidPrice
+from scripts.balancer.math import stable_math
+
+def get_spot_price(oracleContext, poolContext, primaryBalance, secondaryBalance, tokenIndex):
+    if tokenIndex >= 2:
+        raise ValueError("invalid token index")
+
+    # Apply scale factors
+    scaledPrimaryBalance = primaryBalance * poolContext["primaryScaleFactor"] // BALANCER_PRECISION
+    scaledSecondaryBalance = secondaryBalance * poolContext["secondaryScaleFactor"] // BALANCER_PRECISION
+
+    (balanceX, balanceY) = (scaledPrimaryBalance, scaledSecondaryBalance) if tokenIndex == 0 \
+        else (scaledSecondaryBalance, scaledPrimaryBalance)
+
+    invariant = stable_math.calculate_invariant(oracleContext["ampParam"], [balanceX, balanceY], True)
+    spotPrice = stable_math.calc_spot_price(oracleContext["ampParam"], invariant, balanceX, balanceY)
+
+    # Apply secondary scale factor in reverse
+    if tokenIndex == 0:
+        scaleFactor = poolContext["secondaryScaleFactor"] * BALANCER_PRECISION // poolContext["primaryScaleFactor"]
+    else:
+        scaleFactor = poolContext["primaryScaleFactor"] * BALANCER_PRECISION // poolContext["secondaryScaleFactor"]
+    return spotPrice * BALANCER_PRECISION // scaleFactor
+
+def get_price_limits(strategyContext, oraclePrice):
+    deviation = strategyContext["vaultSettings"]["oraclePriceDeviationLimitPercent"]
+    lowerLimit = oraclePrice * (VAULT_PERCENT_BASIS - deviation) // VAULT_PERCENT_BASIS
+    upperLimit = oraclePrice * (VAULT_PERCENT_BASIS + deviation) // VAULT_PERCENT_BASIS
+    return (lowerLimit, upperLimit)
+
+def check_price_limit(strategyContext, oraclePrice, poolPrice):
+    (lowerLimit, upperLimit) = get_price_limits(strategyContext, oraclePrice)
+    if poolPrice < lowerLimit or upperLimit < poolPrice:
+        raise InvalidPrice(oraclePrice, poolPrice)
+
+def get_min_exit_amounts(
+    oracleContext, poolContext, strategyContext, oraclePrice, bptAmount, totalBPTSupply, spotPrice=None
+):
+    # Oracle price is always specified in terms of primary, so tokenIndex == 0 for primary.
+    # The spot price only depends on the pool balances so callers can pass in a precomputed value.
+    if spotPrice is None:
+        spotPrice = get_spot_price(
+            oracleContext, poolContext, poolContext["primaryBalance"], poolContext["secondaryBalance"], 0
+        )
+    check_price_limit(strategyContext, oraclePrice, spotPrice)
+
+    slippageLimit = strategyContext["vaultSettings"]["balancerPoolSlippageLimitPercent"]
+    minPrimary = (poolContext["primaryBalance"] * bptAmount * slippageLimit) // \
+        (totalBPTSupply * VAULT_PERCENT_BASIS)
+    minSecondary = (poolContext["secondaryBalance"] * bptAmount * slippageLimit) // \
+        (totalBPTSupply * VAULT_PERCENT_BASIS)
+    return (minPrimary, minSecondary)
+
+def validate_spot_price_and_pair_price(
+    oracleContext, poolContext, strategyContext, oraclePrice, primaryAmount, secondaryAmount, spotPrice=None
+):
+    if spotPrice is None:
+        spotPrice = get_spot_price(
+            oracleContext, poolContext, poolContext["primaryBalance"], poolContext["secondaryBalance"], 0
+        )
+    check_price_limit(strategyContext, oraclePrice, spotPrice)
+
+    # Balancer math functions expect all amounts to be in BALANCER_PRECISION
+    primaryAmount = primaryAmount * BALANCER_PRECISION // 10 ** poolContext["primaryDecimals"]
+    secondaryAmount = secondaryAmount * BALANCER_PRECISION // 10 ** poolContext["secondaryDecimals"]
+
+    calculatedPairPrice = get_spot_price(oracleContext, poolContext, primaryAmount, secondaryAmount, 0)
+    check_price_limit(strategyContext, oraclePrice, calculatedPairPrice)
+
+def get_oracle_pair_price(rate, decimals):
+    """Mirrors TwoTokenPoolUtils._getOraclePairPrice given the result of tradingModule.getOraclePrice"""
+    if rate <= 0 or decimals < 0:
+        raise ValueError("invalid oracle price")
+    if decimals != BALANCER_PRECISION:
+        rate = rate * BALANCER_PRECISION // decimals
+    return rate
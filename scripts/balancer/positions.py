@@ -0,0 +1,70 @@
+from collections import namedtuple
+from brownie import Wei
+from scripts.balancer import strategy_utils
+from scripts.balancer.boosted_pool import Boosted3TokenPoolModel
+from scripts.balancer.math.fixed_point_array import Uint256Array
+from scripts.balancer.precheck import Stable2TokenPrecheck
+from scripts.multicall import get_vault_accounts, get_vault_states
+
+AccountPosition = namedtuple(
+    "AccountPosition", ["account", "maturity", "vaultShares", "strategyTokens", "bptClaim", "underlyingValue"]
+)
+
+class StrategyPositionSnapshot:
+    """Converts vault shares held by many accounts into strategy tokens, BPT claims and underlying
+    value from one read of the strategy context and one vault state read per maturity"""
+
+    def __init__(self, strategyContext, vaultStates, pool):
+        self.strategyContext = strategyContext
+        # maturity => notional.getVaultState(vault, maturity)
+        self.vaultStates = vaultStates
+        # Stable2TokenPrecheck or Boosted3TokenPoolModel, used to value BPT in the primary currency
+        self.pool = pool
+
+    @classmethod
+    def from_vault(cls, notional, vault, maturities):
+        context = vault.getStrategyContext()
+        maturities = sorted(set(maturities))
+        vaultStates = dict(zip(maturities, get_vault_states(notional, vault, maturities)))
+        if "tertiaryToken" in context["poolContext"].keys():
+            pool = Boosted3TokenPoolModel.from_vault(vault, context)
+        else:
+            pool = Stable2TokenPrecheck.from_vault(vault, context)
+        return cls(context["baseStrategy"], vaultStates, pool)
+
+    def get_positions(self, vaultAccounts):
+        """vaultAccounts: iterable of notional.getVaultAccount results (or any mapping with account,
+        maturity and vaultShares). Accounts are valued one maturity at a time in a single pass."""
+        byMaturity = {}
+        for vaultAccount in vaultAccounts:
+            byMaturity.setdefault(vaultAccount["maturity"], []).append(vaultAccount)
+
+        positions = []
+        for (maturity, maturityAccounts) in byMaturity.items():
+            vaultShares = Uint256Array([Wei(a["vaultShares"]) for a in maturityAccounts])
+            strategyTokens = strategy_utils.get_strategy_tokens_for_vault_shares_array(
+                self.vaultStates[maturity], vaultShares
+            )
+            bptClaims = strategy_utils.convert_strategy_tokens_to_bpt_claims(self.strategyContext, strategyTokens)
+            underlyingValues = self.pool.time_weighted_primary_balances(bptClaims)
+
+            for (i, vaultAccount) in enumerate(maturityAccounts):
+                positions.append(AccountPosition(
+                    vaultAccount["account"],
+                    maturity,
+                    vaultShares[i],
+                    strategyTokens[i],
+                    bptClaims[i],
+                    underlyingValues[i]
+                ))
+        return positions
+
+def get_account_positions(notional, vault, accounts):
+    vaultAccounts = [
+        dict(vaultAccount.dict(), account=account)
+        for (account, vaultAccount) in zip(accounts, get_vault_accounts(notional, vault, accounts))
+    ]
+    # Accounts that have exited the vault have no maturity
+    vaultAccounts = [a for a in vaultAccounts if a["maturity"] != 0]
+    snapshot = StrategyPositionSnapshot.from_vault(notional, vault, [a["maturity"] for a in vaultAccounts])
+    return snapshot.get_positions(vaultAccounts)
@@ -0,0 +1,96 @@
+from collections import namedtuple
+from brownie import Wei, interface
+from scripts.balancer import two_token_pool
+from scripts.balancer.errors import VaultError
+from scripts.balancer.math import stable_oracle_math
+from scripts.balancer.math.fixed_point_array import Uint256Array
+from scripts.balancer.math.stable_math import CalculationDidNotConverge
+
+# success is False when the vault would revert, error holds the exception it would revert with
+PrecheckResult = namedtuple("PrecheckResult", ["success", "minPrimary", "minSecondary", "error"])
+# Failures that the vault would surface as a revert
+PRECHECK_ERRORS = (VaultError, CalculationDidNotConverge, OverflowError, ZeroDivisionError)
+
+class Stable2TokenPrecheck:
+    """Predicts whether Stable2TokenOracleMath checks will pass for a batch of candidate
+    settlements, redemptions and joins against a single snapshot of the pool state"""
+
+    def __init__(self, oracleContext, poolContext, strategyContext, oraclePrice, totalBPTSupply):
+        self.oracleContext = oracleContext
+        self.poolContext = poolContext
+        self.strategyContext = strategyContext
+        self.oraclePrice = oraclePrice
+        self.totalBPTSupply = totalBPTSupply
+        # The pool spot price is shared by every candidate
+        self.spotPrice = stable_oracle_math.get_spot_price(
+            oracleContext, poolContext, poolContext["primaryBalance"], poolContext["secondaryBalance"], 0
+        )
+
+    @classmethod
+    def from_vault(cls, vault, context=None):
+        if context is None:
+            context = vault.getStrategyContext()
+        poolContext = context["poolContext"]
+        strategyContext = context["baseStrategy"]
+        tradingModule = interface.ITradingModule(strategyContext["tradingModule"])
+        (rate, decimals) = tradingModule.getOraclePrice(poolContext["primaryToken"], poolContext["secondaryToken"])
+        totalBPTSupply = interface.IERC20(poolContext["basePool"]["pool"]).totalSupply()
+        return cls(
+            context["oracleContext"],
+            poolContext,
+            strategyContext,
+            stable_oracle_math.get_oracle_pair_price(rate, decimals),
+            totalBPTSupply
+        )
+
+    def price_limits(self):
+        return stable_oracle_math.get_price_limits(self.strategyContext, self.oraclePrice)
+
+    def check_exit(self, bptAmount):
+        try:
+            (minPrimary, minSecondary) = stable_oracle_math.get_min_exit_amounts(
+                self.oracleContext,
+                self.poolContext,
+                self.strategyContext,
+                self.oraclePrice,
+                Wei(bptAmount),
+                self.totalBPTSupply,
+                spotPrice=self.spotPrice
+            )
+        except PRECHECK_ERRORS as e:
+            return PrecheckResult(False, 0, 0, e)
+        return PrecheckResult(True, minPrimary, minSecondary, None)
+
+    def check_join(self, primaryAmount, secondaryAmount):
+        try:
+            stable_oracle_math.validate_spot_price_and_pair_price(
+                self.oracleContext,
+                self.poolContext,
+                self.strategyContext,
+                self.oraclePrice,
+                Wei(primaryAmount),
+                Wei(secondaryAmount),
+                spotPrice=self.spotPrice
+            )
+        except PRECHECK_ERRORS as e:
+            return PrecheckResult(False, 0, 0, e)
+        return PrecheckResult(True, 0, 0, None)
+
+    def check_exits(self, bptAmounts):
+        return [self.check_exit(bptAmount) for bptAmount in bptAmounts]
+
+    def check_joins(self, amounts):
+        """amounts: iterable of (primaryAmount, secondaryAmount)"""
+        return [self.check_join(primary, secondary) for (primary, secondary) in amounts]
+
+    def time_weighted_primary_balances(self, bptAmounts):
+        """Values every BPT amount in the primary currency the same way convertStrategyToUnderlying does"""
+        return two_token_pool.get_time_weighted_primary_balance(
+            self.oracleContext,
+            self.poolContext,
+            self.strategyContext,
+            self.oraclePrice,
+            self.totalBPTSupply,
+            Uint256Array([Wei(bptAmount) for bptAmount in bptAmounts]),
+            spotPrice=self.spotPrice
+        ).tolist()
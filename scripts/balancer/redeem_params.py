@@ -0,0 +1,36 @@
+from brownie import Wei
+from scripts.common import get_redeem_params_batch
+from scripts.balancer import strategy_utils
+from scripts.balancer.precheck import Stable2TokenPrecheck
+
+def get_min_exit_amounts(vault, strategyTokens, precheck=None):
+    """Returns (minPrimary, minSecondary) for each strategy token amount using the same math
+    as Stable2TokenOracleMath._getMinExitAmounts and the vault's balancerPoolSlippageLimitPercent.
+    Raises InvalidPrice if the pool spot price is outside the oracle deviation limit."""
+    if precheck is None:
+        precheck = Stable2TokenPrecheck.from_vault(vault)
+    amounts = []
+    for strategyTokenAmount in strategyTokens:
+        bptClaim = strategy_utils.convert_strategy_tokens_to_bpt_claim(
+            precheck.strategyContext, Wei(strategyTokenAmount)
+        )
+        result = precheck.check_exit(bptClaim)
+        if not result.success:
+            raise result.error
+        amounts.append((result.minPrimary, result.minSecondary))
+    return amounts
+
+def get_min_exit_amounts_for_shares(notional, vault, maturity, vaultShares, precheck=None):
+    vaultState = notional.getVaultState(vault.address, maturity)
+    strategyTokens = [
+        strategy_utils.get_strategy_tokens_for_vault_shares(vaultState, Wei(shares)) for shares in vaultShares
+    ]
+    return get_min_exit_amounts(vault, strategyTokens, precheck)
+
+def get_redeem_params_for_shares(notional, vault, maturity, vaultShares, trade):
+    """Encodes redeem params with exact min exit amounts for each vault share amount, reading
+    the vault, pool and oracle state once for the whole batch"""
+    return get_redeem_params_batch(
+        (minPrimary, minSecondary, trade)
+        for (minPrimary, minSecondary) in get_min_exit_amounts_for_shares(notional, vault, maturity, vaultShares)
+    )
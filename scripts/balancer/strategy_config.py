@@ -0,0 +1,193 @@
+# Typed Balancer strategy vault configs
+#
+# VaultSettings mirrors StrategyVaultSettings and BalancerStrategyConfig holds what
+# BalancerEnvironment needs to deploy, initialize and enable a strategy vault. Both
+# are checked against the limits in BalancerVaultStorage.setStrategyVaultSettings
+# when they are built and are read only afterwards, so the ABI encoded settings and
+# initialize calldata is computed once and kept on the object.
+
+from functools import lru_cache
+from eth_utils import function_signature_to_4byte_selector
+from scripts.abi_codec import get_schema
+from scripts.balancer.constants import (
+    MAX_SETTLEMENT_COOLDOWN_IN_MINUTES,
+    SLIPPAGE_LIMIT_PRECISION,
+    VAULT_PERCENT_BASIS
+)
+
+# (field, solidity bits, upper bound checked by the vault)
+SETTINGS_FIELDS = (
+    ("maxUnderlyingSurplus", 256, None),
+    ("settlementSlippageLimitPercent", 32, SLIPPAGE_LIMIT_PRECISION),
+    ("postMaturitySettlementSlippageLimitPercent", 32, SLIPPAGE_LIMIT_PRECISION),
+    ("emergencySettlementSlippageLimitPercent", 32, SLIPPAGE_LIMIT_PRECISION),
+    ("maxRewardTradeSlippageLimitPercent", 32, SLIPPAGE_LIMIT_PRECISION),
+    ("maxBalancerPoolShare", 16, VAULT_PERCENT_BASIS),
+    ("settlementCoolDownInMinutes", 16, MAX_SETTLEMENT_COOLDOWN_IN_MINUTES),
+    ("oraclePriceDeviationLimitPercent", 16, VAULT_PERCENT_BASIS),
+    ("balancerPoolSlippageLimitPercent", 16, None),
+)
+SETTINGS_NAMES = tuple(name for (name, _, _) in SETTINGS_FIELDS)
+SETTINGS_TYPE = "({})".format(",".join("uint{}".format(bits) for (_, bits, _) in SETTINGS_FIELDS))
+INIT_PARAMS_TYPE = "(string,uint16,{})".format(SETTINGS_TYPE)
+
+SETTINGS_SCHEMA = get_schema(SETTINGS_TYPE)
+INIT_PARAMS_SCHEMA = get_schema(INIT_PARAMS_TYPE)
+
+@lru_cache(maxsize=None)
+def _selector(signature):
+    return function_signature_to_4byte_selector(signature)
+
+def _uint(name, value, bits, limit=None):
+    intValue = int(value)
+    if intValue != value:
+        raise ValueError("{} must be an integer, got {}".format(name, value))
+    if intValue < 0 or intValue >= 2 ** bits:
+        raise ValueError("{} does not fit in uint{}: {}".format(name, bits, intValue))
+    if limit is not None and intValue > limit:
+        raise ValueError("{} is above its limit of {}: {}".format(name, limit, intValue))
+    return intValue
+
+class _Frozen:
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError("{} is read only, use replace()".format(type(self).__name__))
+
+    def _set(self, name, value):
+        object.__setattr__(self, name, value)
+
+class VaultSettings(_Frozen):
+    __slots__ = SETTINGS_NAMES + ("_encoded",)
+
+    def __init__(self, **settings):
+        unknown = set(settings) - set(SETTINGS_NAMES)
+        if len(unknown) > 0:
+            raise ValueError("unknown vault settings: {}".format(sorted(unknown)))
+        missing = [name for name in SETTINGS_NAMES if name not in settings]
+        if len(missing) > 0:
+            raise ValueError("missing vault settings: {}".format(missing))
+
+        for (name, bits, limit) in SETTINGS_FIELDS:
+            self._set(name, _uint(name, settings[name], bits, limit))
+        self._set("_encoded", None)
+
+    @classmethod
+    def from_struct(cls, settings):
+        """settings is a StrategyVaultSettings return value, e.g.
+        vault.getStrategyContext()["baseStrategy"]["vaultSettings"]"""
+        return cls(**{name: settings[name] for name in SETTINGS_NAMES})
+
+    def replace(self, **kwargs):
+        return VaultSettings(**dict(self.as_dict(), **kwargs))
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in SETTINGS_NAMES}
+
+    def as_list(self):
+        """Struct argument for brownie contract calls"""
+        return [getattr(self, name) for name in SETTINGS_NAMES]
+
+    def encode(self):
+        """ABI encoded StrategyVaultSettings"""
+        if self._encoded is None:
+            self._set("_encoded", SETTINGS_SCHEMA.encode(self.as_list()))
+        return self._encoded
+
+    def calldata(self):
+        """setStrategyVaultSettings calldata"""
+        return _selector("setStrategyVaultSettings({})".format(SETTINGS_TYPE)) + self.encode()
+
+    def __eq__(self, other):
+        return isinstance(other, VaultSettings) and self.as_list() == other.as_list()
+
+    def __hash__(self):
+        return hash(tuple(self.as_list()))
+
+    def __repr__(self):
+        return "VaultSettings({})".format(
+            ", ".join("{}={}".format(name, value) for (name, value) in self.as_dict().items())
+        )
+
+def encode_settings_calldata_many(settingsList):
+    """setStrategyVaultSettings calldata for each VaultSettings, for updating a fleet of
+    vaults in one governance batch. Settings that were already encoded are reused."""
+    selector = _selector("setStrategyVaultSettings({})".format(SETTINGS_TYPE))
+    pending = [s for s in settingsList if s._encoded is None]
+    for (settings, encoded) in zip(pending, SETTINGS_SCHEMA.encode_many([s.as_list()] for s in pending)):
+        settings._set("_encoded", encoded)
+    return [selector + s._encoded for s in settingsList]
+
+class BalancerStrategyConfig(_Frozen):
+    __slots__ = (
+        "name",
+        "primaryCurrency",
+        "poolId",
+        "liquidityGauge",
+        "auraRewardPool",
+        "settlementWindow",
+        "vaultConfig",
+        "maxPrimaryBorrowCapacity",
+        "settings",
+        "secondaryBorrowCurrency",
+        "feeReceiver",
+        "_initCalldata",
+    )
+
+    def __init__(
+        self,
+        name,
+        primaryCurrency,
+        poolId,
+        liquidityGauge,
+        auraRewardPool,
+        settlementWindow,
+        vaultConfig,
+        maxPrimaryBorrowCapacity,
+        settings,
+        secondaryBorrowCurrency=None,
+        feeReceiver=None
+    ):
+        if not isinstance(settings, VaultSettings):
+            settings = VaultSettings(**settings)
+        self._set("name", str(name))
+        self._set("primaryCurrency", _uint("primaryCurrency", primaryCurrency, 16))
+        self._set("poolId", poolId)
+        self._set("liquidityGauge", liquidityGauge)
+        self._set("auraRewardPool", auraRewardPool)
+        self._set("settlementWindow", _uint("settlementWindow", settlementWindow, 32))
+        self._set("vaultConfig", tuple(vaultConfig))
+        self._set("maxPrimaryBorrowCapacity", _uint("maxPrimaryBorrowCapacity", maxPrimaryBorrowCapacity, 80))
+        self._set("settings", settings)
+        self._set("secondaryBorrowCurrency", secondaryBorrowCurrency)
+        self._set("feeReceiver", feeReceiver)
+        self._set("_initCalldata", None)
+
+    def replace(self, **kwargs):
+        """Returns a copy with kwargs replaced, vault settings can be given by name"""
+        settingsKwargs = {k: kwargs.pop(k) for k in list(kwargs) if k in SETTINGS_NAMES}
+        fields = {name: getattr(self, name) for name in self.__slots__ if not name.startswith("_")}
+        fields["settings"] = kwargs.pop("settings", self.settings).replace(**settingsKwargs)
+        return BalancerStrategyConfig(**dict(fields, **kwargs))
+
+    def init_params(self):
+        """InitParams argument for vault.initialize"""
+        return [self.name, self.primaryCurrency, self.settings.as_list()]
+
+    def deployment_params(self, tradingModule):
+        """AuraVaultDeploymentParams argument for the vault constructor"""
+        return [
+            self.auraRewardPool,
+            [self.primaryCurrency, self.poolId, self.liquidityGauge, tradingModule, self.settlementWindow]
+        ]
+
+    def initialize_calldata(self):
+        if self._initCalldata is None:
+            self._set(
+                "_initCalldata",
+                _selector("initialize({})".format(INIT_PARAMS_TYPE)) + INIT_PARAMS_SCHEMA.encode(self.init_params())
+            )
+        return self._initCalldata
+
+    def __repr__(self):
+        return "BalancerStrategyConfig(name={!r}, primaryCurrency={})".format(self.name, self.primaryCurrency)
@@ -0,0 +1,48 @@
+# Python port of the strategy token conversions in
+# contracts/vaults/balancer/internal/strategy/StrategyUtils.sol
+
+from scripts.balancer.constants import BALANCER_PRECISION, INTERNAL_TOKEN_PRECISION
+from scripts.balancer.math.fixed_point_array import Uint256Array
+
+def convert_strategy_tokens_to_bpt_claim(strategyContext, strategyTokenAmount):
+    vaultState = strategyContext["vaultState"]
+    if strategyTokenAmount > vaultState["totalStrategyTokenGlobal"]:
+        raise ValueError("strategy token amount exceeds global supply")
+    if vaultState["totalStrategyTokenGlobal"] == 0:
+        return 0
+    return (strategyTokenAmount * vaultState["totalBPTHeld"]) // vaultState["totalStrategyTokenGlobal"]
+
+def convert_bpt_claim_to_strategy_tokens(strategyContext, bptClaim):
+    vaultState = strategyContext["vaultState"]
+    if vaultState["totalBPTHeld"] == 0:
+        # Strategy tokens are in 8 decimal precision, BPT is in 18. Scale the minted amount down.
+        return (bptClaim * INTERNAL_TOKEN_PRECISION) // BALANCER_PRECISION
+    return (bptClaim * vaultState["totalStrategyTokenGlobal"]) // vaultState["totalBPTHeld"]
+
+def get_strategy_tokens_for_vault_shares(vaultState, vaultShares):
+    """Share of a maturity's strategy tokens that Notional redeems for vaultShares"""
+    if vaultState["totalVaultShares"] == 0:
+        return 0
+    return (vaultState["totalStrategyTokens"] * vaultShares) // vaultState["totalVaultShares"]
+
+def convert_strategy_tokens_to_bpt_claims(strategyContext, strategyTokenAmounts):
+    """Vectorized convert_strategy_tokens_to_bpt_claim over a Uint256Array"""
+    vaultState = strategyContext["vaultState"]
+    if (strategyTokenAmounts > vaultState["totalStrategyTokenGlobal"]).any():
+        raise ValueError("strategy token amount exceeds global supply")
+    if vaultState["totalStrategyTokenGlobal"] == 0:
+        return Uint256Array.zeros(len(strategyTokenAmounts))
+    return (strategyTokenAmounts * vaultState["totalBPTHeld"]) // vaultState["totalStrategyTokenGlobal"]
+
+def convert_bpt_claims_to_strategy_tokens(strategyContext, bptClaims):
+    """Vectorized convert_bpt_claim_to_strategy_tokens over a Uint256Array"""
+    vaultState = strategyContext["vaultState"]
+    if vaultState["totalBPTHeld"] == 0:
+        return (bptClaims * INTERNAL_TOKEN_PRECISION) // BALANCER_PRECISION
+    return (bptClaims * vaultState["totalStrategyTokenGlobal"]) // vaultState["totalBPTHeld"]
+
+def get_strategy_tokens_for_vault_shares_array(vaultState, vaultShares):
+    """Vectorized get_strategy_tokens_for_vault_shares over a Uint256Array"""
+    if vaultState["totalVaultShares"] == 0:
+        return Uint256Array.zeros(len(vaultShares))
+    return (vaultShares * vaultState["totalStrategyTokens"]) // vaultState["totalVaultShares"]
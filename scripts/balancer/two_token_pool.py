@@ -0,0 +1,30 @@
+# Python port of the valuation in contracts/vaults/balancer/internal/pool/TwoTokenPoolUtils.sol
+#
+# bptAmount may be an int or a Uint256Array, in which case every amount is valued
+# against the same pool snapshot in one pass.
+
+from scripts.balancer.constants import BALANCER_PRECISION
+from scripts.balancer.math import stable_oracle_math
+
+def get_time_weighted_primary_balance(
+    oracleContext, poolContext, strategyContext, oraclePairPrice, totalBPTSupply, bptAmount, spotPrice=None
+):
+    # tokenIndex == 0 because the oracle pair price is always in terms of the primary currency
+    if spotPrice is None:
+        spotPrice = stable_oracle_math.get_spot_price(
+            oracleContext, poolContext, poolContext["primaryBalance"], poolContext["secondaryBalance"], 0
+        )
+
+    # Make sure spot price is within oracleDeviationLimit of pairPrice
+    stable_oracle_math.check_price_limit(strategyContext, oraclePairPrice, spotPrice)
+
+    # Get shares of primary and secondary balances with the provided bptAmount
+    primaryBalance = poolContext["primaryBalance"] * bptAmount // totalBPTSupply
+    secondaryBalance = poolContext["secondaryBalance"] * bptAmount // totalBPTSupply
+
+    # Value the secondary balance in terms of the primary token using the oraclePairPrice
+    secondaryAmountInPrimary = secondaryBalance * BALANCER_PRECISION // oraclePairPrice
+
+    # Make sure primaryAmount is reported in primaryPrecision
+    primaryPrecision = 10 ** poolContext["primaryDecimals"]
+    return (primaryBalance + secondaryAmountInPrimary) * primaryPrecision // BALANCER_PRECISION
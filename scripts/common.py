@@ -1,8 +1,9 @@
-import json
-import re
-import eth_abi
-from brownie import network, Contract, Wei
+from brownie import Wei
 from brownie.network.state import Chain
+from scripts.abi_codec import get_schema, get_packed_schema
+from scripts.balancer.strategy_config import VaultSettings
+from scripts.deploy_artifacts import deployArtifact
+from scripts.flags import encode_flags, VaultFlags, DexFlags, TradeTypeFlags
 
 chain = Chain()
 
@@ -23,35 +24,6 @@ TRADE_TYPE = {
     'EXACT_OUT_BATCH': 3
 }
 
-def getDependencies(bytecode):
-    deps = set()
-    for marker in re.findall("_{1,}[^_]*_{1,}", bytecode):
-        deps.add(marker)
-    result = list(deps)
-    return result
-
-def deployArtifact(path, constructorArgs, deployer, name, libs=None):
-    with open(path, "r") as a:
-        artifact = json.load(a)
-
-    code = artifact["bytecode"]
-
-    # Resolve dependencies
-    deps = getDependencies(code)
-
-    for dep in deps:
-        library = dep.strip("_")
-        code = code.replace(dep, libs[library][-40:])
-
-    createdContract = network.web3.eth.contract(abi=artifact["abi"], bytecode=code)
-    txn = createdContract.constructor(*constructorArgs).buildTransaction(
-        {"from": deployer.address, "nonce": deployer.nonce}
-    )
-    # This does a manual deployment of a contract
-    tx_receipt = deployer.transfer(data=txn["data"])
-
-    return Contract.from_abi(name, tx_receipt.contract_address, abi=artifact["abi"], owner=deployer)
-
 def get_vault_config(**kwargs):
     return [
         kwargs.get("flags", 0),  # 0: flags
@@ -68,132 +40,75 @@ def get_vault_config(**kwargs):
     ]
 
 def set_flags(flags, **kwargs):
-    binList = list(format(flags, "b").rjust(16, "0"))
-    if "ENABLED" in kwargs:
-        binList[0] = "1"
-    if "ALLOW_ROLL_POSITION" in kwargs:
-        binList[1] = "1"
-    if "ONLY_VAULT_ENTRY" in kwargs:
-        binList[2] = "1"
-    if "ONLY_VAULT_EXIT" in kwargs:
-        binList[3] = "1"
-    if "ONLY_VAULT_ROLL" in kwargs:
-        binList[4] = "1"
-    if "ONLY_VAULT_DELEVERAGE" in kwargs:
-        binList[5] = "1"
-    if "ONLY_VAULT_SETTLE" in kwargs:
-        binList[6] = "1"
-    if "TRANSFER_SHARES_ON_DELEVERAGE" in kwargs:
-        binList[7] = "1"
-    if "ALLOW_REENTRNACY" in kwargs:
-        binList[8] = "1"
-    return int("".join(reversed(binList)), 2)
+    return encode_flags(VaultFlags, flags, **kwargs)
 
 def get_updated_vault_settings(settings, **kwargs):
-    return [
-        kwargs.get("maxUnderlyingSurplus", settings["maxUnderlyingSurplus"]), 
-        kwargs.get("settlementSlippageLimitPercent", settings["settlementSlippageLimitPercent"]), 
-        kwargs.get("postMaturitySettlementSlippageLimitPercent", settings["postMaturitySettlementSlippageLimitPercent"]), 
-        kwargs.get("emergencySettlementSlippageLimitPercent", settings["emergencySettlementSlippageLimitPercent"]),
-        kwargs.get("maxRewardTradeSlippageLimitPercent", settings["maxRewardTradeSlippageLimitPercent"]),
-        kwargs.get("maxBalancerPoolShare", settings["maxBalancerPoolShare"]), 
-        kwargs.get("settlementCoolDownInMinutes", settings["settlementCoolDownInMinutes"]), 
-        kwargs.get("oraclePriceDeviationLimitPercent", settings["oraclePriceDeviationLimitPercent"]),
-        kwargs.get("balancerPoolSlippageLimitPercent", settings["balancerPoolSlippageLimitPercent"])
-    ]
+    return VaultSettings.from_struct(settings).replace(**kwargs).as_list()
+
+DYNAMIC_TRADE_PARAMS = get_schema('(uint16,uint8,uint32,bool,bytes)')
+DEPOSIT_TRADE_PARAMS = get_schema('(uint256,(uint16,uint8,uint32,bool,bytes))')
+DEPOSIT_PARAMS = get_schema('(uint256,uint256,uint32,uint32,bytes)')
+REDEEM_PARAMS = get_schema('(uint256,uint256,bytes)')
+UNIV2_DATA = get_schema('(address[])')
+UNIV3_SINGLE_DATA = get_schema('(uint24)')
+UNIV3_BATCH_DATA = get_schema('(bytes)')
 
 def get_univ2_data(path):
-    return eth_abi.encode_abi(['(address[])'], [[path]])
+    return UNIV2_DATA.encode([path])
 
 def get_univ3_single_data(fee):
-    return eth_abi.encode_abi(['(uint24)'], [[fee]])
+    return UNIV3_SINGLE_DATA.encode([fee])
 
 def get_univ3_batch_data(path):
-    pathTypes = []
-    for idx in range(len(path)):
-        if idx % 2 == 0:
-            pathTypes.append('address')
-        else:
-            pathTypes.append('uint24')
-    packedEncoder = eth_abi.codec.ABIEncoder(eth_abi.registry.registry_packed)
-    return eth_abi.encode_abi(['(bytes)'], [[packedEncoder.encode_abi(
-        pathTypes,
-        path,
-    )]])
+    # Path is token, fee, token, fee, ..., token packed together
+    pathTypes = tuple('address' if idx % 2 == 0 else 'uint24' for idx in range(len(path)))
+    return UNIV3_BATCH_DATA.encode([get_packed_schema(*pathTypes).encode(*path)])
+
+def _deposit_trade_params(dexId, tradeType, amount, slippage, unwrap, exchangeData):
+    return ([Wei(amount), [dexId, tradeType, Wei(slippage), unwrap, exchangeData]],)
+
+def _dynamic_trade_params(dexId, tradeType, slippage, unwrap, exchangeData):
+    return ([dexId, tradeType, Wei(slippage), unwrap, exchangeData],)
+
+def _deposit_params(minBPT=0, secondaryBorrow=0, trade=bytes(0)):
+    return ([
+        minBPT,
+        secondaryBorrow,
+        0, # secondaryBorrowLimit
+        0, # secondaryRollLendLimit
+        trade
+    ],)
+
+def _redeem_params(minPrimary, minSecondary, trade):
+    return ([Wei(minPrimary), Wei(minSecondary), trade],)
 
 def get_deposit_trade_params(dexId, tradeType, amount, slippage, unwrap, exchangeData):
-    return eth_abi.encode_abi(
-        ['(uint256,(uint16,uint8,uint32,bool,bytes))'],
-        [[
-            Wei(amount),
-            [
-                dexId,
-                tradeType,
-                Wei(slippage),
-                unwrap,
-                exchangeData
-            ]
-        ]]
-    )
+    return DEPOSIT_TRADE_PARAMS.encode(*_deposit_trade_params(dexId, tradeType, amount, slippage, unwrap, exchangeData))
 
 def get_dynamic_trade_params(dexId, tradeType, slippage, unwrap, exchangeData):
-    return eth_abi.encode_abi(
-        ['(uint16,uint8,uint32,bool,bytes)'],
-        [[
-            dexId,
-            tradeType,
-            Wei(slippage),
-            unwrap,
-            exchangeData
-        ]]
-    )
+    return DYNAMIC_TRADE_PARAMS.encode(*_dynamic_trade_params(dexId, tradeType, slippage, unwrap, exchangeData))
 
 def get_deposit_params(minBPT=0, secondaryBorrow=0, trade=bytes(0)):
-    return eth_abi.encode_abi(
-        ['(uint256,uint256,uint32,uint32,bytes)'],
-        [[
-            minBPT,
-            secondaryBorrow,
-            0, # secondaryBorrowLimit
-            0, # secondaryRollLendLimit
-            trade
-        ]]
-    )
+    return DEPOSIT_PARAMS.encode(*_deposit_params(minBPT, secondaryBorrow, trade))
 
 def get_redeem_params(minPrimary, minSecondary, trade):
-    return eth_abi.encode_abi(
-        ['(uint256,uint256,bytes)'],
-        [[
-            Wei(minPrimary * 0.98),
-            Wei(minSecondary * 0.98),
-            trade
-        ]]
-    )
+    return REDEEM_PARAMS.encode(*_redeem_params(minPrimary, minSecondary, trade))
+
+# Bulk versions of the param builders above, each takes an iterable of argument tuples
+def get_deposit_trade_params_batch(params):
+    return DEPOSIT_TRADE_PARAMS.encode_many(_deposit_trade_params(*p) for p in params)
+
+def get_dynamic_trade_params_batch(params):
+    return DYNAMIC_TRADE_PARAMS.encode_many(_dynamic_trade_params(*p) for p in params)
+
+def get_deposit_params_batch(params):
+    return DEPOSIT_PARAMS.encode_many(_deposit_params(*p) for p in params)
+
+def get_redeem_params_batch(params):
+    return REDEEM_PARAMS.encode_many(_redeem_params(*p) for p in params)
 
 def set_dex_flags(flags, **kwargs):
-    binList = list(format(flags, "b").rjust(16, "0"))
-    if "UNISWAP_V2" in kwargs:
-        binList[1] = "1"
-    if "UNISWAP_V3" in kwargs:
-        binList[2] = "1"
-    if "ZERO_EX" in kwargs:
-        binList[3] = "1"
-    if "BALANCER_V2" in kwargs:
-        binList[4] = "1"
-    if "CURVE" in kwargs:
-        binList[5] = "1"
-    if "NOTIONAL_VAULT" in kwargs:
-        binList[6] = "1"
-    return int("".join(reversed(binList)), 2)
+    return encode_flags(DexFlags, flags, **kwargs)
 
 def set_trade_type_flags(flags, **kwargs):
-    binList = list(format(flags, "b").rjust(16, "0"))
-    if "EXACT_IN_SINGLE" in kwargs:
-        binList[0] = "1"
-    if "EXACT_OUT_SINGLE" in kwargs:
-        binList[1] = "1"
-    if "EXACT_IN_BATCH" in kwargs:
-        binList[2] = "1"
-    if "EXACT_OUT_BATCH" in kwargs:
-        binList[3] = "1"
-    return int("".join(reversed(binList)), 2)
\ No newline at end of file
+    return encode_flags(TradeTypeFlags, flags, **kwargs)
@@ -0,0 +1,135 @@
+# Offline valuation of CrossCurrencyfCashVault strategy tokens
+#
+# Mirrors CrossCurrencyfCashVault.convertStrategyToUnderlying along with the
+# Notional views it depends on (CashGroup.calculateOracleRate, interpolateOracleRate
+# and AssetHandler.getPresentfCashValue). The lend currency markets and the trading
+# module oracle price are read once, every maturity is then valued locally.
+#
+# The discount factor is computed with exp() at high precision instead of the
+# ABDKMath64x64 approximation, in rare cases it can differ from the contract by one
+# unit of RATE_PRECISION.
+
+from decimal import Decimal, localcontext
+from brownie import ZERO_ADDRESS, interface
+from scripts import date_time
+from scripts.trading.oracle_limits import OracleSnapshot
+
+RATE_PRECISION = 10**9
+IMPLIED_RATE_TIME = 360 * date_time.DAY
+INTERNAL_TOKEN_PRECISION = 10**8
+# TokenType.NonMintable in contracts/global/Types.sol
+NON_MINTABLE_TOKEN_TYPE = 4
+
+def _sdiv(a, b):
+    # int256 division truncates towards zero
+    q = abs(a) // abs(b)
+    return q if (a >= 0) == (b >= 0) else -q
+
+def get_discount_factor(timeToMaturity, oracleRate):
+    # exp(-oracleRate * timeToMaturity / IMPLIED_RATE_TIME) in RATE_PRECISION, the exponent
+    # is truncated to an integer and then to 64.64 fixed point the same way as the contract
+    exponent = (oracleRate * timeToMaturity // IMPLIED_RATE_TIME << 64) // RATE_PRECISION
+    with localcontext() as context:
+        context.prec = 60
+        expValue = int((-Decimal(exponent) / Decimal(2**64)).exp() * Decimal(2**64))
+    return (expValue * RATE_PRECISION) >> 64
+
+def get_present_fcash_value(notional, maturity, blockTime, oracleRate):
+    if notional == 0:
+        return 0
+    if maturity < blockTime:
+        raise ValueError("maturity in the past")
+    discountFactor = get_discount_factor(maturity - blockTime, oracleRate)
+    if discountFactor > RATE_PRECISION:
+        raise ValueError("invalid discount factor")
+    return _sdiv(notional * discountFactor, RATE_PRECISION)
+
+def interpolate_oracle_rate(shortMaturity, longMaturity, shortRate, longRate, assetMaturity):
+    if not (shortMaturity < assetMaturity < longMaturity):
+        raise ValueError("invalid interpolation")
+    if longRate >= shortRate:
+        return (longRate - shortRate) * (assetMaturity - shortMaturity) // (longMaturity - shortMaturity) + shortRate
+    # The slope is negative, this is reversed to keep it positive
+    return shortRate - (shortRate - longRate) * (assetMaturity - shortMaturity) // (longMaturity - shortMaturity)
+
+class CrossCurrencyfCashValuation:
+    """Values fCash strategy tokens of a CrossCurrencyfCashVault in the borrow currency"""
+
+    def __init__(self, blockTime, oracleRates, oraclePrice, borrowTokenDecimals, supplyRate=None):
+        self.blockTime = blockTime
+        # Market maturity => oracle rate at blockTime, as returned by getActiveMarkets
+        self.oracleRates = oracleRates
+        self.maxMarketIndex = len(oracleRates)
+        # (rate, rateDecimals) of the lend underlying in the borrow underlying
+        self.oraclePrice = oraclePrice
+        self.borrowTokenDecimals = borrowTokenDecimals
+        # Annualized supply rate of the lend asset token, only needed to value idiosyncratic
+        # maturities that fall before the first market
+        self.supplyRate = supplyRate
+        self._presentValueRates = {}
+
+    @classmethod
+    def from_vault(cls, notional, vault, oracleSnapshot=None):
+        lendCurrencyId = vault.LEND_CURRENCY_ID()
+        lendUnderlying = vault.LEND_UNDERLYING_TOKEN()
+        (assetToken, underlyingToken) = notional.getCurrency(notional.getVaultConfig(vault.address)["borrowCurrencyId"])
+        # Same as BaseStrategyVault._getNotionalUnderlyingToken
+        if assetToken["tokenType"] == NON_MINTABLE_TOKEN_TYPE:
+            borrowUnderlying = assetToken["tokenAddress"]
+        else:
+            borrowUnderlying = underlyingToken["tokenAddress"]
+        borrowTokenDecimals = 10 ** (
+            18 if borrowUnderlying == ZERO_ADDRESS else interface.IERC20(borrowUnderlying).decimals()
+        )
+
+        if oracleSnapshot is None:
+            oracleSnapshot = OracleSnapshot(
+                interface.ITradingModule(vault.TRADING_MODULE()), [lendUnderlying, borrowUnderlying]
+            )
+        markets = notional.getActiveMarkets(lendCurrencyId, block_identifier=oracleSnapshot.blockNumber)
+        return cls(
+            oracleSnapshot.blockTime,
+            {market["maturity"]: market["oracleRate"] for market in markets},
+            oracleSnapshot.get_oracle_price(lendUnderlying, borrowUnderlying),
+            borrowTokenDecimals
+        )
+
+    def get_oracle_rate(self, maturity):
+        """Mirrors CashGroup.calculateOracleRate"""
+        (marketIndex, idiosyncratic) = date_time.get_market_index(self.maxMarketIndex, maturity, self.blockTime)
+        if not idiosyncratic:
+            return self.oracleRates[maturity]
+
+        referenceTime = date_time.get_reference_time(self.blockTime)
+        longMaturity = referenceTime + date_time.get_traded_market(marketIndex)
+        longRate = self.oracleRates[longMaturity]
+        if marketIndex == 1:
+            # The short market is the annualized asset supply rate
+            if self.supplyRate is None:
+                raise ValueError("supply rate required for maturities before the first market")
+            (shortMaturity, shortRate) = (self.blockTime, self.supplyRate)
+        else:
+            shortMaturity = referenceTime + date_time.get_traded_market(marketIndex - 1)
+            shortRate = self.oracleRates[shortMaturity]
+        return interpolate_oracle_rate(shortMaturity, longMaturity, shortRate, longRate, maturity)
+
+    def get_present_value(self, strategyTokens, maturity):
+        if maturity <= self.blockTime:
+            # After maturity, strategy tokens no longer have a present value
+            return strategyTokens
+        if maturity not in self._presentValueRates:
+            self._presentValueRates[maturity] = self.get_oracle_rate(maturity)
+        return get_present_fcash_value(strategyTokens, maturity, self.blockTime, self._presentValueRates[maturity])
+
+    def convert_strategy_to_underlying(self, strategyTokens, maturity):
+        (rate, rateDecimals) = self.oraclePrice
+        pvInternal = self.get_present_value(int(strategyTokens), maturity)
+        # (pv (8 decimals) * borrowTokenDecimals * rate) / (rateDecimals * 8 decimals)
+        return _sdiv(pvInternal * self.borrowTokenDecimals * rate, rateDecimals * INTERNAL_TOKEN_PRECISION)
+
+    def value_maturities(self, strategyTokensByMaturity):
+        """strategyTokensByMaturity: maturity => strategy tokens, e.g. totalStrategyTokens per vault state"""
+        return {
+            maturity: self.convert_strategy_to_underlying(strategyTokens, maturity)
+            for (maturity, strategyTokens) in strategyTokensByMaturity.items()
+        }
@@ -0,0 +1,154 @@
+# Python port of contracts/global/DateTime.sol
+#
+# Market maturities only depend on the reference time (the start of the current
+# quarter), so MarketCalendar precomputes the traded market maturities for every
+# quarter in a range and answers maturity and market index lookups with a table
+# lookup instead of a notional.getActiveMarkets call.
+
+# contracts/global/Constants.sol
+DAY = 86400
+WEEK = DAY * 6
+MONTH = WEEK * 5
+QUARTER = MONTH * 3
+YEAR = QUARTER * 4
+
+DAYS_IN_WEEK = 6
+DAYS_IN_MONTH = 30
+DAYS_IN_QUARTER = 90
+
+MAX_DAY_OFFSET = 90
+MAX_WEEK_OFFSET = 360
+MAX_MONTH_OFFSET = 2160
+MAX_QUARTER_OFFSET = 7650
+
+WEEK_BIT_OFFSET = 90
+MONTH_BIT_OFFSET = 135
+QUARTER_BIT_OFFSET = 195
+
+MAX_TRADED_MARKET_INDEX = 7
+
+TRADED_MARKETS = [QUARTER, 2 * QUARTER, YEAR, 2 * YEAR, 5 * YEAR, 10 * YEAR, 20 * YEAR]
+
+def get_reference_time(blockTime):
+    if blockTime < QUARTER:
+        raise ValueError("block time before first quarter")
+    return blockTime - (blockTime % QUARTER)
+
+def get_time_utc0(time):
+    if time < DAY:
+        raise ValueError("time before first day")
+    return time - (time % DAY)
+
+def get_traded_market(index):
+    # Markets are 1-indexed because the 0 index means that no markets are listed for the cash group
+    if index < 1 or index > MAX_TRADED_MARKET_INDEX:
+        raise ValueError("Invalid index")
+    return TRADED_MARKETS[index - 1]
+
+def is_valid_maturity(maxMarketIndex, maturity, blockTime):
+    maxMaturity = get_reference_time(blockTime) + get_traded_market(maxMarketIndex)
+    # Cannot trade past max maturity
+    if maturity > maxMaturity:
+        return False
+
+    (_, isValid) = get_bit_num_from_maturity(blockTime, maturity)
+    return isValid
+
+def get_market_index(maxMarketIndex, maturity, blockTime):
+    """Returns (marketIndex, isIdiosyncratic)"""
+    if maxMarketIndex == 0:
+        raise ValueError("CG: no markets listed")
+    if maxMarketIndex > MAX_TRADED_MARKET_INDEX:
+        raise ValueError("CG: market index bound")
+    tRef = get_reference_time(blockTime)
+
+    for i in range(1, maxMarketIndex + 1):
+        marketMaturity = tRef + get_traded_market(i)
+        # If market matches then is not idiosyncratic
+        if marketMaturity == maturity:
+            return (i, False)
+        # Returns the market that is immediately greater than the maturity
+        if marketMaturity > maturity:
+            return (i, True)
+
+    raise ValueError("CG: no market found")
+
+def get_bit_num_from_maturity(blockTime, maturity):
+    """Returns (bitNum, isExact)"""
+    blockTimeUTC0 = get_time_utc0(blockTime)
+
+    # Maturities must always divide days evenly
+    if maturity % DAY != 0:
+        return (0, False)
+    # Maturity cannot be in the past
+    if blockTimeUTC0 >= maturity:
+        return (0, False)
+
+    daysOffset = (maturity - blockTimeUTC0) // DAY
+
+    if daysOffset <= MAX_DAY_OFFSET:
+        return (daysOffset, True)
+    elif daysOffset <= MAX_WEEK_OFFSET:
+        offsetInDays = daysOffset - MAX_DAY_OFFSET + (blockTimeUTC0 % WEEK) // DAY
+        return (WEEK_BIT_OFFSET + offsetInDays // DAYS_IN_WEEK, offsetInDays % DAYS_IN_WEEK == 0)
+    elif daysOffset <= MAX_MONTH_OFFSET:
+        offsetInDays = daysOffset - MAX_WEEK_OFFSET + (blockTimeUTC0 % MONTH) // DAY
+        return (MONTH_BIT_OFFSET + offsetInDays // DAYS_IN_MONTH, offsetInDays % DAYS_IN_MONTH == 0)
+    elif daysOffset <= MAX_QUARTER_OFFSET:
+        offsetInDays = daysOffset - MAX_MONTH_OFFSET + (blockTimeUTC0 % QUARTER) // DAY
+        return (QUARTER_BIT_OFFSET + offsetInDays // DAYS_IN_QUARTER, offsetInDays % DAYS_IN_QUARTER == 0)
+
+    # This is the maximum 1-indexed bit num, it is never valid because it is beyond the 20
+    # year max maturity
+    return (256, False)
+
+class MarketCalendar:
+    """Traded market maturities for every quarter between fromTime and toTime. Block times
+    outside of the precomputed range are added to the table on first use."""
+
+    def __init__(self, fromTime, toTime):
+        # reference time => (maturities, {maturity: marketIndex})
+        self.quarters = {}
+        for tRef in range(get_reference_time(fromTime), get_reference_time(toTime) + 1, QUARTER):
+            self._add_quarter(tRef)
+
+    def _add_quarter(self, tRef):
+        maturities = tuple(tRef + offset for offset in TRADED_MARKETS)
+        self.quarters[tRef] = (maturities, {maturity: i + 1 for (i, maturity) in enumerate(maturities)})
+        return self.quarters[tRef]
+
+    def _get_quarter(self, blockTime):
+        tRef = get_reference_time(blockTime)
+        quarter = self.quarters.get(tRef)
+        if quarter is None:
+            quarter = self._add_quarter(tRef)
+        return quarter
+
+    def get_maturity(self, blockTime, marketIndex):
+        """Maturity of the 1-indexed market, same as getActiveMarkets(currencyId)[marketIndex - 1][1]"""
+        if marketIndex < 1 or marketIndex > MAX_TRADED_MARKET_INDEX:
+            raise ValueError("Invalid index")
+        return self._get_quarter(blockTime)[0][marketIndex - 1]
+
+    def get_active_maturities(self, blockTime, maxMarketIndex):
+        return list(self._get_quarter(blockTime)[0][:maxMarketIndex])
+
+    def get_market_index(self, maxMarketIndex, maturity, blockTime):
+        if maxMarketIndex == 0:
+            raise ValueError("CG: no markets listed")
+        if maxMarketIndex > MAX_TRADED_MARKET_INDEX:
+            raise ValueError("CG: market index bound")
+        (maturities, marketIndexes) = self._get_quarter(blockTime)
+        marketIndex = marketIndexes.get(maturity)
+        if marketIndex is not None and marketIndex <= maxMarketIndex:
+            return (marketIndex, False)
+        return get_market_index(maxMarketIndex, maturity, blockTime)
+
+# Covers the fork block used by the tests and the following decade of quarters
+calendar = MarketCalendar(1640995200, 1640995200 + 10 * YEAR)
+
+def get_maturity(blockTime, marketIndex):
+    return calendar.get_maturity(blockTime, marketIndex)
+
+def get_active_maturities(blockTime, maxMarketIndex):
+    return calendar.get_active_maturities(blockTime, maxMarketIndex)
@@ -0,0 +1,101 @@
+# Deployment of prebuilt contract artifacts (scripts/artifacts)
+#
+# The artifacts are full brownie build outputs of 1-3MB, of which only the abi and
+# the bytecode are needed to deploy. ArtifactCache keeps a compact copy of both on
+# disk keyed by the sha256 of the artifact (using the AbiStore index) and keeps the
+# linked bytecode in memory keyed by the artifact hash and the library addresses.
+#
+# deployArtifacts sends a batch of independent deployments through a TxPipeline, so
+# they are mined in the same block cycle.
+
+import json
+import os
+import re
+from collections import namedtuple
+from brownie import network, Contract
+from scripts.abi_store import AbiStore, CACHE_DIR, abis, write_atomic
+from scripts.tx_pipeline import TxPipeline
+
+Artifact = namedtuple("Artifact", ["hash", "abi", "bytecode", "dependencies"])
+
+def getDependencies(bytecode):
+    deps = set()
+    for marker in re.findall("_{1,}[^_]*_{1,}", bytecode):
+        deps.add(marker)
+    result = list(deps)
+    return result
+
+class ArtifactCache:
+    def __init__(self, cacheDir=CACHE_DIR):
+        self.cacheDir = cacheDir
+        # The shared store keeps a single in memory index per cache directory
+        self.store = abis if cacheDir == abis.cacheDir else AbiStore(cacheDir=cacheDir)
+        self._artifacts = {}
+        self._linked = {}
+
+    def load(self, path):
+        artifactHash = self.store.get_hash(path)
+        artifact = self._artifacts.get(artifactHash)
+        if artifact is not None:
+            return artifact
+
+        cachePath = os.path.join(self.cacheDir, artifactHash + ".artifact.json")
+        try:
+            with open(cachePath) as f:
+                compact = json.load(f)
+        except (OSError, ValueError):
+            with open(path) as f:
+                full = json.load(f)
+            compact = {"abi": full["abi"], "bytecode": full["bytecode"]}
+            os.makedirs(self.cacheDir, exist_ok=True)
+            write_atomic(cachePath, compact)
+
+        artifact = Artifact(artifactHash, compact["abi"], compact["bytecode"], tuple(getDependencies(compact["bytecode"])))
+        self._artifacts[artifactHash] = artifact
+        return artifact
+
+    def link(self, path, libs=None):
+        """Returns the artifact and its bytecode with the library placeholders replaced by
+        the addresses in libs (library name => address)"""
+        artifact = self.load(path)
+        if len(artifact.dependencies) == 0:
+            return (artifact, artifact.bytecode)
+
+        addresses = tuple(sorted((dep, libs[dep.strip("_")][-40:].lower()) for dep in artifact.dependencies))
+        key = (artifact.hash, addresses)
+        code = self._linked.get(key)
+        if code is None:
+            code = artifact.bytecode
+            for (dep, address) in addresses:
+                code = code.replace(dep, address)
+            self._linked[key] = code
+        return (artifact, code)
+
+artifacts = ArtifactCache()
+
+def _get_deploy_data(path, constructorArgs, libs):
+    (artifact, code) = artifacts.link(path, libs)
+    createdContract = network.web3.eth.contract(abi=artifact.abi, bytecode=code)
+    return (artifact, createdContract.constructor(*constructorArgs).data_in_transaction)
+
+def deployArtifact(path, constructorArgs, deployer, name, libs=None):
+    (artifact, data) = _get_deploy_data(path, constructorArgs, libs)
+    # This does a manual deployment of a contract
+    tx_receipt = deployer.transfer(data=data)
+
+    return Contract.from_abi(name, tx_receipt.contract_address, abi=artifact.abi, owner=deployer)
+
+def deployArtifacts(deployments, deployer):
+    """deployments: list of (path, constructorArgs, name, libs) for contracts that do
+    not depend on each other, returns the deployed contracts in the same order"""
+    pipeline = TxPipeline()
+    deployed = []
+    for (path, args, name, libs) in deployments:
+        (artifact, data) = _get_deploy_data(path, args, libs)
+        pipeline.transfer(None, data, sender=deployer)
+        deployed.append((artifact, name))
+
+    return [
+        Contract.from_abi(name, txn.contract_address, abi=artifact.abi, owner=deployer)
+        for ((artifact, name), txn) in zip(deployed, pipeline.run())
+    ]
@@ -1,5 +1,4 @@
 import eth_abi
-import json
 from brownie import (
     ZERO_ADDRESS,
     accounts, 
@@ -17,6 +16,7 @@ from eth_utils import keccak
 from brownie.network.state import Chain
 from brownie.convert.datatypes import Wei
 from scripts.trading.environment import Environment as TradingEnvironment
+from scripts.abi_store import abis
 from scripts.common import deployArtifact
 
 ETH_ADDRESS = "0x0000000000000000000000000000000000000000"
@@ -163,9 +163,7 @@ class Environment:
         )
 
     def loadPool2TokensFactory(self, address):
-        with open("./abi/balancer/poolFactory.json", "r") as f:
-            abi = json.load(f)
-        return Contract.from_abi('Weighted Pool 2 Token Factory', address, abi)
+        return Contract.from_abi('Weighted Pool 2 Token Factory', address, abis["balancer/poolFactory"])
 
     def deployBalancerPool(self, poolConfig, owner, deployer):
         # NOTE: owner is immutable, need to deploy the proxy first
@@ -0,0 +1,79 @@
+# Bit flags used by Notional vault configs and trading module token permissions
+#
+# VaultFlags mirrors the flags documented in Notional's VaultConfiguration.sol,
+# DexFlags and TradeTypeFlags are 1 << DexId and 1 << TradeType from
+# interfaces/trading/ITradingModule.sol.
+
+from collections import namedtuple
+from enum import IntFlag
+from functools import lru_cache
+
+class VaultFlags(IntFlag):
+    ENABLED = 1 << 0
+    ALLOW_ROLL_POSITION = 1 << 1
+    ONLY_VAULT_ENTRY = 1 << 2
+    ONLY_VAULT_EXIT = 1 << 3
+    ONLY_VAULT_ROLL = 1 << 4
+    ONLY_VAULT_DELEVERAGE = 1 << 5
+    ONLY_VAULT_SETTLE = 1 << 6
+    TRANSFER_SHARES_ON_DELEVERAGE = 1 << 7
+    ALLOW_REENTRANCY = 1 << 8
+
+# Layout before TRANSFER_SHARES_ON_DELEVERAGE was added, used by deployments that
+# still take the ten field vault config (tests/fixtures.py get_vault_config)
+class LegacyVaultFlags(IntFlag):
+    ENABLED = 1 << 0
+    ALLOW_ROLL_POSITION = 1 << 1
+    ONLY_VAULT_ENTRY = 1 << 2
+    ONLY_VAULT_EXIT = 1 << 3
+    ONLY_VAULT_ROLL = 1 << 4
+    ONLY_VAULT_DELEVERAGE = 1 << 5
+    ONLY_VAULT_SETTLE = 1 << 6
+    ALLOW_REENTRANCY = 1 << 7
+
+class DexFlags(IntFlag):
+    UNISWAP_V2 = 1 << 1
+    UNISWAP_V3 = 1 << 2
+    ZERO_EX = 1 << 3
+    BALANCER_V2 = 1 << 4
+    CURVE = 1 << 5
+    NOTIONAL_VAULT = 1 << 6
+
+class TradeTypeFlags(IntFlag):
+    EXACT_IN_SINGLE = 1 << 0
+    EXACT_OUT_SINGLE = 1 << 1
+    EXACT_IN_BATCH = 1 << 2
+    EXACT_OUT_BATCH = 1 << 3
+
+TokenPermissions = namedtuple("TokenPermissions", ["allowSell", "dexFlags", "tradeTypeFlags"])
+
+def encode_flags(flagType, flags=0, **kwargs):
+    """Sets the named flags on top of flags, e.g. encode_flags(VaultFlags, ENABLED=True)"""
+    value = flagType(flags)
+    for (name, enabled) in kwargs.items():
+        if name not in flagType.__members__:
+            raise ValueError("unknown {} flag {}".format(flagType.__name__, name))
+        if enabled:
+            value |= flagType[name]
+    return int(value)
+
+@lru_cache(maxsize=None)
+def decode_flags(flagType, value):
+    """Returns the names of the flags set in value, bits without a name are ignored"""
+    value = int(value)
+    return tuple(member.name for member in flagType if value & member)
+
+def decode_flags_many(flagType, values):
+    return [decode_flags(flagType, int(value)) for value in values]
+
+@lru_cache(maxsize=None)
+def _decode_token_permissions(allowSell, dexFlags, tradeTypeFlags):
+    return TokenPermissions(allowSell, DexFlags(dexFlags), TradeTypeFlags(tradeTypeFlags))
+
+def decode_token_permissions(permissions):
+    """permissions: (allowSell, dexFlags, tradeTypeFlags) as returned by tradingModule.tokenWhitelist"""
+    (allowSell, dexFlags, tradeTypeFlags) = permissions
+    return _decode_token_permissions(bool(allowSell), int(dexFlags), int(tradeTypeFlags))
+
+def decode_token_permissions_many(permissionsList):
+    return [decode_token_permissions(permissions) for permissions in permissionsList]
@@ -0,0 +1,55 @@
+# Batches view calls into Multicall3.aggregate3 so that any number of reads cost
+# one eth_call. Calls are queued as (brownie contract method, args) and results are
+# decoded with the method's own ABI, so they are the same ReturnValues that calling
+# the method directly returns.
+
+from brownie.network.contract import Contract
+from scripts.abi_store import abis
+
+# Multicall3 is deployed at the same address on mainnet and goerli
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+# Keeps the calldata of each eth_call within node limits
+MAX_CALLS_PER_BATCH = 500
+
+class Multicall:
+    def __init__(self, address=MULTICALL3, batchSize=MAX_CALLS_PER_BATCH):
+        self.multicall = Contract.from_abi("Multicall3", address, abis["Multicall3"])
+        self.batchSize = batchSize
+        self.calls = []
+
+    def add(self, method, *args):
+        """Queues method(*args), returns the index of its result"""
+        self.calls.append((method, args))
+        return len(self.calls) - 1
+
+    def execute(self, block_identifier=None):
+        calls = self.calls
+        self.calls = []
+        results = []
+        for i in range(0, len(calls), self.batchSize):
+            batch = calls[i:i + self.batchSize]
+            returnData = self.multicall.aggregate3.call(
+                [(method._address, False, method.encode_input(*args)) for (method, args) in batch],
+                block_identifier=block_identifier
+            )
+            results.extend(
+                method.decode_output(data) for ((method, _), (_, data)) in zip(batch, returnData)
+            )
+        return results
+
+def batch_call(calls, block_identifier=None):
+    """calls: iterable of (method, args) tuples, returns the decoded results in order"""
+    multicall = Multicall()
+    for (method, args) in calls:
+        multicall.add(method, *args)
+    return multicall.execute(block_identifier=block_identifier)
+
+def get_vault_accounts(notional, vault, accounts, block_identifier=None):
+    return batch_call(
+        [(notional.getVaultAccount, (account, vault.address)) for account in accounts], block_identifier
+    )
+
+def get_vault_states(notional, vault, maturities, block_identifier=None):
+    return batch_call(
+        [(notional.getVaultState, (vault.address, maturity)) for maturity in maturities], block_identifier
+    )
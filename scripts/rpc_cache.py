@@ -0,0 +1,175 @@
+# Caching JSON-RPC proxy for the mainnet fork
+#
+# The fork is pinned to fork_block in brownie-config.yaml, so every state read the
+# fork node makes against the upstream node at or before that block always returns
+# the same result. This proxy sits between the fork node and the upstream node and
+# records those responses in a sqlite database. Later runs are served from the
+# database and only cache misses reach the upstream node, if no upstream is given the
+# proxy works fully offline.
+#
+#   python scripts/rpc_cache.py --upstream https://<mainnet rpc> --port 9545
+#
+# and set `fork: http://127.0.0.1:9545` in the mainnet-fork cmd_settings.
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FORK_BLOCK = 15840796
+DEFAULT_DB_PATH = ".rpc_cache/mainnet.sqlite"
+
+# method => index of the block parameter
+BLOCK_PARAM_INDEX = {
+    "eth_getStorageAt": 2,
+    "eth_getCode": 1,
+    "eth_getBalance": 1,
+    "eth_getTransactionCount": 1,
+    "eth_call": 1,
+    "eth_getBlockByNumber": 0,
+}
+# Methods whose result never changes for a chain
+CHAIN_CONSTANT_METHODS = {"eth_chainId", "net_version"}
+
+def get_cache_block(method, params, forkBlock):
+    """Returns the block a request reads from if its response can be cached, otherwise None"""
+    if method in CHAIN_CONSTANT_METHODS:
+        return 0
+    index = BLOCK_PARAM_INDEX.get(method)
+    if index is None or len(params) <= index:
+        return None
+    blockTag = params[index]
+    if not isinstance(blockTag, str) or not blockTag.startswith("0x"):
+        # latest, pending etc. change over time
+        return None
+    blockNumber = int(blockTag, 16)
+    return blockNumber if blockNumber <= forkBlock else None
+
+def get_cache_key(method, params):
+    # Hex strings are case insensitive, addresses are sent both checksummed and lower case
+    return method + json.dumps(params, sort_keys=True, separators=(",", ":")).lower()
+
+def get_error_response(request, message, code=-32000):
+    return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": code, "message": message}}
+
+class RpcCache:
+    def __init__(self, path=DEFAULT_DB_PATH, forkBlock=FORK_BLOCK, upstream=None):
+        self.forkBlock = forkBlock
+        self.upstream = upstream
+        self.hits = 0
+        self.misses = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, method TEXT, block INTEGER, result TEXT)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_block ON responses (block)")
+        self.db.commit()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            row = self.db.execute("SELECT result FROM responses WHERE key = ?", (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put(self, key, method, block, result):
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)", (key, method, block, json.dumps(result))
+            )
+            self.db.commit()
+
+    def forward(self, requests):
+        if self.upstream is None:
+            return [get_error_response(r, "not in rpc cache") for r in requests]
+        httpRequest = urllib.request.Request(
+            self.upstream, json.dumps(requests).encode(), {"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(httpRequest, timeout=120) as response:
+            return json.loads(response.read())
+
+    def handle(self, requests):
+        """Handles a list of JSON-RPC requests, misses are forwarded upstream in one batch"""
+        responses = [None] * len(requests)
+        misses = []
+        for (i, request) in enumerate(requests):
+            method = request.get("method")
+            params = request.get("params", [])
+            block = get_cache_block(method, params, self.forkBlock)
+            result = None if block is None else self.get(get_cache_key(method, params))
+            if result is None:
+                misses.append((i, block))
+            else:
+                self.hits += 1
+                responses[i] = {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+        if misses:
+            self.misses += len(misses)
+            forwarded = self.forward([requests[i] for (i, _) in misses])
+            # The upstream can answer a whole batch with one error object (e.g. a rate
+            # limit), every forwarded request gets that error
+            batchError = None
+            if not isinstance(forwarded, list):
+                batchError = forwarded.get("error") if isinstance(forwarded, dict) else None
+                if not isinstance(batchError, dict):
+                    batchError = {"code": -32000, "message": "invalid upstream response"}
+                forwarded = []
+            # Batch responses can be returned in any order
+            byId = {response.get("id"): response for response in forwarded if isinstance(response, dict)}
+            for (i, block) in misses:
+                request = requests[i]
+                response = byId.get(request.get("id"))
+                if response is None:
+                    if batchError is not None:
+                        response = get_error_response(request, batchError.get("message"), batchError.get("code", -32000))
+                    else:
+                        response = get_error_response(request, "no upstream response")
+                responses[i] = response
+                if block is not None and response.get("result") is not None:
+                    self.put(
+                        get_cache_key(request["method"], request.get("params", [])),
+                        request["method"], block, response["result"]
+                    )
+        return responses
+
+def make_handler(cache):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            isBatch = isinstance(body, list)
+            responses = cache.handle(body if isBatch else [body])
+            data = json.dumps(responses if isBatch else responses[0]).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def serve(cache, port):
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(cache))
+    print("Serving rpc cache on port {} ({})".format(port, cache.upstream or "offline"))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("{} hits, {} misses".format(cache.hits, cache.misses))
+
+def main():
+    parser = argparse.ArgumentParser(description="Caching JSON-RPC proxy for the mainnet fork")
+    parser.add_argument("--upstream", default=os.environ.get("MAINNET_RPC_URL"))
+    parser.add_argument("--port", type=int, default=9545)
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    parser.add_argument("--fork-block", type=int, default=FORK_BLOCK)
+    args = parser.parse_args()
+    serve(RpcCache(args.db, args.fork_block, args.upstream), args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# Funds accounts on a local fork by writing token balances into storage
+#
+# Instead of transferring from an impersonated whale, the balance of an account is
+# written directly into the token's balance mapping with the node's set storage
+# RPC, so funding costs no transactions and does not depend on fork balances. The
+# slot of the mapping is found once per token by writing a probe value to the
+# candidate slots and checking balanceOf, and then kept in a json file on disk.
+# Both the solidity (keccak(account . slot)) and vyper (keccak(slot . account))
+# mapping layouts are tried.
+#
+# Reads and writes for all (token, account) pairs are sent as two JSON-RPC batches,
+# the writes of a batch go to distinct slots so their order does not matter.
+# Tokens that compute balances from another value (e.g. stETH shares) have no
+# balance slot and raise, totalSupply is not updated.
+
+import json
+import requests
+from brownie import web3, ZERO_ADDRESS
+from eth_utils import keccak
+from scripts.abi_store import write_atomic
+from scripts.view_cache import viewCache
+
+SLOT_CACHE = ".token_slots.json"
+MAX_SLOT = 100
+PROBE_ACCOUNT = "0x000000000000000000000000000000000000f00d"
+PROBE_VALUE = 0x1234567890abcdef
+
+BALANCE_OF = "0x70a08231"
+
+# (method, slot as 32 byte data) of each node, anvil also accepts the hardhat methods
+SET_STORAGE_METHODS = [("evm_setAccountStorageAt", True), ("hardhat_setStorageAt", False)]
+SET_BALANCE_METHODS = ["evm_setAccountBalance", "hardhat_setBalance"]
+
+def _word(value):
+    return int(value).to_bytes(32, "big")
+
+def _hex(data):
+    return "0x" + data.hex()
+
+def get_mapping_slot(account, slot, vyper=False):
+    key = bytes.fromhex(account[2:].lower().rjust(64, "0"))
+    return int.from_bytes(keccak(_word(slot) + key if vyper else key + _word(slot)), "big")
+
+class TokenFunder:
+    def __init__(self, cachePath=SLOT_CACHE):
+        self.cachePath = cachePath
+        self.slots = None
+        self.setStorage = None
+        self.setBalance = None
+
+    def _load_slots(self):
+        if self.slots is None:
+            try:
+                with open(self.cachePath) as f:
+                    self.slots = json.load(f)
+            except (OSError, ValueError):
+                self.slots = {}
+        return self.slots
+
+    def _batch(self, calls):
+        """calls: list of (method, params), returns the results in order"""
+        if len(calls) == 0:
+            return []
+        payload = [{"jsonrpc": "2.0", "id": i, "method": m, "params": p} for (i, (m, p)) in enumerate(calls)]
+        response = requests.post(web3.provider.endpoint_uri, json=payload).json()
+        if isinstance(response, dict):
+            raise ValueError(response.get("error"))
+        results = sorted(response, key=lambda r: r["id"])
+        for r in results:
+            if "error" in r:
+                raise ValueError("{}: {}".format(calls[r["id"]][0], r["error"]))
+        return [r["result"] for r in results]
+
+    def _get_set_storage(self):
+        if self.setStorage is None:
+            for (method, slotAsData) in SET_STORAGE_METHODS:
+                response = web3.provider.make_request(
+                    method, [PROBE_ACCOUNT, _hex(_word(0)) if slotAsData else "0x0", _hex(_word(0))]
+                )
+                if "error" not in response:
+                    self.setStorage = (method, slotAsData)
+                    break
+            else:
+                raise ValueError("node does not support setting storage")
+        return self.setStorage
+
+    def _set_storage_call(self, token, slot, value):
+        (method, slotAsData) = self._get_set_storage()
+        return (method, [token, _hex(_word(slot)) if slotAsData else hex(slot), _hex(_word(value))])
+
+    def _balance_of(self, token, account):
+        data = BALANCE_OF + account[2:].lower().rjust(64, "0")
+        (balance,) = self._batch([("eth_call", [{"to": token, "data": data}, "latest"])])
+        return int(balance, 16)
+
+    def find_balance_slot(self, token):
+        """Returns (slot, vyper) of the balance mapping of token"""
+        token = token.lower()
+        slots = self._load_slots()
+        if token in slots:
+            return (slots[token]["slot"], slots[token]["vyper"])
+
+        for slot in range(MAX_SLOT):
+            for vyper in (False, True):
+                storageSlot = get_mapping_slot(PROBE_ACCOUNT, slot, vyper)
+                (original,) = self._batch([("eth_getStorageAt", [token, hex(storageSlot), "latest"])])
+                # Each step is a separate request, nodes may run the calls of a batch concurrently
+                self._batch([self._set_storage_call(token, storageSlot, PROBE_VALUE)])
+                found = self._balance_of(token, PROBE_ACCOUNT) == PROBE_VALUE
+                self._batch([self._set_storage_call(token, storageSlot, int(original, 16))])
+                if found:
+                    slots[token] = {"slot": slot, "vyper": vyper}
+                    write_atomic(self.cachePath, slots)
+                    return (slot, vyper)
+
+        raise ValueError("no balance slot found for {}".format(token))
+
+    def _set_balance_calls(self, balances):
+        if len(balances) == 0:
+            return []
+        if self.setBalance is None:
+            for method in SET_BALANCE_METHODS:
+                response = web3.provider.make_request(method, [PROBE_ACCOUNT, "0x0"])
+                if "error" not in response:
+                    self.setBalance = method
+                    break
+            else:
+                raise ValueError("node does not support setting balances")
+        return [(self.setBalance, [account, hex(amount)]) for (account, amount) in balances]
+
+    def fund(self, balances):
+        """balances: list of (token, account, amount), amount is added to the balance of
+        account. ETH is ZERO_ADDRESS."""
+        ethBalances = [(str(a), int(amount)) for (t, a, amount) in balances if str(t) == ZERO_ADDRESS]
+        tokenBalances = [(str(t).lower(), str(a), int(amount)) for (t, a, amount) in balances if str(t) != ZERO_ADDRESS]
+        storageSlots = []
+        for (token, account, _) in tokenBalances:
+            (slot, vyper) = self.find_balance_slot(token)
+            storageSlots.append(get_mapping_slot(account, slot, vyper))
+
+        current = self._batch(
+            [("eth_getStorageAt", [t, hex(s), "latest"]) for ((t, _, _), s) in zip(tokenBalances, storageSlots)]
+            + [("eth_getBalance", [a, "latest"]) for (a, _) in ethBalances]
+        )
+        tokenCurrent = current[:len(tokenBalances)]
+        ethCurrent = current[len(tokenBalances):]
+
+        # Sums amounts for repeated (token, account) pairs
+        totals = {}
+        for ((token, _, amount), s, value) in zip(tokenBalances, storageSlots, tokenCurrent):
+            key = (token, s)
+            totals[key] = totals.get(key, int(value, 16)) + amount
+        ethTotals = {}
+        for ((account, amount), value) in zip(ethBalances, ethCurrent):
+            ethTotals[account] = ethTotals.get(account, int(value, 16)) + amount
+
+        self._batch(
+            [self._set_storage_call(token, s, value) for ((token, s), value) in totals.items()]
+            + self._set_balance_calls(list(ethTotals.items()))
+        )
+        # Balances changed without a new block
+        viewCache.clear()
+
+tokenFunder = TokenFunder()
@@ -0,0 +1,139 @@
+# Local copies of TradingModule.getOraclePrice and TradingUtils._getLimitAmount
+#
+# OracleSnapshot reads every price oracle configured on the trading module, the
+# Chainlink round data and the token decimals once for a block. Oracle prices and
+# limit amounts for any number of trades are then computed locally with the same
+# integer rounding as the contracts.
+
+from brownie import ZERO_ADDRESS, interface, web3
+from scripts.common import TRADE_TYPE
+
+# TradingModule.sol and contracts/global/Constants.sol
+RATE_DECIMALS = 10**18
+SLIPPAGE_LIMIT_PRECISION = 10**8
+MAX_UINT256 = 2**256 - 1
+
+# Tokens that deployTradingModule configures price oracles for, ETH is ZERO_ADDRESS
+ORACLE_TOKENS = ["WETH", "DAI", "USDC", "USDT", "WBTC", "BAL", "stETH", "wstETH", "AURA"]
+
+def _key(token):
+    return web3.toChecksumAddress(str(token))
+
+def _sdiv(a, b):
+    # int256 division truncates towards zero
+    q = abs(a) // abs(b)
+    return q if (a >= 0) == (b >= 0) else -q
+
+def get_limit_amount(tradeType, amount, slippageLimit, oraclePrice, oracleDecimals, sellTokenDecimals, buyTokenDecimals):
+    """Mirrors TradingUtils._getLimitAmount, token decimals are passed in as 10**decimals"""
+    if tradeType == TRADE_TYPE["EXACT_OUT_SINGLE"] or tradeType == TRADE_TYPE["EXACT_OUT_BATCH"]:
+        # type(uint256).max means no slippage limit
+        if slippageLimit == MAX_UINT256:
+            return MAX_UINT256
+        # For exact out trades, we need to invert the oracle price (1 / oraclePrice)
+        oraclePrice = (oracleDecimals * oracleDecimals) // oraclePrice
+        limitAmount = ((oraclePrice + ((oraclePrice * slippageLimit) // SLIPPAGE_LIMIT_PRECISION)) * amount) // \
+            oracleDecimals
+        # limitAmount is in buyToken precision, convert it to sellToken precision
+        return (limitAmount * sellTokenDecimals) // buyTokenDecimals
+    else:
+        if slippageLimit == MAX_UINT256:
+            return 0
+        slippage = (oraclePrice * slippageLimit) // SLIPPAGE_LIMIT_PRECISION
+        if slippage > oraclePrice:
+            raise OverflowError("uint256 overflow")
+        limitAmount = ((oraclePrice - slippage) * amount) // oracleDecimals
+        # limitAmount is in sellToken precision, convert it to buyToken precision
+        return (limitAmount * buyTokenDecimals) // sellTokenDecimals
+
+class OracleSnapshot:
+    def __init__(self, tradingModule, tokens, blockNumber=None):
+        self.tradingModule = tradingModule
+        self.blockNumber = web3.eth.block_number if blockNumber is None else blockNumber
+        self.blockTime = web3.eth.get_block(self.blockNumber)["timestamp"]
+        self.maxOracleFreshnessInSeconds = tradingModule.maxOracleFreshnessInSeconds(
+            block_identifier=self.blockNumber
+        )
+        # token => (rateDecimals, basePrice, updatedAt)
+        self.prices = {}
+        # token => 10**decimals
+        self.decimals = {}
+        rounds = {}
+        for token in tokens:
+            (oracle, rateDecimals) = tradingModule.priceOracles(token, block_identifier=self.blockNumber)
+            if oracle == ZERO_ADDRESS:
+                continue
+            # Several tokens can share a feed (ETH and WETH), read each feed once
+            if oracle not in rounds:
+                rounds[oracle] = interface.AggregatorV2V3Interface(oracle).latestRoundData(
+                    block_identifier=self.blockNumber
+                )
+            (_, answer, _, updatedAt, _) = rounds[oracle]
+            self.prices[_key(token)] = (rateDecimals, answer, updatedAt)
+            self.decimals[_key(token)] = 10 ** (
+                18 if token == ZERO_ADDRESS
+                else interface.IERC20(token).decimals(block_identifier=self.blockNumber)
+            )
+
+    @classmethod
+    def from_environment(cls, env, blockNumber=None):
+        tokens = [ZERO_ADDRESS] + [env.tokens[symbol].address for symbol in ORACLE_TOKENS]
+        return cls(env.tradingModule, tokens, blockNumber)
+
+    def _get_price(self, token):
+        token = _key(token)
+        if token not in self.prices:
+            raise KeyError("no price oracle for {}".format(token))
+        (rateDecimals, price, updatedAt) = self.prices[token]
+        if self.blockTime - updatedAt > self.maxOracleFreshnessInSeconds:
+            raise ValueError("stale oracle price for {}".format(token))
+        if price <= 0:
+            raise ValueError("Chainlink rate error for {}".format(token))
+        return (price, 10**rateDecimals)
+
+    def get_oracle_price(self, baseToken, quoteToken):
+        """Returns (answer, decimals) the same way TradingModule.getOraclePrice does"""
+        (basePrice, baseDecimals) = self._get_price(baseToken)
+        (quotePrice, quoteDecimals) = self._get_price(quoteToken)
+        answer = _sdiv(basePrice * quoteDecimals * RATE_DECIMALS, quotePrice * baseDecimals)
+        return (answer, RATE_DECIMALS)
+
+    def get_limit_amount(self, tradeType, sellToken, buyToken, amount, slippageLimit):
+        (oraclePrice, oracleDecimals) = self.get_oracle_price(sellToken, buyToken)
+        if oraclePrice < 0:
+            raise ValueError("Chainlink rate error")
+        return get_limit_amount(
+            tradeType, int(amount), slippageLimit, oraclePrice, oracleDecimals,
+            self.decimals[_key(sellToken)], self.decimals[_key(buyToken)]
+        )
+
+    def get_limit_amounts(self, trades):
+        """trades: iterable of (sellToken, buyToken, amount, slippageLimit, tradeType)"""
+        return [
+            self.get_limit_amount(tradeType, sellToken, buyToken, amount, slippageLimit)
+            for (sellToken, buyToken, amount, slippageLimit, tradeType) in trades
+        ]
+
+class OracleLimitCalculator:
+    """Keeps one OracleSnapshot per block, the snapshot is reloaded when a new block is mined"""
+
+    def __init__(self, tradingModule, tokens):
+        self.tradingModule = tradingModule
+        self.tokens = list(tokens)
+        self.snapshot = None
+
+    @classmethod
+    def from_environment(cls, env):
+        return cls(env.tradingModule, [ZERO_ADDRESS] + [env.tokens[symbol].address for symbol in ORACLE_TOKENS])
+
+    def get_snapshot(self):
+        blockNumber = web3.eth.block_number
+        if self.snapshot is None or self.snapshot.blockNumber != blockNumber:
+            self.snapshot = OracleSnapshot(self.tradingModule, self.tokens, blockNumber)
+        return self.snapshot
+
+    def get_oracle_price(self, baseToken, quoteToken):
+        return self.get_snapshot().get_oracle_price(baseToken, quoteToken)
+
+    def get_limit_amounts(self, trades):
+        return self.get_snapshot().get_limit_amounts(trades)
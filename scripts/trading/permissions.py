@@ -0,0 +1,72 @@
+# Declarative trading module token permissions
+#
+# Permissions are declared as a table of (vault, token) => (allowSell, dexes, trade
+# types). apply() reads the current tokenWhitelist of every declared pair in one
+# multicall, compares it with the table and only sends setTokenPermissions for the
+# pairs that differ, pipelined so that all updates are mined in the same block cycle.
+# Pairs that are not declared are left as they are.
+
+from brownie import web3
+from scripts.flags import encode_flags, decode_token_permissions_many, DexFlags, TradeTypeFlags, TokenPermissions
+from scripts.multicall import batch_call
+from scripts.tx_pipeline import TxPipeline
+
+def _key(address):
+    return web3.toChecksumAddress(str(address))
+
+def get_token_permissions(allowSell=True, dexes=(), tradeTypes=()):
+    """dexes and tradeTypes are flag names, e.g. dexes=["CURVE"], tradeTypes=["EXACT_IN_SINGLE"]"""
+    return TokenPermissions(
+        allowSell,
+        DexFlags(encode_flags(DexFlags, 0, **{dex: True for dex in dexes})),
+        TradeTypeFlags(encode_flags(TradeTypeFlags, 0, **{tradeType: True for tradeType in tradeTypes}))
+    )
+
+class PermissionMatrix:
+    def __init__(self, tradingModule):
+        self.tradingModule = tradingModule
+        # (vault, token) => TokenPermissions
+        self.permissions = {}
+
+    def add(self, vaults, tokens, dexes=(), tradeTypes=(), allowSell=True):
+        """Declares the same permissions for every vault and token pair, later declarations
+        of a pair replace earlier ones"""
+        permissions = get_token_permissions(allowSell, dexes, tradeTypes)
+        for vault in vaults:
+            for token in tokens:
+                self.permissions[(_key(vault), _key(token))] = permissions
+        return self
+
+    def read(self, block_identifier=None):
+        """Returns the on chain permissions of every declared pair"""
+        pairs = list(self.permissions.keys())
+        results = batch_call(
+            [(self.tradingModule.tokenWhitelist, pair) for pair in pairs], block_identifier
+        )
+        return dict(zip(pairs, decode_token_permissions_many(results)))
+
+    def diff(self, current=None):
+        """Returns [((vault, token), current, declared)] for the pairs that need an update"""
+        if current is None:
+            current = self.read()
+        return [
+            (pair, current[pair], permissions)
+            for (pair, permissions) in self.permissions.items()
+            if current[pair] != permissions
+        ]
+
+    def apply(self, sender):
+        """Sends setTokenPermissions for every pair that differs from the chain, sender must
+        be the Notional owner. Returns the applied diff."""
+        changes = self.diff()
+        pipeline = TxPipeline()
+        for ((vault, token), _, permissions) in changes:
+            pipeline.transact(
+                self.tradingModule.setTokenPermissions,
+                vault,
+                token,
+                [permissions.allowSell, int(permissions.dexFlags), int(permissions.tradeTypeFlags)],
+                sender=sender
+            )
+        pipeline.run()
+        return changes
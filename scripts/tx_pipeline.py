@@ -0,0 +1,128 @@
+# Pipelined transaction submission for deploy and config scripts
+#
+# Brownie waits for every transaction to be mined before it sends the next one. The
+# pipeline assigns nonces locally (one sequence per sender, starting from its pending
+# transaction count) and broadcasts all the transactions that are ready back to back
+# with required_confs=0, then collects the receipts. A job is ready when the jobs it
+# depends on are mined, dependencies are either explicit (after=[...]) or implicit
+# when a job is passed as an argument of another one, in which case it is replaced by
+# its result (the deployed contract or the transaction receipt).
+#
+# Jobs without dependencies on each other are mined in the same block cycle, run()
+# takes as many cycles as the longest chain of dependencies.
+
+from brownie import web3
+
+class TxJob:
+    def __init__(self, send, args, sender, after, container=None):
+        self.send = send
+        self.args = args
+        self.sender = sender
+        self.container = container
+        self.dependencies = list(after) + [a for a in args if isinstance(a, TxJob)]
+        self.txn = None
+        self.result = None
+
+    @property
+    def done(self):
+        return self.result is not None
+
+    @property
+    def ready(self):
+        return all(dep.done for dep in self.dependencies)
+
+class TxPipeline:
+    def __init__(self, requiredConfs=1):
+        self.requiredConfs = requiredConfs
+        self.nonces = {}
+        self.pending = []
+
+    def chain_nonce(self, sender):
+        # Account.nonce only counts mined transactions, the pending count also includes
+        # the transactions of sender that are waiting in the mempool
+        return web3.eth.get_transaction_count(sender.address, "pending")
+
+    def next_nonce(self, sender):
+        nonce = self.nonces.get(sender.address)
+        if nonce is None:
+            nonce = self.chain_nonce(sender)
+        self.nonces[sender.address] = nonce + 1
+        return nonce
+
+    def deploy(self, container, *args, sender, after=()):
+        job = TxJob(container.deploy, args, sender, after, container=container)
+        self.pending.append(job)
+        return job
+
+    def transact(self, method, *args, sender, after=()):
+        job = TxJob(method, args, sender, after)
+        self.pending.append(job)
+        return job
+
+    def transfer(self, to, data, sender, after=()):
+        """Sends data to the address to, or deploys it as init code when to is None. The
+        result is the transaction receipt."""
+        def send(txParams):
+            return txParams["from"].transfer(
+                to, 0, data=data, nonce=txParams["nonce"], required_confs=txParams["required_confs"]
+            )
+        job = TxJob(send, (), sender, after)
+        self.pending.append(job)
+        return job
+
+    def _broadcast(self, job):
+        args = [a.result if isinstance(a, TxJob) else a for a in job.args]
+        nonce = self.next_nonce(job.sender)
+        txParams = {"from": job.sender, "nonce": nonce, "required_confs": 0}
+        try:
+            job.txn = job.send(*args, txParams)
+        except Exception:
+            # The nonce was not used and is the last one assigned to sender, it goes to
+            # the next send
+            self.nonces[job.sender.address] = nonce
+            raise
+
+    def _collect(self, job):
+        job.txn.wait(self.requiredConfs)
+        if job.txn.status != 1:
+            raise ValueError("transaction {} reverted: {}".format(job.txn.txid, job.txn.revert_msg))
+        if job.container is not None:
+            job.result = job.container.at(job.txn.contract_address)
+        else:
+            job.result = job.txn
+
+    def _collect_all(self, jobs):
+        """Waits for every job before raising the first revert"""
+        errors = []
+        for job in jobs:
+            try:
+                self._collect(job)
+            except ValueError as e:
+                errors.append(e)
+        if len(errors) > 0:
+            raise errors[0]
+
+    def run(self):
+        """Sends all queued jobs and returns their results in the order they were queued"""
+        jobs = self.pending
+        self.pending = []
+        waiting = list(jobs)
+        while len(waiting) > 0:
+            ready = [job for job in waiting if job.ready]
+            if len(ready) == 0:
+                raise ValueError("unresolvable dependencies between queued transactions")
+
+            sent = []
+            try:
+                for job in ready:
+                    self._broadcast(job)
+                    sent.append(job)
+            except Exception:
+                # The jobs broadcast before the failed send are mined anyway, their
+                # receipts are checked so that a revert among them is reported too
+                self._collect_all(sent)
+                raise
+            self._collect_all(sent)
+            waiting = [job for job in waiting if not job.done]
+
+        return [job.result for job in jobs]
@@ -0,0 +1,84 @@
+# Block scoped memoization of view calls
+#
+# Calling the same view function twice without a state change in between (e.g.
+# vault.getStrategyContext()) costs two eth_calls and two ABI decodings. ViewCache
+# replaces the view methods of a brownie Contract with wrappers that keep the
+# decoded result keyed by (address, calldata, block number). Results are dropped
+# when the block number changes (a transaction or chain.mine) and when the chain is
+# reverted or reset, since the same block number can then hold a different state.
+#
+# Checking the block number is one eth_blockNumber request, calls with an explicit
+# block_identifier or a state override are not cached.
+
+from brownie import web3
+from brownie.network.contract import ContractCall
+from brownie.network.state import _revert_register
+
+class CachedCall:
+    def __init__(self, cache, method):
+        self.cache = cache
+        self.method = method
+
+    def __call__(self, *args, block_identifier=None, override=None):
+        if block_identifier is not None or override is not None:
+            return self.method(*args, block_identifier=block_identifier, override=override)
+        return self.cache.call(self.method, args)
+
+    def __getattr__(self, name):
+        # encode_input, decode_output, call, transact etc. of the wrapped method
+        return getattr(self.method, name)
+
+    def __repr__(self):
+        return repr(self.method)
+
+class ViewCache:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.block = None
+        self.results = {}
+        _revert_register(self)
+
+    def call(self, method, args):
+        blockNumber = web3.eth.block_number
+        if blockNumber != self.block:
+            self.block = blockNumber
+            self.results = {}
+
+        key = (method._address, method.encode_input(*args), blockNumber)
+        if key in self.results:
+            self.hits += 1
+            return self.results[key]
+
+        self.misses += 1
+        result = method(*args)
+        self.results[key] = result
+        return result
+
+    def wrap(self, contract):
+        """Replaces the view methods of contract in place, returns the contract"""
+        for (name, method) in list(vars(contract).items()):
+            if isinstance(method, ContractCall):
+                setattr(contract, name, CachedCall(self, method))
+        return contract
+
+    def clear(self):
+        self.block = None
+        self.results = {}
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": self.hits / total if total > 0 else 0
+        }
+
+    # Called by brownie on chain.revert, chain.undo and chain.reset
+    def _revert(self, height):
+        self.clear()
+
+    def _reset(self):
+        self.clear()
+
+viewCache = ViewCache()
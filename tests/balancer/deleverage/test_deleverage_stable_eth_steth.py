@@ -2,9 +2,9 @@ import pytest
 from brownie import Wei, accounts
 from brownie.network.state import Chain
 from tests.fixtures import *
-from tests.balancer.helpers import enterMaturity, check_invariant, get_metastable_amounts
+from tests.balancer.helpers import enterMaturity, check_invariant
+from scripts.balancer.redeem_params import get_redeem_params_for_shares
 from scripts.common import (
-    get_redeem_params, 
     get_dynamic_trade_params, 
     DEX_ID,
     TRADE_TYPE
@@ -38,11 +38,11 @@ def test_single_maturity_success(StratStableETHstETH):
     strategyTokensToRedeem = vaultSharesToLiquidator / vaultState["totalVaultShares"] * vaultState["totalStrategyTokens"]
     underlyingRedeemed = mock.convertStrategyToUnderlying(accounts[0], strategyTokensToRedeem, maturity)
     flashLoanAmount = assetRate["rate"] * assetAmountFromLiquidator / assetRate["underlyingDecimals"]
-    primaryAmount, secondaryAmount = get_metastable_amounts(mock.getStrategyContext()["poolContext"], underlyingRedeemed)
-    # discount primary and secondary slightly
-    redeemParams = get_redeem_params(primaryAmount * 0.98, secondaryAmount * 0.98, get_dynamic_trade_params(
-        DEX_ID["CURVE"], TRADE_TYPE["EXACT_IN_SINGLE"], 5e6, True, bytes(0)
-    ))
+    redeemParams = get_redeem_params_for_shares(
+        env.notional, mock, maturity, [vaultSharesToLiquidator], get_dynamic_trade_params(
+            DEX_ID["CURVE"], TRADE_TYPE["EXACT_IN_SINGLE"], 5e6, True, bytes(0)
+        )
+    )[0]
     assert env.tokens["WETH"].balanceOf(env.liquidator.owner()) == 0
     env.liquidator.flashLiquidate(
         env.tokens["WETH"], 
@@ -1,8 +1,11 @@
 import math
+import eth_abi
 import pytest
-from brownie import Wei, interface
+from brownie import ZERO_ADDRESS, Wei, interface
 from brownie.network.state import Chain
-from scripts.common import get_deposit_params
+from scripts.common import get_deposit_params, get_univ3_single_data, get_univ3_batch_data, DEX_ID, TRADE_TYPE
+from scripts.date_time import get_maturity
+from scripts.multicall import Multicall, get_vault_accounts
 
 chain = Chain()
 
@@ -14,8 +17,46 @@ def get_metastable_amounts(poolContext, amount):
     secondaryAmount = amount - primaryAmount
     return (Wei(primaryAmount), Wei(secondaryAmount))
 
+def get_metastable_reward_params(env, vault, rewardAmount):
+    # Sells BAL rewards for both pool tokens in proportion to the pool balances
+    tradeParams = "(uint16,uint8,uint256,bool,bytes)"
+    singleSidedRewardTradeParams = "(address,address,uint256,{})".format(tradeParams)
+    balanced2TokenRewardTradeParams = "({},{})".format(singleSidedRewardTradeParams, singleSidedRewardTradeParams)
+    (primaryAmount, secondaryAmount) = get_metastable_amounts(vault.getStrategyContext()["poolContext"], rewardAmount)
+    return [eth_abi.encode_abi(
+        [balanced2TokenRewardTradeParams],
+        [[
+            [
+                env.tokens["BAL"].address,
+                ZERO_ADDRESS,
+                primaryAmount,
+                [
+                    DEX_ID["UNISWAP_V3"],
+                    TRADE_TYPE["EXACT_IN_SINGLE"],
+                    0,
+                    False,
+                    get_univ3_single_data(3000)
+                ]
+            ],
+            [
+                env.tokens["BAL"].address,
+                env.tokens["wstETH"].address,
+                secondaryAmount,
+                [
+                    DEX_ID["UNISWAP_V3"],
+                    TRADE_TYPE["EXACT_IN_BATCH"],
+                    Wei(0.05e18), # static slippage
+                    False,
+                    get_univ3_batch_data([
+                        env.tokens["BAL"].address, 3000, env.tokens["WETH"].address, 500, env.tokens["wstETH"].address
+                    ])
+                ]
+            ]
+        ]]
+    ), 0]
+
 def get_expected_borrow_amount(env, currencyId, maturityIndex, primaryBorrowAmount):
-    maturity = env.notional.getActiveMarkets(currencyId)[maturityIndex][1]
+    maturity = get_maturity(chain.time(), maturityIndex + 1)
     expectedBorrowAmount = env.notional.getPrincipalFromfCashBorrow(
         1, primaryBorrowAmount, maturity, 0, chain.time()
     )["borrowAmountUnderlying"]
@@ -26,14 +67,17 @@ def convert_to_underlying(env, currencyId, assetCash):
     return assetRate["rate"] * assetCash / assetRate["underlyingDecimals"]
 
 def enterMaturity(
-    env, vault, currencyId, maturityIndex, depositAmount, primaryBorrowAmount, account, callStatic=False, depositParams=None
+    env, vault, currencyId, maturityIndex, depositAmount, primaryBorrowAmount, account, callStatic=False, depositParams=None,
+    returnTxn=False
 ):
-    maturity = env.notional.getActiveMarkets(currencyId)[maturityIndex][1]
+    """Returns the maturity, or (maturity, enterVault receipt) with returnTxn"""
+    maturity = get_maturity(chain.time(), maturityIndex + 1)
     value = 0
     if currencyId == 1:
         value = depositAmount
     if depositParams == None:
         depositParams = get_deposit_params()
+    txn = None
     if callStatic:
         env.notional.enterVault.call(
             account,
@@ -46,7 +90,7 @@ def enterMaturity(
             {"from": account, "value": Wei(value)}
         )
     else:
-        env.notional.enterVault(
+        txn = env.notional.enterVault(
             account,
             vault.address,
             Wei(depositAmount),
@@ -56,44 +100,56 @@ def enterMaturity(
             depositParams,
             {"from": account, "value": Wei(value)}
         )
-    return maturity
+    return (maturity, txn) if returnTxn else maturity
 
-def exitVaultPercent(env, vault, account, percent, redeemParams, callStatic=False):
+def exitVaultPercent(env, vault, account, percent, redeemParams, callStatic=False, returnTxn=False):
+    """Returns (sharesToRedeem, fCashToRepay), with returnTxn the exitVault receipt is
+    appended"""
     vaultAccount = env.notional.getVaultAccount(account, vault.address)
     vaultShares = vaultAccount["vaultShares"]
     primaryBorrowAmount = vaultAccount["fCash"]
     sharesToRedeem = math.floor(vaultShares * percent)
     fCashToRepay = math.floor(-primaryBorrowAmount * percent)
+    txn = None
     if callStatic:
         env.notional.exitVault.call(
             account, vault.address, account, sharesToRedeem, fCashToRepay, 0, redeemParams, {"from": account}
         )
     else:
-        env.notional.exitVault(
+        txn = env.notional.exitVault(
             account, vault.address, account, sharesToRedeem, fCashToRepay, 0, redeemParams, {"from": account}
         )
-    return (sharesToRedeem, fCashToRepay)
+    return (sharesToRedeem, fCashToRepay, txn) if returnTxn else (sharesToRedeem, fCashToRepay)
 
 def check_invariant(env, vault, accounts, maturities):
-    accountTotalfCash = 0
-    accountTotalVaultShares = 0
+    # Vault accounts, vault states and the strategy context are read in a single eth_call
+    multicall = Multicall()
     for account in accounts:
-        vaultAccount = env.notional.getVaultAccount(account, vault.address)
-        accountTotalfCash += vaultAccount["fCash"]
-        accountTotalVaultShares += vaultAccount["vaultShares"]
-    vaultTotalfCash = 0
-    vaultTotalVaultShares = 0
-    vaultTotalStrategyTokens = 0
+        multicall.add(env.notional.getVaultAccount, account, vault.address)
     for maturity in maturities:
-        vaultState = env.notional.getVaultState(vault.address, maturity)
-        vaultTotalfCash += vaultState["totalfCash"]
-        vaultTotalVaultShares += vaultState["totalVaultShares"]
-        vaultTotalStrategyTokens += vaultState["totalStrategyTokens"]
+        multicall.add(env.notional.getVaultState, vault.address, maturity)
+    multicall.add(vault.getStrategyContext)
+    results = multicall.execute()
+    vaultAccounts = results[:len(accounts)]
+    vaultStates = results[len(accounts):-1]
+    context = results[-1]
+
+    accountTotalfCash = sum(vaultAccount["fCash"] for vaultAccount in vaultAccounts)
+    accountTotalVaultShares = sum(vaultAccount["vaultShares"] for vaultAccount in vaultAccounts)
+    vaultTotalfCash = sum(vaultState["totalfCash"] for vaultState in vaultStates)
+    vaultTotalVaultShares = sum(vaultState["totalVaultShares"] for vaultState in vaultStates)
+    vaultTotalStrategyTokens = sum(vaultState["totalStrategyTokens"] for vaultState in vaultStates)
     assert vaultTotalfCash == accountTotalfCash
     assert vaultTotalVaultShares == accountTotalVaultShares
-    auraPool = interface.IAuraRewardPool(vault.getStrategyContext()["stakingContext"]["auraRewardPool"])
-    assert pytest.approx(vaultTotalStrategyTokens, rel=1e-6) == math.floor(auraPool.balanceOf(vault.address) / 1e10)
-    assert vault.getStrategyContext()["baseStrategy"]["vaultState"]["totalBPTHeld"] == auraPool.balanceOf(vault)
+    auraPool = interface.IAuraRewardPool(context["stakingContext"]["auraRewardPool"])
+    auraBalance = auraPool.balanceOf(vault.address)
+    assert pytest.approx(vaultTotalStrategyTokens, rel=1e-6) == math.floor(auraBalance / 1e10)
+    assert context["baseStrategy"]["vaultState"]["totalBPTHeld"] == auraBalance
+
+def check_accounts(env, vault, accounts, vaultShares, fCash):
+    for (vaultAccount, shares, debt) in zip(get_vault_accounts(env.notional, vault, accounts), vaultShares, fCash):
+        assert vaultAccount["vaultShares"] == shares
+        assert vaultAccount["fCash"] == -debt
 
 def check_account(env, vault, account, vaultShares, fCash):
     vaultAccount = env.notional.getVaultAccount(account, vault.address)
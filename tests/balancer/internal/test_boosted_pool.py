@@ -0,0 +1,63 @@
+import pytest
+from scripts.balancer import boosted_pool
+from scripts.balancer.errors import BalancerPoolShareTooHigh, InvalidPrice
+from scripts.balancer.math import fixed_point
+
+def get_snapshot(primaryDecimals=18):
+    poolContext = {
+        "basePool": {
+            "primaryBalance": 30_000_000 * 10**18,
+            "secondaryBalance": 31_000_000 * 10**18,
+            "primaryDecimals": primaryDecimals
+        },
+        "tertiaryBalance": 29_000_000 * 10**18
+    }
+    oracleContext = {
+        "ampParam": 1_500_000,
+        "bptBalance": boosted_pool.MAX_TOKEN_BALANCE - 90_000_000 * 10**18,
+        "dueProtocolFeeBptAmount": 10**18
+    }
+    strategyContext = {
+        "vaultSettings": {
+            "oraclePriceDeviationLimitPercent": 50,
+            "balancerPoolSlippageLimitPercent": 9900,
+            "maxBalancerPoolShare": 2000
+        },
+        "vaultState": {"totalBPTHeld": 0}
+    }
+    return (poolContext, oracleContext, strategyContext)
+
+def test_boosted_pool_model_matches_single_evaluation():
+    (poolContext, oracleContext, strategyContext) = get_snapshot(primaryDecimals=6)
+    oraclePrices = [10**18, 10**18]
+    protocolSwapFeePercentage = 5 * 10**17
+    model = boosted_pool.Boosted3TokenPoolModel(
+        poolContext, oracleContext, strategyContext, oraclePrices, protocolSwapFeePercentage
+    )
+    assert model.virtualSupply == 90_000_001 * 10**18
+
+    deposits = [(i + 1) * 10_000 * 10**6 for i in range(50)]
+    assert model.min_bpts(deposits) == [
+        boosted_pool.get_min_bpt(
+            poolContext, oracleContext, strategyContext, oraclePrices, protocolSwapFeePercentage, deposit
+        )
+        for deposit in deposits
+    ]
+    assert model.time_weighted_primary_balance(100 * 10**18) == boosted_pool.get_time_weighted_primary_balance(
+        poolContext, oracleContext, strategyContext, oraclePrices, 100 * 10**18
+    )
+
+def test_boosted_pool_protocol_fee_and_limits():
+    (poolContext, oracleContext, strategyContext) = get_snapshot()
+    fee = 10**17
+    bptAmount = 1_000 * 10**18
+    feeAmount = fixed_point.div_up(bptAmount, fixed_point.ONE - fee) - bptAmount
+    assert boosted_pool.get_due_protocol_fee_by_bpt(bptAmount, fee) == fixed_point.mul_down(feeAmount, fee)
+
+    with pytest.raises(InvalidPrice):
+        boosted_pool.Boosted3TokenPoolModel(poolContext, oracleContext, strategyContext, [10**18, 2 * 10**18], 0)
+
+    model = boosted_pool.Boosted3TokenPoolModel(poolContext, oracleContext, strategyContext, [10**18, 10**18], 0)
+    model.check_pool_share(model.bpt_threshold())
+    with pytest.raises(BalancerPoolShareTooHigh):
+        model.check_pool_share(model.bpt_threshold() + 1)
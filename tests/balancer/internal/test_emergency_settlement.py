@@ -0,0 +1,37 @@
+from scripts.balancer.emergency_settlement import get_emergency_settlement_params, plan_emergency_settlement
+
+def get_strategy_context(totalBPTHeld, totalStrategyTokenGlobal, maxBalancerPoolShare):
+    return {
+        "settlementPeriodInSeconds": 7 * 86400,
+        "vaultSettings": {"maxBalancerPoolShare": maxBalancerPoolShare},
+        "vaultState": {"totalBPTHeld": totalBPTHeld, "totalStrategyTokenGlobal": totalStrategyTokenGlobal}
+    }
+
+def test_emergency_settlement_plan():
+    blockTime = 1_000_000
+    maturities = {
+        blockTime + 30 * 86400: 100 * 10**8,
+        blockTime + 60 * 86400: 500 * 10**8,
+        blockTime + 90 * 86400: 400 * 10**8
+    }
+    context = get_strategy_context(1_000 * 10**18, 1_000 * 10**8, 2000)
+    totalBPTSupply = 4_000 * 10**18
+
+    # Pool share is 25%, the desired pool share is 16% so 360 BPT need to be settled
+    plan = plan_emergency_settlement(context, maturities, totalBPTSupply, blockTime)
+    assert len(plan) == 1
+    assert plan[0].maturity == blockTime + 60 * 86400
+    assert plan[0].bptToSettle == get_emergency_settlement_params(context, 500 * 10**8, totalBPTSupply)
+
+    # Settling everything requires one call per maturity, largest first
+    context = get_strategy_context(1_000 * 10**18, 1_000 * 10**8, 0)
+    plan = plan_emergency_settlement(context, maturities, totalBPTSupply, blockTime)
+    assert [s.maturity for s in plan] == [blockTime + 60 * 86400, blockTime + 90 * 86400, blockTime + 30 * 86400]
+    assert sum(s.bptToSettle for s in plan) == 1_000 * 10**18
+
+    # Maturities inside the settlement window cannot be emergency settled
+    plan = plan_emergency_settlement(context, maturities, totalBPTSupply, blockTime + 54 * 86400)
+    assert [s.maturity for s in plan] == [blockTime + 90 * 86400]
+
+    context = get_strategy_context(100 * 10**18, 100 * 10**8, 2000)
+    assert plan_emergency_settlement(context, maturities, totalBPTSupply, blockTime) == []
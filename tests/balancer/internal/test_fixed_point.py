@@ -0,0 +1,37 @@
+import pytest
+from scripts.balancer.math import fixed_point, solidity_math, stable_math
+from scripts.balancer.math.fixed_point_array import Uint256Array
+
+A = [0, 1, 5, 10**18, 3 * 10**17 + 7, 2**200]
+B = [3, 1, 7, 10**18, 11, 2**50]
+
+def test_array_matches_scalar_fixed_point():
+    a = Uint256Array(A)
+    b = Uint256Array(B)
+    assert a.mul_down(b).tolist() == [fixed_point.mul_down(x, y) for (x, y) in zip(A, B)]
+    assert a.mul_up(b).tolist() == [fixed_point.mul_up(x, y) for (x, y) in zip(A, B)]
+    assert a.div_down(b).tolist() == [solidity_math.div_down(x, y) for (x, y) in zip(A, B)]
+    assert a.div_up(b).tolist() == [solidity_math.div_up(x, y) for (x, y) in zip(A, B)]
+    assert a[:5].fixed_div_down(b[:5]).tolist() == [fixed_point.div_down(x, y) for (x, y) in zip(A[:5], B[:5])]
+    assert a[:5].fixed_div_up(b[:5]).tolist() == [fixed_point.div_up(x, y) for (x, y) in zip(A[:5], B[:5])]
+    assert a.complement().tolist() == [fixed_point.complement(x) for x in A]
+    assert Uint256Array.from_limbs(a.to_limbs()).tolist() == A
+
+def test_array_overflow_reverts():
+    with pytest.raises(OverflowError):
+        Uint256Array(A) - Uint256Array(B)
+    with pytest.raises(OverflowError):
+        Uint256Array(A).fixed_div_down(Uint256Array(B))
+    with pytest.raises(OverflowError):
+        Uint256Array([2**255]) * 2
+    assert Uint256Array([2**255]).wrapping_mul(2).tolist() == [0]
+
+def test_array_spot_price_matches_scalar():
+    balancesX = [10_000 * 10**18 + i * 10**20 for i in range(200)]
+    balancesY = [10_500 * 10**18 - i * 10**19 for i in range(200)]
+    spotPrices = stable_math.calc_spot_price_array(
+        50000, Uint256Array(balancesX), Uint256Array(balancesY)
+    ).tolist()
+    assert spotPrices == stable_math.calc_spot_price_batch(
+        [(50000, x, y) for (x, y) in zip(balancesX, balancesY)]
+    )
@@ -0,0 +1,16 @@
+from brownie import accounts
+from tests.balancer.helpers import enterMaturity
+from scripts.balancer.positions import get_account_positions
+
+def test_account_positions_match_vault(StratStableETHstETH):
+    (env, vault, mock) = StratStableETHstETH
+    maturity1 = enterMaturity(env, vault, 1, 0, 10e18, 5e8, accounts[0])
+    maturity2 = enterMaturity(env, vault, 1, 1, 5e18, 3e8, accounts[1])
+
+    positions = get_account_positions(env.notional, vault, [accounts[0], accounts[1], accounts[2]])
+    assert [(p.account, p.maturity) for p in positions] == [(accounts[0], maturity1), (accounts[1], maturity2)]
+    for position in positions:
+        assert position.vaultShares == env.notional.getVaultAccount(position.account, vault.address)["vaultShares"]
+        assert position.underlyingValue == vault.convertStrategyToUnderlying(
+            position.account, position.strategyTokens, position.maturity
+        )
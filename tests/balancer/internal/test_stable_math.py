@@ -2,6 +2,7 @@ import pytest
 from brownie import interface
 from brownie.network.state import Chain
 from scripts.common import set_dex_flags, set_trade_type_flags
+from scripts.balancer.math import stable_math
 from tests.trading.helpers import balancer_trade_exact_in_single
 
 chain = Chain()
@@ -12,6 +13,42 @@ def test_get_spot_price(StratStableETHstETH):
     spotPrice1 = vault.getSpotPrice(1)/1e18
     assert pytest.approx((1/spotPrice1)/spotPrice0, rel=1e-35) == 1
 
+def test_python_spot_price_matches_vault(StratStableETHstETH):
+    (env, vault, mock) = StratStableETHstETH
+    context = vault.getStrategyContext()
+    poolContext = context["poolContext"]
+    ampParam = context["oracleContext"]["ampParam"]
+    primaryScaleFactor = poolContext["primaryScaleFactor"]
+    secondaryScaleFactor = poolContext["secondaryScaleFactor"]
+    balanceX = poolContext["primaryBalance"] * primaryScaleFactor // 10**18
+    balanceY = poolContext["secondaryBalance"] * secondaryScaleFactor // 10**18
+
+    invariant = stable_math.calculate_invariant(ampParam, [balanceX, balanceY], True)
+    spotPrice = stable_math.calc_spot_price(ampParam, invariant, balanceX, balanceY)
+    scaleFactor = secondaryScaleFactor * 10**18 // primaryScaleFactor
+    assert spotPrice * 10**18 // scaleFactor == vault.getSpotPrice(0)
+
+    invariant = stable_math.calculate_invariant(ampParam, [balanceY, balanceX], True)
+    spotPrice = stable_math.calc_spot_price(ampParam, invariant, balanceY, balanceX)
+    scaleFactor = primaryScaleFactor * 10**18 // secondaryScaleFactor
+    assert spotPrice * 10**18 // scaleFactor == vault.getSpotPrice(1)
+
+def test_python_stable_math_batch_matches_single():
+    ampParam = 50000
+    points = [(ampParam, 10_000 * 10**18 + i * 10**20, 10_500 * 10**18) for i in range(100)]
+    spotPrices = stable_math.calc_spot_price_batch(points)
+    for ((amp, x, y), spotPrice) in zip(points, spotPrices):
+        invariant = stable_math.calculate_invariant(amp, [x, y], True)
+        assert spotPrice == stable_math.calc_spot_price(amp, invariant, x, y)
+
+    balances = [10_000 * 10**18, 10_500 * 10**18]
+    invariant = stable_math.calculate_invariant(ampParam, balances, True)
+    amountsOut = stable_math.calc_out_given_in_batch(
+        [(ampParam, balances, 0, 1, i * 10**18) for i in range(1, 100)]
+    )
+    assert amountsOut == sorted(amountsOut)
+    assert amountsOut[0] == stable_math.calc_out_given_in(ampParam, balances, 0, 1, 10**18, invariant)
+
 def test_spot_price_within_1_perc_of_pair_price_after_trading(StratStableETHstETH):
     (env, vault, mock) = StratStableETHstETH
     poolId = vault.getStrategyContext()["poolContext"]["basePool"].dict()['poolId']
@@ -0,0 +1,54 @@
+import pytest
+from brownie import interface
+from scripts.balancer.errors import InvalidPrice
+from scripts.balancer.precheck import Stable2TokenPrecheck
+from scripts.balancer.math import stable_oracle_math
+
+def test_precheck_spot_price_matches_vault(StratStableETHstETH):
+    (env, vault, mock) = StratStableETHstETH
+    precheck = Stable2TokenPrecheck.from_vault(vault)
+    context = vault.getStrategyContext()
+    assert precheck.spotPrice == vault.getSpotPrice(0)
+    assert stable_oracle_math.get_spot_price(
+        context["oracleContext"],
+        context["poolContext"],
+        context["poolContext"]["primaryBalance"],
+        context["poolContext"]["secondaryBalance"],
+        1
+    ) == vault.getSpotPrice(1)
+
+def test_precheck_min_exit_amounts(StratStableETHstETH):
+    (env, vault, mock) = StratStableETHstETH
+    precheck = Stable2TokenPrecheck.from_vault(vault)
+    poolContext = vault.getStrategyContext()["poolContext"]
+    totalBPTSupply = interface.IERC20(poolContext["basePool"]["pool"]).totalSupply()
+    slippageLimit = vault.getStrategyContext()["baseStrategy"]["vaultSettings"]["balancerPoolSlippageLimitPercent"]
+
+    results = precheck.check_exits([10**18, 10 * 10**18, 100 * 10**18])
+    for (bptAmount, result) in zip([10**18, 10 * 10**18, 100 * 10**18], results):
+        assert result.success
+        assert result.minPrimary == poolContext["primaryBalance"] * bptAmount * slippageLimit // (totalBPTSupply * 10_000)
+        assert result.minSecondary == poolContext["secondaryBalance"] * bptAmount * slippageLimit // (totalBPTSupply * 10_000)
+
+def test_precheck_rejects_price_outside_deviation_limit(StratStableETHstETH):
+    (env, vault, mock) = StratStableETHstETH
+    precheck = Stable2TokenPrecheck.from_vault(vault)
+    (lowerLimit, upperLimit) = precheck.price_limits()
+    assert lowerLimit <= precheck.spotPrice <= upperLimit
+
+    precheck.oraclePrice = precheck.spotPrice * 2
+    result = precheck.check_exit(1e18)
+    assert not result.success
+    assert isinstance(result.error, InvalidPrice)
+
+    # Joining with only the primary token is far from the pair price
+    result = precheck.check_join(1e18, 0)
+    assert not result.success
+
+def test_precheck_exit_failures_do_not_stop_the_batch(StratStableETHstETH):
+    (env, vault, mock) = StratStableETHstETH
+    precheck = Stable2TokenPrecheck.from_vault(vault)
+    precheck.totalBPTSupply = 0
+    results = precheck.check_exits([0, 10**18])
+    assert [result.success for result in results] == [False, False]
+    assert all(isinstance(result.error, ZeroDivisionError) for result in results)
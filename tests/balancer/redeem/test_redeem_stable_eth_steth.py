@@ -4,8 +4,10 @@ from brownie import accounts
 from brownie.convert import to_bytes
 from brownie.network.state import Chain
 from tests.fixtures import *
-from tests.balancer.helpers import check_invariant, check_account, enterMaturity, exitVaultPercent
+from tests.balancer.helpers import check_invariant, check_account, check_accounts, enterMaturity, exitVaultPercent
+from scripts.multicall import get_vault_accounts
 from scripts.common import get_dynamic_trade_params, get_redeem_params, DEX_ID, TRADE_TYPE
+from scripts.balancer.redeem_params import get_redeem_params_for_shares, get_min_exit_amounts_for_shares
 
 chain = Chain()
 
@@ -15,9 +17,14 @@ def test_single_maturity_full_redemption_success(StratStableETHstETH):
     depositAmount = 10e18
     maturity = enterMaturity(env, vault, 1, 0, depositAmount, primaryBorrowAmount, accounts[0])
     primaryAmountBefore = accounts[0].balance()
-    redeemParams = get_redeem_params(0, 0, get_dynamic_trade_params(
-        DEX_ID["CURVE"], TRADE_TYPE["EXACT_IN_SINGLE"], 5e6, True, bytes(0)
-    ))
+    vaultShares = env.notional.getVaultAccount(accounts[0], vault.address)["vaultShares"]
+    redeemParams = get_redeem_params_for_shares(
+        env.notional, vault, maturity, [vaultShares], get_dynamic_trade_params(
+            DEX_ID["CURVE"], TRADE_TYPE["EXACT_IN_SINGLE"], 5e6, True, bytes(0)
+        )
+    )[0]
+    [(minPrimary, minSecondary)] = get_min_exit_amounts_for_shares(env.notional, vault, maturity, [vaultShares])
+    assert minPrimary > 0 and minSecondary > 0
 
     # Min entry blocks
     with brownie.reverts():
@@ -80,6 +87,7 @@ def test_multiple_maturities_full_redemption_success(StratStableETHstETH):
     redeemParams = get_redeem_params(0, 0, get_dynamic_trade_params(
         DEX_ID["CURVE"], TRADE_TYPE["EXACT_IN_SINGLE"], 5e6, True, bytes(0)
     ))
+    vaultSharesBefore2 = env.notional.getVaultAccount(accounts[1], vault.address)["vaultShares"]
     primaryAmountBefore1 = accounts[0].balance()
     primaryAmountBefore2 = accounts[1].balance()
 
@@ -91,11 +99,11 @@ def test_multiple_maturities_full_redemption_success(StratStableETHstETH):
 
     exitVaultPercent(env, vault, accounts[0], 1, redeemParams)
     check_invariant(env, vault, [accounts[0], accounts[1]], [maturity1, maturity2])
-    check_account(env, vault, accounts[0], 0, 0)
+    check_accounts(env, vault, [accounts[0], accounts[1]], [0, vaultSharesBefore2], [0, primaryBorrowAmount])
     assert pytest.approx(accounts[0].balance() - primaryAmountBefore1, rel=5e-2) == depositAmount
     exitVaultPercent(env, vault, accounts[1], 1, redeemParams)
     check_invariant(env, vault, [accounts[0], accounts[1]], [maturity1, maturity2])
-    check_account(env, vault, accounts[1], 0, 0)
+    check_accounts(env, vault, [accounts[0], accounts[1]], [0, 0], [0, 0])
     assert pytest.approx(accounts[0].balance() - primaryAmountBefore2, rel=5e-2) == depositAmount
 
 def test_multiple_maturities_partial_redemption_success(StratStableETHstETH):
@@ -107,8 +115,9 @@ def test_multiple_maturities_partial_redemption_success(StratStableETHstETH):
     redeemParams = get_redeem_params(0, 0, get_dynamic_trade_params(
         DEX_ID["CURVE"], TRADE_TYPE["EXACT_IN_SINGLE"], 5e6, True, bytes(0)
     ))
-    vaultSharesBefore1 =  env.notional.getVaultAccount(accounts[0], vault.address)["vaultShares"]
-    vaultSharesBefore2 =  env.notional.getVaultAccount(accounts[1], vault.address)["vaultShares"]
+    (vaultSharesBefore1, vaultSharesBefore2) = [
+        vaultAccount["vaultShares"] for vaultAccount in get_vault_accounts(env.notional, vault, [accounts[0], accounts[1]])
+    ]
     primaryAmountBefore1 = accounts[0].balance()
     primaryAmountBefore2 = accounts[1].balance()
 
@@ -118,20 +127,32 @@ def test_multiple_maturities_partial_redemption_success(StratStableETHstETH):
         exitVaultPercent(env, vault, accounts[1], 0.5, redeemParams, True)
     chain.mine(5)
 
-    (sharesRedeemed, fCashRepaid) = exitVaultPercent(env, vault, accounts[0], 0.5, redeemParams)
+    (sharesRedeemed1, fCashRepaid1) = exitVaultPercent(env, vault, accounts[0], 0.5, redeemParams)
     check_invariant(env, vault, [accounts[0], accounts[1]], [maturity1, maturity2])
-    check_account(env, vault, accounts[0], vaultSharesBefore1 - sharesRedeemed, primaryBorrowAmount - fCashRepaid)
+    check_accounts(
+        env, vault, [accounts[0], accounts[1]],
+        [vaultSharesBefore1 - sharesRedeemed1, vaultSharesBefore2],
+        [primaryBorrowAmount - fCashRepaid1, primaryBorrowAmount]
+    )
     assert pytest.approx(accounts[0].balance() - primaryAmountBefore1, rel=5e-2) == depositAmount * 0.5
-    (sharesRedeemed, fCashRepaid) = exitVaultPercent(env, vault, accounts[1], 0.5, redeemParams)
+    (sharesRedeemed2, fCashRepaid2) = exitVaultPercent(env, vault, accounts[1], 0.5, redeemParams)
     check_invariant(env, vault, [accounts[0], accounts[1]], [maturity1, maturity2])
-    check_account(env, vault, accounts[1], vaultSharesBefore2 - sharesRedeemed, primaryBorrowAmount - fCashRepaid)
+    check_accounts(
+        env, vault, [accounts[0], accounts[1]],
+        [vaultSharesBefore1 - sharesRedeemed1, vaultSharesBefore2 - sharesRedeemed2],
+        [primaryBorrowAmount - fCashRepaid1, primaryBorrowAmount - fCashRepaid2]
+    )
     assert pytest.approx(accounts[1].balance() - primaryAmountBefore2, rel=5e-2) == depositAmount * 0.5
     
     exitVaultPercent(env, vault, accounts[0], 1, redeemParams)
     check_invariant(env, vault, [accounts[0], accounts[1]], [maturity1, maturity2])
-    check_account(env, vault, accounts[0], 0, 0)
+    check_accounts(
+        env, vault, [accounts[0], accounts[1]],
+        [0, vaultSharesBefore2 - sharesRedeemed2],
+        [0, primaryBorrowAmount - fCashRepaid2]
+    )
     assert pytest.approx(accounts[0].balance() - primaryAmountBefore1, rel=5e-2) == depositAmount
     exitVaultPercent(env, vault, accounts[1], 1, redeemParams)
     check_invariant(env, vault, [accounts[0], accounts[1]], [maturity1, maturity2])
-    check_account(env, vault, accounts[1], 0, 0)
+    check_accounts(env, vault, [accounts[0], accounts[1]], [0, 0], [0, 0])
     assert pytest.approx(accounts[1].balance() - primaryAmountBefore2, rel=5e-2) == depositAmount
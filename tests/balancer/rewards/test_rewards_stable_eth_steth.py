@@ -1,16 +1,9 @@
 import pytest
 import brownie
-from brownie import ZERO_ADDRESS, Wei, accounts
+from brownie import Wei, accounts
 from tests.fixtures import *
-from tests.balancer.helpers import enterMaturity, get_metastable_amounts
-from scripts.common import (
-    get_univ3_single_data, 
-    get_univ3_batch_data, 
-    DEX_ID, 
-    TRADE_TYPE,
-    set_dex_flags,
-    set_trade_type_flags
-)
+from tests.balancer.helpers import enterMaturity, get_metastable_reward_params
+from scripts.common import set_dex_flags, set_trade_type_flags
 
 chain = Chain()
 
@@ -41,44 +34,10 @@ def test_claim_rewards_success(StratStableETHstETH):
 def test_reinvest_rewards_success(StratStableETHstETH):
     (env, vault, mock) = StratStableETHstETH
     rewardAmount = Wei(50e18)
-    env.tokens["BAL"].transfer(vault.address, rewardAmount, {"from": env.whales["BAL"]})
+    env.fundAccounts([vault.address], {"BAL": rewardAmount})
 
-    tradeParams = "(uint16,uint8,uint256,bool,bytes)"
-    singleSidedRewardTradeParams = "(address,address,uint256,{})".format(tradeParams)
-    balanced2TokenRewardTradeParams = "({},{})".format(singleSidedRewardTradeParams, singleSidedRewardTradeParams)
-    (primaryAmount, secondaryAmount) = get_metastable_amounts(vault.getStrategyContext()["poolContext"], rewardAmount)
     assert vault.getStrategyContext()["baseStrategy"]["vaultState"]["totalBPTHeld"] == 0
-    rewardParams = [eth_abi.encode_abi(
-        [balanced2TokenRewardTradeParams],
-        [[
-            [
-                env.tokens["BAL"].address,
-                ZERO_ADDRESS,
-                primaryAmount,
-                [
-                    DEX_ID["UNISWAP_V3"],
-                    TRADE_TYPE["EXACT_IN_SINGLE"],
-                    0,
-                    False,
-                    get_univ3_single_data(3000)
-                ]
-            ],
-            [
-                env.tokens["BAL"].address,
-                env.tokens["wstETH"].address,
-                secondaryAmount,
-                [
-                    DEX_ID["UNISWAP_V3"],
-                    TRADE_TYPE["EXACT_IN_BATCH"],
-                    Wei(0.05e18), # static slippage
-                    False,
-                    get_univ3_batch_data([
-                        env.tokens["BAL"].address, 3000, env.tokens["WETH"].address, 500, env.tokens["wstETH"].address
-                    ])
-                ]
-            ]
-        ]]
-    ), 0]
+    rewardParams = get_metastable_reward_params(env, vault, rewardAmount)
 
     # Cannot reinvest without the proper role assigned
     with brownie.reverts():
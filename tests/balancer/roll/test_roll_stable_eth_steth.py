@@ -3,6 +3,7 @@ from brownie.network.state import Chain
 from tests.fixtures import *
 from tests.balancer.helpers import check_invariant, enterMaturity
 from scripts.common import (get_deposit_params)
+from scripts.date_time import get_maturity
 
 chain = Chain()
 
@@ -11,7 +12,7 @@ def test_single_account_next_maturity_success(StratStableETHstETH):
     primaryBorrowAmount = 5e8
     depositAmount = 10e18
     maturity1 = enterMaturity(env, vault, 1, 0, depositAmount, primaryBorrowAmount, accounts[0])
-    maturity2 = env.notional.getActiveMarkets(1)[1][1]
+    maturity2 = get_maturity(chain.time(), 2)
     env.notional.rollVaultPosition(
         accounts[0],
         vault.address,
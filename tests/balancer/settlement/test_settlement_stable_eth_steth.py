@@ -18,6 +18,7 @@ from scripts.common import (
     DEX_ID,
     TRADE_TYPE
 )
+from scripts.balancer.emergency_settlement import plan_emergency_settlement_for_vault
 
 chain = Chain()
 
@@ -178,3 +179,26 @@ def test_emergency_single_maturity(StratStableETHstETH):
     assert vaultState["totalStrategyTokens"] == 0
     totalUnderlyingCash = convert_to_underlying(env, 1, vaultState["totalAssetCash"])
     assert pytest.approx(totalUnderlyingCash, rel=1e-2) == depositAmount + expectedBorrowAmount
+
+def test_emergency_settlement_plan_multiple_maturities(StratStableETHstETH):
+    (env, vault, mock) = StratStableETHstETH
+    maturity1 = enterMaturity(env, vault, 1, 0, 10e18, 5e8, accounts[0])
+    maturity2 = enterMaturity(env, vault, 1, 1, 20e18, 5e8, accounts[1])
+    redeemParams = get_redeem_params(
+        0, 0, get_dynamic_trade_params(DEX_ID["CURVE"], TRADE_TYPE["EXACT_IN_SINGLE"], Wei(0.3e6), True, bytes(0))
+    )
+    vault.grantRole(vault.getRoles()["emergencySettlement"], accounts[1], {"from": env.notional.owner()})
+
+    assert plan_emergency_settlement_for_vault(env.notional, vault, [maturity1, maturity2], chain.time()) == []
+
+    settings = vault.getStrategyContext()["baseStrategy"]["vaultSettings"]
+    vault.setStrategyVaultSettings(get_updated_vault_settings(settings, maxBalancerPoolShare=0), {"from": env.notional.owner()})
+
+    plan = plan_emergency_settlement_for_vault(env.notional, vault, [maturity1, maturity2], chain.time())
+    # The larger maturity is settled first
+    assert [settlement.maturity for settlement in plan] == [maturity2, maturity1]
+    for settlement in plan:
+        assert vault.getEmergencySettlementBPTAmount(settlement.maturity) == settlement.bptToSettle
+        vault.settleVaultEmergency(settlement.maturity, redeemParams, {"from": accounts[1]})
+        assert env.notional.getVaultState(vault.address, settlement.maturity)["totalStrategyTokens"] == 0
+    assert vault.getStrategyContext()["baseStrategy"]["vaultState"]["totalBPTHeld"] == 0
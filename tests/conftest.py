@@ -11,78 +11,92 @@ from brownie import (
 from brownie.network import Chain
 from brownie import network, Contract
 from scripts.BalancerEnvironment import getEnvironment
-from scripts.common import set_dex_flags, set_trade_type_flags
+from scripts.EnvironmentConfig import getEnvironment as getTradingEnvironment
+from scripts.trading.permissions import PermissionMatrix
+from scripts.view_cache import viewCache
+from tests.snapshots import take_snapshot, revert_to_snapshot
 
 chain = Chain()
 
+def get_session_fixtures(items):
+    """Names of the session scoped fixtures used by items, including indirect ones"""
+    return list(dict.fromkeys(
+        name
+        for item in items
+        for (name, fixtureDefs) in item._fixtureinfo.name2fixturedefs.items()
+        if fixtureDefs[-1].scope == "session"
+    ))
+
+# Each test is reverted to the state before it ran, and each module to the state after
+# the shared fixtures it uses were built.
 @pytest.fixture(autouse=True)
 def run_around_tests():
     chain.snapshot()
     yield
     chain.revert()
-    
-@pytest.fixture()
-def StratStableETHstETH():
-    env = getEnvironment(network.show_active())
-    vault = Contract.from_abi(
+
+# Overrides brownie's module_isolation, which resets the chain to the fork block before
+# and after every module and so would drop the session fixtures while pytest
+# keeps returning them. Brownie's xdist runner only runs modules whose tests use a
+# fixture with this name, so it also lets `brownie test -n` collect the suite.
+@pytest.fixture(scope="module", autouse=True)
+def module_isolation(request):
+    # Session fixtures (env and the vault fixtures) are shared by every test that uses
+    # them, they are built before the snapshot so their state sits below the module level
+    items = [item for item in request.session.items if item.getparent(pytest.Module) is request.node]
+    for name in get_session_fixtures(items):
+        request.getfixturevalue(name)
+
+    # Module scoped fixtures (e.g. test_cross_currency.usdcDaiVault) are reverted with the module
+    snapshotId = take_snapshot()
+    yield
+    revert_to_snapshot(snapshotId)
+
+@pytest.fixture(scope="session")
+def env():
+    name = network.show_active()
+    if name == 'goerli-fork':
+        environment = getTradingEnvironment('goerli')
+        environment.notional.upgradeTo('0x433a0679756D6EB110E8Ff730d06DBee5D9F5db5', {'from': environment.owner})
+        return environment
+    return getEnvironment(name)
+
+@pytest.fixture(scope="session")
+def StratStableETHstETH(env):
+    vault = viewCache.wrap(Contract.from_abi(
         "MetaStable2TokenAuraVault", 
         "0xF049B944eC83aBb50020774D48a8cf40790996e6", 
         MetaStable2TokenAuraVault.abi
-    )
+    ))
     env.initializeBalancerVault(vault, "StratStableETHstETH")
-    env.tradingModule.setTokenPermissions(
-        vault.address, 
-        env.tokens["wstETH"].address, 
-        [True, set_dex_flags(0, BALANCER_V2=True, CURVE=True), set_trade_type_flags(0, EXACT_IN_SINGLE=True)], 
-        {"from": env.notional.owner()})
-    env.tradingModule.setTokenPermissions(
-        vault.address, 
-        env.tokens["stETH"].address, 
-        [True, set_dex_flags(0, CURVE=True), set_trade_type_flags(0, EXACT_IN_SINGLE=True)], 
-        {"from": env.notional.owner()})
-    env.tradingModule.setTokenPermissions(
-        vault.address, 
-        env.tokens["WETH"].address, 
-        [True, set_dex_flags(0, BALANCER_V2=True, CURVE=True), set_trade_type_flags(0, EXACT_IN_SINGLE=True)], 
-        {"from": env.notional.owner()})
-    env.tradingModule.setTokenPermissions(
-        vault.address, 
-        ZERO_ADDRESS, 
-        [True, set_dex_flags(0, BALANCER_V2=True, CURVE=True), set_trade_type_flags(0, EXACT_IN_SINGLE=True)], 
-        {"from": env.notional.owner()})
-
     mock = env.deployBalancerVault("StratStableETHstETH", MockMetaStable2TokenAuraVault, [MetaStable2TokenAuraHelper])
-    env.tradingModule.setTokenPermissions(
-        mock.address, 
-        env.tokens["wstETH"].address, 
-        [True, set_dex_flags(0, BALANCER_V2=True, CURVE=True), set_trade_type_flags(0, EXACT_IN_SINGLE=True)], 
-        {"from": env.notional.owner()})
-    env.tradingModule.setTokenPermissions(
-        mock.address, 
-        env.tokens["stETH"].address, 
-        [True, set_dex_flags(0, CURVE=True), set_trade_type_flags(0, EXACT_IN_SINGLE=True)], 
-        {"from": env.notional.owner()})
-    env.tradingModule.setTokenPermissions(
-        mock.address, 
-        env.tokens["WETH"].address, 
-        [True, set_dex_flags(0, BALANCER_V2=True, CURVE=True), set_trade_type_flags(0, EXACT_IN_SINGLE=True)], 
-        {"from": env.notional.owner()})
-    env.tradingModule.setTokenPermissions(
-        mock.address, 
-        ZERO_ADDRESS, 
-        [True, set_dex_flags(0, BALANCER_V2=True, CURVE=True), set_trade_type_flags(0, EXACT_IN_SINGLE=True)], 
-        {"from": env.notional.owner()})
+
+    vaults = [vault.address, mock.address]
+    PermissionMatrix(env.tradingModule).add(
+        vaults,
+        [env.tokens["wstETH"].address, env.tokens["WETH"].address, ZERO_ADDRESS],
+        dexes=["BALANCER_V2", "CURVE"],
+        tradeTypes=["EXACT_IN_SINGLE"]
+    ).add(
+        vaults,
+        [env.tokens["stETH"].address],
+        dexes=["CURVE"],
+        tradeTypes=["EXACT_IN_SINGLE"]
+    ).apply(env.owner)
 
     return (env, vault, mock)
 
-@pytest.fixture()
-def StratBoostedPoolDAIPrimary():
-    env = getEnvironment(network.show_active())
+@pytest.fixture(scope="session")
+def StratBoostedPoolDAIPrimary(env):
     vault = env.deployBalancerVault("StratBoostedPoolDAIPrimary", MockBoosted3TokenAuraVault, [Boosted3TokenAuraHelper])
     return (env, vault)
 
-@pytest.fixture()
-def StratBoostedPoolUSDCPrimary():
-    env = getEnvironment(network.show_active())
+@pytest.fixture(scope="session")
+def StratBoostedPoolUSDCPrimary(env):
     vault = env.deployBalancerVault("StratBoostedPoolUSDCPrimary", MockBoosted3TokenAuraVault, [Boosted3TokenAuraHelper])
     return (env, vault)
+
+def pytest_terminal_summary(terminalreporter):
+    stats = viewCache.stats()
+    if stats["hits"] + stats["misses"] > 0:
+        terminalreporter.write_line("view cache: {hits} hits, {misses} misses".format(**stats))
@@ -2,7 +2,7 @@ import pytest
 import eth_abi
 from brownie.network import Chain
 from brownie import network, Contract
-from scripts.EnvironmentConfig import getEnvironment
+from scripts.flags import encode_flags, LegacyVaultFlags
 
 DEX_ID = {
     'UNUSED': 0,
@@ -18,35 +18,8 @@ def encode_exchange_data(dex, tradeType, params):
     if dex == 'UNISWAP_V3' and tradeType == 'EXACT_IN_SINGLE':
         return eth_abi.encode_abi(['(uint24)'], [tuple([params['fee']])])
 
-@pytest.fixture(scope="module", autouse=True)
-def env():
-    name = network.show_active()
-    if name == 'goerli-fork':
-        environment = getEnvironment('goerli')
-        environment.notional.upgradeTo('0x433a0679756D6EB110E8Ff730d06DBee5D9F5db5', {'from': environment.owner})
-        return environment
-    if name == 'mainnet-fork':
-        return getEnvironment('mainnet')
-
 def set_flags(flags, **kwargs):
-    binList = list(format(flags, "b").rjust(16, "0"))
-    if "ENABLED" in kwargs:
-        binList[0] = "1"
-    if "ALLOW_ROLL_POSITION" in kwargs:
-        binList[1] = "1"
-    if "ONLY_VAULT_ENTRY" in kwargs:
-        binList[2] = "1"
-    if "ONLY_VAULT_EXIT" in kwargs:
-        binList[3] = "1"
-    if "ONLY_VAULT_ROLL" in kwargs:
-        binList[4] = "1"
-    if "ONLY_VAULT_DELEVERAGE" in kwargs:
-        binList[5] = "1"
-    if "ONLY_VAULT_SETTLE" in kwargs:
-        binList[6] = "1"
-    if "ALLOW_REENTRANCY" in kwargs:
-        binList[7] = "1"
-    return int("".join(reversed(binList)), 2)
+    return encode_flags(LegacyVaultFlags, flags, **kwargs)
 
 
 def get_vault_config(**kwargs):
@@ -0,0 +1,42 @@
+import fcntl
+import json
+import pytest
+
+class GasBenchmark:
+    def __init__(self, baseline, threshold, requireBaseline=True):
+        # vault => method => gas used
+        self.baseline = baseline
+        self.threshold = threshold
+        # Unless the baseline is being recorded, a method without a baseline entry fails
+        self.requireBaseline = requireBaseline
+        self.results = {}
+
+    def record(self, vault, method, txn):
+        gasUsed = txn.gas_used
+        self.results.setdefault(vault, {})[method] = gasUsed
+        expected = self.baseline.get(vault, {}).get(method)
+        if expected is None:
+            if self.requireBaseline:
+                pytest.fail("{}.{} has no gas baseline, record it with UPDATE_GAS_BASELINE=1".format(vault, method))
+        elif gasUsed > expected * (1 + self.threshold):
+            pytest.fail("{}.{} used {} gas, baseline is {} (+{:.2%})".format(
+                vault, method, gasUsed, expected, gasUsed / expected - 1
+            ))
+        return gasUsed
+
+def merge_results(baseline, results):
+    merged = {vault: dict(methods) for (vault, methods) in baseline.items()}
+    for (vault, methods) in results.items():
+        merged.setdefault(vault, {}).update(methods)
+    return merged
+
+def update_baseline(path, results):
+    """Merges results into the baseline file. xdist workers update the same file when
+    they finish, the lock makes each read, merge and write atomic."""
+    with open(path, "r+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        baseline = merge_results(json.load(f), results)
+        f.seek(0)
+        f.truncate()
+        json.dump(baseline, f, sort_keys=True, indent=4)
+        f.write("\n")
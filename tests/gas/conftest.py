@@ -0,0 +1,31 @@
+import json
+import os
+import pytest
+from tests.gas.benchmark import GasBenchmark, update_baseline
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "gas_baseline.json")
+# Allowed gas increase over the baseline before a benchmark fails, override with GAS_REGRESSION_THRESHOLD
+DEFAULT_THRESHOLD = 0.02
+
+def get_report_path():
+    # Each xdist worker writes its own report
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    return "gas_report.{}.json".format(worker) if worker else "gas_report.json"
+
+@pytest.fixture(scope="session")
+def gasBenchmark():
+    # Run with UPDATE_GAS_BASELINE=1 to accept the measured gas as the new baseline
+    updateBaseline = bool(os.environ.get("UPDATE_GAS_BASELINE"))
+    with open(BASELINE_PATH) as f:
+        baseline = json.load(f)
+    benchmark = GasBenchmark(
+        baseline,
+        float(os.environ.get("GAS_REGRESSION_THRESHOLD", DEFAULT_THRESHOLD)),
+        requireBaseline=not updateBaseline
+    )
+    yield benchmark
+
+    with open(get_report_path(), "w") as f:
+        json.dump(benchmark.results, f, sort_keys=True, indent=4)
+    if updateBaseline:
+        update_baseline(BASELINE_PATH, benchmark.results)
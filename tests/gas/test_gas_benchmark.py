@@ -0,0 +1,34 @@
+import json
+import pytest
+from types import SimpleNamespace
+from tests.gas.benchmark import GasBenchmark, merge_results, update_baseline
+
+def test_fails_past_threshold():
+    benchmark = GasBenchmark({"Vault": {"enterVault": 1_000_000}}, 0.02, requireBaseline=False)
+    assert benchmark.record("Vault", "enterVault", SimpleNamespace(gas_used=1_020_000)) == 1_020_000
+    # Methods without a baseline are only recorded while the baseline is updated
+    benchmark.record("Vault", "exitVault", SimpleNamespace(gas_used=5_000_000))
+    with pytest.raises(pytest.fail.Exception):
+        benchmark.record("Vault", "enterVault", SimpleNamespace(gas_used=1_020_001))
+    assert benchmark.results == {"Vault": {"enterVault": 1_020_001, "exitVault": 5_000_000}}
+
+def test_merge_results():
+    baseline = {"A": {"enterVault": 1, "exitVault": 2}}
+    assert merge_results(baseline, {"A": {"exitVault": 3}, "B": {"enterVault": 4}}) == {
+        "A": {"enterVault": 1, "exitVault": 3}, "B": {"enterVault": 4}
+    }
+    assert baseline == {"A": {"enterVault": 1, "exitVault": 2}}
+
+def test_missing_baseline_fails():
+    benchmark = GasBenchmark({"Vault": {"enterVault": 1_000_000}}, 0.02)
+    with pytest.raises(pytest.fail.Exception):
+        benchmark.record("Vault", "exitVault", SimpleNamespace(gas_used=1))
+
+def test_update_baseline_rereads_the_file(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    with open(path, "w") as f:
+        json.dump({"A": {"enterVault": 1}}, f)
+    # Two workers that both started from the same baseline keep each other's results
+    update_baseline(path, {"A": {"exitVault": 2}})
+    update_baseline(path, {"B": {"enterVault": 3}})
+    assert json.load(open(path)) == {"A": {"enterVault": 1, "exitVault": 2}, "B": {"enterVault": 3}}
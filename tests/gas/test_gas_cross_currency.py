@@ -0,0 +1,77 @@
+from brownie.convert.datatypes import Wei
+from brownie.network import Chain
+from tests.fixtures import *
+from tests.test_cross_currency import usdcDaiVault, encode_deposit_params, encode_redeem_params
+from scripts.date_time import get_active_maturities
+
+chain = Chain()
+
+VAULT = "CrossCurrencyfCashVault"
+
+# CrossCurrencyfCashVault does not support rolling positions, emergency settlement or rewards
+
+def enter_vault(env, vault, account, maturity):
+    return env.notional.enterVault(
+        account,
+        vault.address,
+        20_000e6,
+        maturity,
+        110_000e8,
+        0,
+        encode_deposit_params(
+            minPurchaseAmount=Wei(107_000e18),
+            minLendRate=0,
+            dexId='UNISWAP_V3',
+            exchangeData={'fee': 100}
+        ),
+        {"from": account}
+    )
+
+def test_gas_enter_vault(env, usdcDaiVault, accounts, gasBenchmark):
+    maturity = get_active_maturities(chain.time(), 2)[1]
+    gasBenchmark.record(VAULT, "enterVault", enter_vault(env, usdcDaiVault, accounts[0], maturity))
+
+def test_gas_exit_vault(env, usdcDaiVault, accounts, gasBenchmark):
+    maturity = get_active_maturities(chain.time(), 2)[1]
+    enter_vault(env, usdcDaiVault, accounts[0], maturity)
+    txn = env.notional.exitVault(
+        accounts[0],
+        usdcDaiVault.address,
+        accounts[0],
+        12_000e8,
+        10_000e8,
+        0,
+        encode_redeem_params(
+            minPurchaseAmount=Wei(10_000e6),
+            maxBorrowRate=0,
+            dexId='UNISWAP_V3',
+            exchangeData={'fee': 100}
+        ),
+        {"from": accounts[0]}
+    )
+    gasBenchmark.record(VAULT, "exitVault", txn)
+
+def test_gas_settle_vault(env, usdcDaiVault, accounts, gasBenchmark):
+    maturities = get_active_maturities(chain.time(), 2)
+    maturity = maturities[1]
+    enter_vault(env, usdcDaiVault, accounts[0], maturity)
+
+    chain.mine(1, timestamp=maturities[0])
+    env.notional.initializeMarkets(2, False, {"from": accounts[0]})
+    env.notional.initializeMarkets(3, False, {"from": accounts[0]})
+    chain.mine(1, timestamp=maturities[1])
+    env.notional.initializeMarkets(2, False, {"from": accounts[0]})
+    env.notional.initializeMarkets(3, False, {"from": accounts[0]})
+
+    txn = usdcDaiVault.settleVault(
+        maturity,
+        env.notional.getVaultState(usdcDaiVault.address, maturity)['totalStrategyTokens'],
+        encode_redeem_params(
+            minPurchaseAmount=Wei(129_500e6),
+            maxBorrowRate=0,
+            dexId='UNISWAP_V3',
+            exchangeData={'fee': 100}
+        ),
+        {"from": accounts[1]}
+    )
+    gasBenchmark.record(VAULT, "settleVault", txn)
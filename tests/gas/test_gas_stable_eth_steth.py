@@ -0,0 +1,101 @@
+import math
+from brownie import accounts, Wei
+from brownie.network.state import Chain
+from tests.fixtures import *
+from tests.balancer.helpers import enterMaturity, exitVaultPercent, get_metastable_reward_params
+from scripts.common import (
+    get_deposit_params,
+    get_updated_vault_settings,
+    get_dynamic_trade_params,
+    get_redeem_params,
+    set_dex_flags,
+    set_trade_type_flags,
+    DEX_ID,
+    TRADE_TYPE
+)
+from scripts.date_time import get_maturity
+
+chain = Chain()
+
+VAULT = "MetaStable2TokenAuraVault"
+
+def test_gas_enter_vault(StratStableETHstETH, gasBenchmark):
+    (env, vault, mock) = StratStableETHstETH
+    (_, txn) = enterMaturity(env, vault, 1, 0, 10e18, 5e8, accounts[0], returnTxn=True)
+    gasBenchmark.record(VAULT, "enterVault", txn)
+
+def test_gas_exit_vault(StratStableETHstETH, gasBenchmark):
+    (env, vault, mock) = StratStableETHstETH
+    enterMaturity(env, vault, 1, 0, 10e18, 5e8, accounts[0])
+    chain.mine(5)
+    redeemParams = get_redeem_params(0, 0, get_dynamic_trade_params(
+        DEX_ID["CURVE"], TRADE_TYPE["EXACT_IN_SINGLE"], 5e6, True, bytes(0)
+    ))
+    (_, _, txn) = exitVaultPercent(env, vault, accounts[0], 1.0, redeemParams, returnTxn=True)
+    gasBenchmark.record(VAULT, "exitVault", txn)
+
+def test_gas_roll_vault_position(StratStableETHstETH, gasBenchmark):
+    (env, vault, mock) = StratStableETHstETH
+    primaryBorrowAmount = 5e8
+    enterMaturity(env, vault, 1, 0, 10e18, primaryBorrowAmount, accounts[0])
+    txn = env.notional.rollVaultPosition(
+        accounts[0],
+        vault.address,
+        primaryBorrowAmount * 1.1,
+        get_maturity(chain.time(), 2),
+        0,
+        0,
+        0,
+        get_deposit_params(),
+        {"from": accounts[0]}
+    )
+    gasBenchmark.record(VAULT, "rollVaultPosition", txn)
+
+def test_gas_settle_vault_normal(StratStableETHstETH, gasBenchmark):
+    (env, vault, mock) = StratStableETHstETH
+    maturity = enterMaturity(env, vault, 1, 0, 10e18, 5e8, accounts[0])
+    settlementWindow = vault.getStrategyContext()["baseStrategy"]["settlementPeriodInSeconds"]
+    chain.sleep(maturity - settlementWindow + 1 - chain.time())
+    chain.mine(5)
+    env.tradingModule.setMaxOracleFreshness(2 ** 32 - 1, {"from": env.notional.owner()})
+    vault.grantRole(vault.getRoles()["normalSettlement"], accounts[1], {"from": env.notional.owner()})
+    redeemParams = get_redeem_params(
+        0, 0, get_dynamic_trade_params(DEX_ID["CURVE"], TRADE_TYPE["EXACT_IN_SINGLE"], Wei(0.15e6), True, bytes(0))
+    )
+    tokensToRedeem = math.floor(env.notional.getVaultState(vault.address, maturity)["totalStrategyTokens"] * 0.5)
+    txn = vault.settleVaultNormal(maturity, tokensToRedeem, redeemParams, {"from": accounts[1]})
+    gasBenchmark.record(VAULT, "settleVaultNormal", txn)
+
+def test_gas_settle_vault_emergency(StratStableETHstETH, gasBenchmark):
+    (env, vault, mock) = StratStableETHstETH
+    maturity = enterMaturity(env, vault, 1, 0, 10e18, 5e8, accounts[0])
+    vault.grantRole(vault.getRoles()["emergencySettlement"], accounts[1], {"from": env.notional.owner()})
+    settings = vault.getStrategyContext()["baseStrategy"]["vaultSettings"]
+    vault.setStrategyVaultSettings(get_updated_vault_settings(settings, maxBalancerPoolShare=0), {"from": env.notional.owner()})
+    redeemParams = get_redeem_params(
+        0, 0, get_dynamic_trade_params(DEX_ID["CURVE"], TRADE_TYPE["EXACT_IN_SINGLE"], Wei(0.3e6), True, bytes(0))
+    )
+    txn = vault.settleVaultEmergency(maturity, redeemParams, {"from": accounts[1]})
+    gasBenchmark.record(VAULT, "settleVaultEmergency", txn)
+
+def test_gas_claim_reward_tokens(StratStableETHstETH, gasBenchmark):
+    (env, vault, mock) = StratStableETHstETH
+    enterMaturity(env, vault, 1, 0, 50e18, 100e8, accounts[0])
+    chain.sleep(3600 * 24 * 365)
+    chain.mine()
+    vault.grantRole(vault.getRoles()["rewardReinvestment"], accounts[1], {"from": env.notional.owner()})
+    txn = vault.claimRewardTokens({"from": accounts[1]})
+    gasBenchmark.record(VAULT, "claimRewardTokens", txn)
+
+def test_gas_reinvest_reward(StratStableETHstETH, gasBenchmark):
+    (env, vault, mock) = StratStableETHstETH
+    rewardAmount = Wei(50e18)
+    env.fundAccounts([vault.address], {"BAL": rewardAmount})
+    vault.grantRole(vault.getRoles()["rewardReinvestment"], accounts[1], {"from": env.notional.owner()})
+    env.tradingModule.setTokenPermissions(
+        vault.address,
+        env.tokens["BAL"].address,
+        [True, set_dex_flags(0, UNISWAP_V3=True), set_trade_type_flags(0, EXACT_IN_SINGLE=True, EXACT_IN_BATCH=True)],
+        {"from": env.notional.owner()})
+    txn = vault.reinvestReward(get_metastable_reward_params(env, vault, rewardAmount), {"from": accounts[1]})
+    gasBenchmark.record(VAULT, "reinvestReward", txn)
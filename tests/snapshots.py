@@ -0,0 +1,18 @@
+from brownie import web3
+from brownie.network.state import Chain
+
+chain = Chain()
+
+# chain.snapshot() keeps a single snapshot, which the per-test fixture in conftest
+# uses. Module snapshots are taken with evm_snapshot directly so both can be held.
+
+def take_snapshot():
+    return web3.provider.make_request("evm_snapshot", [])["result"]
+
+def revert_to_snapshot(snapshotId):
+    """Reverts the chain to a snapshot taken by take_snapshot. This goes through
+    brownie's private Chain._revert, the same call chain.revert() makes, so that
+    brownie's tx history and the callbacks registered with _revert_register (e.g. the
+    view cache) are updated. The node consumes snapshotId, the returned id is a new
+    snapshot of the same state."""
+    return chain._revert(snapshotId)
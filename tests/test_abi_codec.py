@@ -0,0 +1,45 @@
+import eth_abi
+from scripts.abi_codec import get_schema
+from scripts.common import (
+    get_deposit_trade_params,
+    get_dynamic_trade_params,
+    get_deposit_params,
+    get_redeem_params,
+    get_univ3_batch_data,
+    get_deposit_trade_params_batch,
+    get_dynamic_trade_params_batch,
+    get_redeem_params_batch,
+    REDEEM_PARAMS
+)
+
+WETH = "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2"
+USDC = "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"
+
+def test_schema_matches_encode_abi():
+    types = ['(uint256,(uint16,uint8,uint32,bool,bytes))', 'address[]', 'bytes32']
+    args = [[10**18, [2, 0, 5 * 10**6, True, b"\x01\x02"]], [WETH, USDC], b"\x11" * 32]
+    assert get_schema(*types).encode(*args) == eth_abi.encode_abi(types, args)
+    assert get_schema(*types) is get_schema(*types)
+    assert get_schema(*types).decode(eth_abi.encode_abi(types, args)) == eth_abi.decode_abi(types, eth_abi.encode_abi(types, args))
+
+def test_param_builders_match_encode_abi():
+    assert get_redeem_params(1e18, 2, b"ab") == eth_abi.encode_abi(['(uint256,uint256,bytes)'], [[10**18, 2, b"ab"]])
+    assert get_deposit_params(5, 0, b"") == eth_abi.encode_abi(['(uint256,uint256,uint32,uint32,bytes)'], [[5, 0, 0, 0, b""]])
+    assert get_dynamic_trade_params(2, 1, 5e6, False, b"") == \
+        eth_abi.encode_abi(['(uint16,uint8,uint32,bool,bytes)'], [[2, 1, 5 * 10**6, False, b""]])
+    assert get_deposit_trade_params(2, 1, 1e18, 5e6, False, b"") == \
+        eth_abi.encode_abi(['(uint256,(uint16,uint8,uint32,bool,bytes))'], [[10**18, [2, 1, 5 * 10**6, False, b""]]])
+    packedPath = eth_abi.codec.ABIEncoder(eth_abi.registry.registry_packed).encode_abi(
+        ['address', 'uint24', 'address'], [WETH, 500, USDC]
+    )
+    assert get_univ3_batch_data([WETH, 500, USDC]) == eth_abi.encode_abi(['(bytes)'], [[packedPath]])
+
+def test_batch_builders():
+    trades = [(2, 0, 10**6 * i, 5e6, False, b"") for i in range(100)]
+    assert get_deposit_trade_params_batch(trades) == [get_deposit_trade_params(*t) for t in trades]
+    dynamicTrades = [(2, 0, i, True, b"\x00" * i) for i in range(100)]
+    assert get_dynamic_trade_params_batch(dynamicTrades) == [get_dynamic_trade_params(*t) for t in dynamicTrades]
+    redeems = [(i, 2 * i, b"") for i in range(100)]
+    encoded = get_redeem_params_batch(redeems)
+    assert encoded == [get_redeem_params(*r) for r in redeems]
+    assert [decoded for (decoded,) in REDEEM_PARAMS.decode_many(encoded)] == redeems
@@ -0,0 +1,48 @@
+import json
+import os
+from scripts.abi_store import AbiStore
+
+ABI = [{"inputs": [], "name": "decimals", "outputs": [{"name": "", "type": "uint8"}], "type": "function"}]
+
+def write_json(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=4)
+
+def test_loads_abi_section_of_artifacts(tmp_path):
+    write_json(tmp_path / "Token.json", {"abi": ABI, "bytecode": "0x" + "00" * 1000})
+    write_json(tmp_path / "Plain.json", ABI)
+    store = AbiStore(str(tmp_path), str(tmp_path / "cache"))
+    assert store["Token"] == ABI
+    assert store["Plain"] == ABI
+    # Both files have the same abi but different content
+    assert len([f for f in os.listdir(tmp_path / "cache") if f != "index.json"]) == 2
+
+def test_cache_is_keyed_by_content(tmp_path):
+    write_json(tmp_path / "Token.json", {"abi": ABI})
+    assert AbiStore(str(tmp_path), str(tmp_path / "cache"))["Token"] == ABI
+
+    # A new store is served from the cache without parsing the artifact
+    with open(tmp_path / "Token.json", "a") as f:
+        f.write("not json")
+    stat = os.stat(tmp_path / "Token.json")
+    index = json.load(open(tmp_path / "cache" / "index.json"))
+    index[str(tmp_path / "Token.json")].update(size=stat.st_size, mtime=stat.st_mtime_ns)
+    write_json(tmp_path / "cache" / "index.json", index)
+    assert AbiStore(str(tmp_path), str(tmp_path / "cache"))["Token"] == ABI
+
+    # Changing the artifact invalidates the cached abi
+    updatedABI = ABI + [{"inputs": [], "name": "name", "outputs": [{"name": "", "type": "string"}], "type": "function"}]
+    write_json(tmp_path / "Token.json", {"abi": updatedABI})
+    assert AbiStore(str(tmp_path), str(tmp_path / "cache"))["Token"] == updatedABI
+
+def test_stores_share_the_index(tmp_path):
+    write_json(tmp_path / "Token.json", {"abi": ABI})
+    write_json(tmp_path / "Plain.json", ABI)
+    first = AbiStore(str(tmp_path), str(tmp_path / "cache"))
+    second = AbiStore(str(tmp_path), str(tmp_path / "cache"))
+    first["Token"]
+    second["Plain"]
+
+    # The second store loaded its index before the first wrote, both entries are kept
+    index = json.load(open(tmp_path / "cache" / "index.json"))
+    assert set(index) == {str(tmp_path / "Token.json"), str(tmp_path / "Plain.json")}
@@ -4,8 +4,9 @@ import brownie
 from brownie.convert.datatypes import Wei, HexString
 from brownie.network import Chain
 from brownie import network, Contract
-from scripts.EnvironmentConfig import getEnvironment
-from fixtures import *
+from scripts.date_time import get_active_maturities
+from scripts.cross_currency import CrossCurrencyfCashValuation
+from tests.fixtures import *
 
 chain = Chain()
 
@@ -32,7 +33,7 @@ def usdcDaiVault(env, CrossCurrencyfCashVault, nProxy, accounts):
         {"from": env.notional.owner()},
     )
 
-    env.tokens['USDC'].transfer(accounts[0], 30_000e6, {"from": env.whales['USDC']})
+    env.fundAccounts([accounts[0]], {"USDC": 30_000e6})
     env.tokens['USDC'].approve(env.notional.address, 2 ** 255, {"from": accounts[0]})
 
     return vault
@@ -61,8 +62,8 @@ def encode_redeem_params(**kwargs):
 
 @pytest.mark.only
 def test_enter_vault_success(env, usdcDaiVault, accounts):
-    markets = env.notional.getActiveMarkets(3)
-    maturity = markets[1][1]
+    maturities = get_active_maturities(chain.time(), 2)
+    maturity = maturities[1]
     params = encode_deposit_params(
         minPurchaseAmount=Wei(107_000e18),
         minLendRate=0,
@@ -97,8 +98,35 @@ def test_enter_vault_success(env, usdcDaiVault, accounts):
     assert env.tokens["DAI"].balanceOf(usdcDaiVault.address) < 1e14
     assert env.tokens["USDC"].balanceOf(usdcDaiVault.address) == 0
 
+def test_offline_valuation_matches_vault(env, usdcDaiVault, accounts):
+    maturities = get_active_maturities(chain.time(), 3)
+    env.notional.enterVault(
+        accounts[0],
+        usdcDaiVault.address,
+        10_000e6,
+        maturities[1],
+        100_000e8,
+        0,
+        encode_deposit_params(
+            minPurchaseAmount=Wei(107_000e18),
+            minLendRate=0,
+            dexId='UNISWAP_V3',
+            exchangeData={
+                'fee': 100
+            }
+        ),
+        {"from": accounts[0]}
+    )
+
+    valuation = CrossCurrencyfCashValuation.from_vault(env.notional, usdcDaiVault)
+    for maturity in maturities:
+        for strategyTokens in [1e8, 100_000e8, 1_000_000e8]:
+            expected = usdcDaiVault.convertStrategyToUnderlying(accounts[0], Wei(strategyTokens), maturity)
+            # Allows for one unit of RATE_PRECISION difference in the discount factor
+            assert pytest.approx(valuation.convert_strategy_to_underlying(strategyTokens, maturity), rel=1e-9, abs=1) == expected
+
 def test_enter_vault_fail_lend_rate(env, usdcDaiVault, accounts):
-    markets = env.notional.getActiveMarkets(3)
+    maturities = get_active_maturities(chain.time(), 2)
     params = encode_deposit_params(
         minPurchaseAmount=Wei(107_000e18),
         minLendRate=Wei(0.1e9),
@@ -113,7 +141,7 @@ def test_enter_vault_fail_lend_rate(env, usdcDaiVault, accounts):
             accounts[0],
             usdcDaiVault.address,
             10_000e6,
-            markets[1][1],
+            maturities[1],
             100_000e8,
             0,
             params,
@@ -121,7 +149,7 @@ def test_enter_vault_fail_lend_rate(env, usdcDaiVault, accounts):
         )
 
 def test_enter_vault_fail_purchase_limit(env, usdcDaiVault, accounts):
-    markets = env.notional.getActiveMarkets(3)
+    maturities = get_active_maturities(chain.time(), 2)
     params = encode_deposit_params(
         minPurchaseAmount=Wei(110_000e18),
         minLendRate=0,
@@ -136,7 +164,7 @@ def test_enter_vault_fail_purchase_limit(env, usdcDaiVault, accounts):
             accounts[0],
             usdcDaiVault.address,
             10_000e6,
-            markets[1][1],
+            maturities[1],
             100_000e8,
             0,
             params,
@@ -144,7 +172,7 @@ def test_enter_vault_fail_purchase_limit(env, usdcDaiVault, accounts):
         )
 
 def test_enter_vault_fail_collateral_ratio(env, usdcDaiVault, accounts):
-    markets = env.notional.getActiveMarkets(3)
+    maturities = get_active_maturities(chain.time(), 2)
     params = encode_deposit_params(
         minPurchaseAmount=Wei(99_000e18),
         minLendRate=0,
@@ -159,7 +187,7 @@ def test_enter_vault_fail_collateral_ratio(env, usdcDaiVault, accounts):
             accounts[0],
             usdcDaiVault.address,
             4_000e6,
-            markets[1][1],
+            maturities[1],
             100_000e8,
             0,
             params,
@@ -168,14 +196,14 @@ def test_enter_vault_fail_collateral_ratio(env, usdcDaiVault, accounts):
 
 @pytest.mark.only
 def test_exit_vault_success(env, usdcDaiVault, accounts):
-    markets = env.notional.getActiveMarkets(3)
-    maturity = markets[1][1]
+    maturities = get_active_maturities(chain.time(), 2)
+    maturity = maturities[1]
 
     env.notional.enterVault(
         accounts[0],
         usdcDaiVault.address,
         20_000e6,
-        markets[1][1],
+        maturities[1],
         110_000e8,
         0,
         encode_deposit_params(
@@ -232,8 +260,8 @@ def test_exit_vault_success(env, usdcDaiVault, accounts):
 
 @pytest.mark.only
 def test_settle_vault_success(env, usdcDaiVault, accounts):
-    markets = env.notional.getActiveMarkets(3)
-    maturity = markets[1][1]
+    maturities = get_active_maturities(chain.time(), 2)
+    maturity = maturities[1]
 
     env.notional.enterVault(
         accounts[0],
@@ -253,11 +281,11 @@ def test_settle_vault_success(env, usdcDaiVault, accounts):
         {"from": accounts[0]}
     )
 
-    chain.mine(1, timestamp=markets[0][1])
+    chain.mine(1, timestamp=maturities[0])
     env.notional.initializeMarkets(2, False, {"from": accounts[0]})
     env.notional.initializeMarkets(3, False, {"from": accounts[0]})
 
-    chain.mine(1, timestamp=markets[1][1])
+    chain.mine(1, timestamp=maturities[1])
     env.notional.initializeMarkets(2, False, {"from": accounts[0]})
     env.notional.initializeMarkets(3, False, {"from": accounts[0]})
     
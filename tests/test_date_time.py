@@ -0,0 +1,32 @@
+import pytest
+from scripts import date_time
+from scripts.date_time import DAY, QUARTER, YEAR, MarketCalendar
+
+FORK_BLOCK_TIME = 1666828200
+
+def test_calendar_matches_date_time():
+    calendar = MarketCalendar(FORK_BLOCK_TIME, FORK_BLOCK_TIME + YEAR)
+    for blockTime in range(FORK_BLOCK_TIME, FORK_BLOCK_TIME + 2 * YEAR, 7 * DAY + 3601):
+        tRef = date_time.get_reference_time(blockTime)
+        for marketIndex in range(1, 8):
+            maturity = calendar.get_maturity(blockTime, marketIndex)
+            assert maturity == tRef + date_time.get_traded_market(marketIndex)
+            assert calendar.get_market_index(7, maturity, blockTime) == \
+                date_time.get_market_index(7, maturity, blockTime) == (marketIndex, False)
+            assert date_time.is_valid_maturity(marketIndex, maturity, blockTime)
+        assert calendar.get_market_index(3, tRef + QUARTER + DAY, blockTime) == (2, True)
+        assert calendar.get_active_maturities(blockTime, 2) == [tRef + QUARTER, tRef + 2 * QUARTER]
+
+def test_bit_num_from_maturity():
+    blockTime = FORK_BLOCK_TIME
+    blockTimeUTC0 = date_time.get_time_utc0(blockTime)
+    assert date_time.get_bit_num_from_maturity(blockTime, blockTimeUTC0 + 90 * DAY) == (90, True)
+    assert date_time.get_bit_num_from_maturity(blockTime, blockTimeUTC0 + 90 * DAY + 1) == (0, False)
+    assert date_time.get_bit_num_from_maturity(blockTime, blockTimeUTC0) == (0, False)
+    assert date_time.get_bit_num_from_maturity(blockTime, blockTimeUTC0 + 7651 * DAY) == (256, False)
+    assert not date_time.is_valid_maturity(1, blockTimeUTC0 + 2 * QUARTER + DAY, blockTime)
+
+    with pytest.raises(ValueError):
+        date_time.get_traded_market(8)
+    with pytest.raises(ValueError):
+        date_time.get_market_index(2, date_time.get_reference_time(blockTime) + 3 * QUARTER, blockTime)
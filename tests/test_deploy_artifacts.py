@@ -0,0 +1,57 @@
+import json
+import os
+import rlp
+from eth_utils import keccak
+from brownie import ZERO_ADDRESS
+from scripts.deploy_artifacts import ArtifactCache, deployArtifacts
+
+LIB_MARKER = "__$" + "a" * 34 + "$__"
+LIB_ADDRESS = "0x" + "12" * 20
+
+def write_artifact(path, bytecode):
+    with open(path, "w") as f:
+        json.dump({"abi": [], "bytecode": bytecode, "ast": {"nodes": ["x"] * 1000}}, f)
+
+def test_links_library_addresses(tmp_path):
+    path = str(tmp_path / "Artifact.json")
+    write_artifact(path, "0x6000" + LIB_MARKER + "6001" + LIB_MARKER)
+    cache = ArtifactCache(str(tmp_path / "cache"))
+
+    (artifact, code) = cache.link(path, {LIB_MARKER.strip("_"): LIB_ADDRESS})
+    assert artifact.dependencies == (LIB_MARKER,)
+    assert code == "0x6000" + "12" * 20 + "6001" + "12" * 20
+    # Same artifact and libraries are served from memory
+    assert cache.link(path, {LIB_MARKER.strip("_"): LIB_ADDRESS})[1] is code
+
+    (_, otherCode) = cache.link(path, {LIB_MARKER.strip("_"): "0x" + "34" * 20})
+    assert otherCode == "0x6000" + "34" * 20 + "6001" + "34" * 20
+
+def test_compact_artifact_on_disk(tmp_path):
+    path = str(tmp_path / "Artifact.json")
+    write_artifact(path, "0x6000")
+    assert ArtifactCache(str(tmp_path / "cache")).link(path)[1] == "0x6000"
+
+    cached = [f for f in os.listdir(tmp_path / "cache") if f.endswith(".artifact.json")]
+    assert len(cached) == 1
+    assert json.load(open(tmp_path / "cache" / cached[0])) == {"abi": [], "bytecode": "0x6000"}
+
+    # Changing the artifact changes its hash
+    write_artifact(path, "0x6001")
+    assert ArtifactCache(str(tmp_path / "cache")).link(path)[1] == "0x6001"
+
+def create_address(sender, nonce):
+    return "0x" + keccak(rlp.encode([bytes.fromhex(sender[2:]), nonce]))[12:].hex()
+
+def test_deploy_artifacts_in_input_order(env, accounts):
+    deployer = accounts[0]
+    governance = [accounts[i].address for i in range(1, 4)]
+    nonce = deployer.nonce
+    routers = deployArtifacts(
+        [("scripts/artifacts/Router.json", [[g] + [ZERO_ADDRESS] * 13], "Router", None) for g in governance],
+        deployer
+    )
+
+    assert [r.GOVERNANCE() for r in routers] == governance
+    # Each deployment took the next nonce of the deployer, in input order
+    assert [r.address.lower() for r in routers] == [create_address(deployer.address, nonce + i) for i in range(3)]
+    assert deployer.nonce == nonce + 3
@@ -0,0 +1,56 @@
+import pytest
+from scripts.flags import (
+    encode_flags,
+    decode_flags,
+    decode_flags_many,
+    decode_token_permissions,
+    decode_token_permissions_many,
+    VaultFlags,
+    LegacyVaultFlags,
+    DexFlags,
+    TradeTypeFlags
+)
+
+def test_encode_vault_flags():
+    assert encode_flags(VaultFlags, 0, ENABLED=True, ALLOW_ROLL_POSITION=True) == 0b11
+    assert encode_flags(VaultFlags, 0, TRANSFER_SHARES_ON_DELEVERAGE=True) == 1 << 7
+    assert encode_flags(VaultFlags, 0, ALLOW_REENTRANCY=True) == 1 << 8
+    assert encode_flags(LegacyVaultFlags, 0, ALLOW_REENTRANCY=True) == 1 << 7
+
+def test_encode_keeps_existing_flags():
+    flags = encode_flags(VaultFlags, 0, ENABLED=True)
+    assert encode_flags(VaultFlags, flags, ONLY_VAULT_SETTLE=True) == 1 | 1 << 6
+    assert encode_flags(VaultFlags, flags, ONLY_VAULT_SETTLE=False) == 1
+
+def test_encode_unknown_flag_reverts():
+    with pytest.raises(ValueError):
+        encode_flags(VaultFlags, 0, ALLOW_REENTRNACY=True)
+    with pytest.raises(ValueError):
+        encode_flags(DexFlags, 0, UNUSED=True)
+
+def test_dex_and_trade_type_flags():
+    assert encode_flags(DexFlags, 0, UNISWAP_V2=True, CURVE=True) == (1 << 1) | (1 << 5)
+    assert encode_flags(TradeTypeFlags, 0, EXACT_IN_SINGLE=True, EXACT_IN_BATCH=True) == 0b101
+
+def test_decode_flags():
+    assert decode_flags(VaultFlags, 0) == ()
+    assert decode_flags(VaultFlags, 1 | 1 << 8) == ("ENABLED", "ALLOW_REENTRANCY")
+    assert decode_flags(DexFlags, (1 << 2) | (1 << 0)) == ("UNISWAP_V3",)
+    assert decode_flags_many(TradeTypeFlags, [1, 2, 3]) == [
+        ("EXACT_IN_SINGLE",), ("EXACT_OUT_SINGLE",), ("EXACT_IN_SINGLE", "EXACT_OUT_SINGLE")
+    ]
+
+def test_round_trip():
+    for value in range(1 << 9):
+        assert encode_flags(VaultFlags, 0, **{name: True for name in decode_flags(VaultFlags, value)}) == value
+
+def test_decode_token_permissions():
+    permissions = decode_token_permissions((True, 1 << 2, 0b101))
+    assert permissions.allowSell
+    assert permissions.dexFlags == DexFlags.UNISWAP_V3
+    assert TradeTypeFlags.EXACT_IN_BATCH in permissions.tradeTypeFlags
+    assert TradeTypeFlags.EXACT_OUT_SINGLE not in permissions.tradeTypeFlags
+
+    decoded = decode_token_permissions_many([(False, 0, 0), (True, 1 << 2, 0b101)])
+    assert decoded[0] == (False, DexFlags(0), TradeTypeFlags(0))
+    assert decoded[1] is permissions
@@ -0,0 +1,20 @@
+from tests.fixtures import *
+from scripts.date_time import get_active_maturities
+from scripts.multicall import Multicall
+
+chain = Chain()
+
+def test_multicall_matches_direct_calls(env, accounts):
+    multicall = Multicall(batchSize=3)
+    maturities = get_active_maturities(chain.time(), 3)
+    calls = [(env.notional.getActiveMarkets, (2,))]
+    calls += [(env.tokens["DAI"].balanceOf, (account,)) for account in accounts[:5]]
+    calls += [(env.notional.getPresentfCashValue, (2, maturity, 100e8, chain.time(), False)) for maturity in maturities]
+    for (method, args) in calls:
+        multicall.add(method, *args)
+
+    results = multicall.execute()
+    assert len(results) == len(calls)
+    for ((method, args), result) in zip(calls, results):
+        assert result == method(*args)
+    assert multicall.execute() == []
@@ -0,0 +1,26 @@
+from brownie import ZERO_ADDRESS
+from tests.fixtures import *
+from scripts.common import TRADE_TYPE
+from scripts.trading.oracle_limits import OracleLimitCalculator
+
+def test_limit_amounts_match_trading_module(env):
+    calculator = OracleLimitCalculator.from_environment(env)
+    pairs = [
+        (ZERO_ADDRESS, env.tokens["USDC"].address),
+        (env.tokens["BAL"].address, env.tokens["WETH"].address),
+        (env.tokens["DAI"].address, env.tokens["USDC"].address),
+        (env.tokens["stETH"].address, ZERO_ADDRESS)
+    ]
+    trades = [
+        (sellToken, buyToken, amount, slippage, tradeType)
+        for (sellToken, buyToken) in pairs
+        for amount in [1, 10**6, 5 * 10**18]
+        for slippage in [0, 5 * 10**6, 10**8]
+        for tradeType in TRADE_TYPE.values()
+    ]
+
+    limits = calculator.get_limit_amounts(trades)
+    for ((sellToken, buyToken, amount, slippage, tradeType), limit) in zip(trades, limits):
+        assert limit == env.tradingModule.getLimitAmount(tradeType, sellToken, buyToken, amount, slippage)
+    for (baseToken, quoteToken) in pairs:
+        assert calculator.get_oracle_price(baseToken, quoteToken) == env.tradingModule.getOraclePrice(baseToken, quoteToken)
@@ -0,0 +1,69 @@
+from scripts.rpc_cache import FORK_BLOCK, RpcCache
+
+FORK_BLOCK_HEX = hex(FORK_BLOCK)
+
+class FakeUpstream:
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, requests):
+        self.requests.extend(requests)
+        return [{"jsonrpc": "2.0", "id": r["id"], "result": "0x{:x}".format(len(self.requests))} for r in requests]
+
+def get_cache(path):
+    cache = RpcCache(str(path))
+    cache.forward = FakeUpstream()
+    return cache
+
+def test_caches_reads_at_fork_block(tmp_path):
+    requests = [
+        {"jsonrpc": "2.0", "id": 1, "method": "eth_getStorageAt", "params": ["0xAbC", "0x0", FORK_BLOCK_HEX]},
+        {"jsonrpc": "2.0", "id": 2, "method": "eth_getCode", "params": ["0xabc", FORK_BLOCK_HEX]},
+        {"jsonrpc": "2.0", "id": 3, "method": "eth_call", "params": [{"to": "0xabc", "data": "0x01"}, FORK_BLOCK_HEX]},
+    ]
+    cache = get_cache(tmp_path / "cache.sqlite")
+    results = [r["result"] for r in cache.handle(requests)]
+    assert len(cache.forward.requests) == 3
+
+    # A new process is served from disk, addresses are matched case insensitively
+    cache = get_cache(tmp_path / "cache.sqlite")
+    requests[1]["params"][0] = "0xABC"
+    assert [r["result"] for r in cache.handle(requests)] == results
+    assert [r["id"] for r in cache.handle(requests)] == [1, 2, 3]
+    assert cache.forward.requests == []
+    assert cache.hits == 6
+
+def test_does_not_cache_mutable_reads(tmp_path):
+    cache = get_cache(tmp_path / "cache.sqlite")
+    requests = [
+        {"jsonrpc": "2.0", "id": 1, "method": "eth_getBalance", "params": ["0xabc", "latest"]},
+        {"jsonrpc": "2.0", "id": 2, "method": "eth_getBalance", "params": ["0xabc", hex(FORK_BLOCK + 1)]},
+        {"jsonrpc": "2.0", "id": 3, "method": "eth_sendRawTransaction", "params": ["0x00"]},
+    ]
+    cache.handle(requests)
+    cache.handle(requests)
+    assert len(cache.forward.requests) == 6
+    assert cache.hits == 0
+
+def test_offline_miss_returns_error(tmp_path):
+    cache = RpcCache(str(tmp_path / "cache.sqlite"))
+    (response,) = cache.handle([{"jsonrpc": "2.0", "id": 7, "method": "eth_getCode", "params": ["0xabc", FORK_BLOCK_HEX]}])
+    assert response["id"] == 7 and "error" in response
+
+def test_upstream_errors_are_returned_per_request(tmp_path):
+    cache = RpcCache(str(tmp_path / "cache.sqlite"))
+    requests = [
+        {"jsonrpc": "2.0", "id": 1, "method": "eth_getCode", "params": ["0xabc", FORK_BLOCK_HEX]},
+        {"jsonrpc": "2.0", "id": 2, "method": "eth_getCode", "params": ["0xdef", FORK_BLOCK_HEX]},
+    ]
+    cache.forward = lambda requests: {"jsonrpc": "2.0", "id": None, "error": {"code": 429, "message": "rate limited"}}
+    assert cache.handle(requests) == [
+        {"jsonrpc": "2.0", "id": 1, "error": {"code": 429, "message": "rate limited"}},
+        {"jsonrpc": "2.0", "id": 2, "error": {"code": 429, "message": "rate limited"}},
+    ]
+
+    # A request left out of the upstream batch gets an error instead of null
+    cache.forward = lambda requests: [{"jsonrpc": "2.0", "id": 2, "result": "0x"}]
+    (missing, answered) = cache.handle(requests)
+    assert missing["id"] == 1 and "error" in missing
+    assert answered["result"] == "0x"
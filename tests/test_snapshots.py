@@ -0,0 +1,19 @@
+from tests.fixtures import *
+from tests.snapshots import take_snapshot, revert_to_snapshot
+
+chain = Chain()
+
+def test_revert_to_snapshot(env, accounts):
+    balance = accounts[1].balance()
+    height = chain.height
+    snapshotId = take_snapshot()
+    accounts[0].transfer(accounts[1], 1)
+
+    snapshotId = revert_to_snapshot(snapshotId)
+    assert accounts[1].balance() == balance
+    assert chain.height == height
+
+    # The returned snapshot can be reverted to again
+    accounts[0].transfer(accounts[1], 1)
+    revert_to_snapshot(snapshotId)
+    assert accounts[1].balance() == balance
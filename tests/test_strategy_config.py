@@ -0,0 +1,99 @@
+import eth_abi
+import pytest
+from eth_utils import function_signature_to_4byte_selector
+from scripts.common import get_updated_vault_settings
+from scripts.balancer.strategy_config import (
+    BalancerStrategyConfig,
+    VaultSettings,
+    encode_settings_calldata_many,
+    SETTINGS_TYPE
+)
+
+SETTINGS = {
+    "maxUnderlyingSurplus": 20e18,
+    "settlementSlippageLimitPercent": 0.15e6,
+    "postMaturitySettlementSlippageLimitPercent": 0.4e6,
+    "emergencySettlementSlippageLimitPercent": 0.3e6,
+    "maxRewardTradeSlippageLimitPercent": 2e6,
+    "maxBalancerPoolShare": 1.5e3,
+    "settlementCoolDownInMinutes": 20,
+    "oraclePriceDeviationLimitPercent": 200,
+    "balancerPoolSlippageLimitPercent": 9975,
+}
+SETTINGS_LIST = [20 * 10**18, 150_000, 400_000, 300_000, 2 * 10**6, 1500, 20, 200, 9975]
+
+def get_config(**kwargs):
+    return BalancerStrategyConfig(**dict({
+        "name": "Balancer Stable ETH-stETH Strategy",
+        "primaryCurrency": 1,
+        "poolId": "0x32296969ef14eb0c6d29669c550d4a0449130230000200000000000000000080",
+        "liquidityGauge": "0xcd4722b7c24c29e0413bdcd9e51404b4539d14ae",
+        "auraRewardPool": "0xdcee1c640cc270121faf145f231fd8ff1d8d5cd4",
+        "settlementWindow": 172800,
+        "vaultConfig": [0, 1, 1, 2000, 0, 104, 20, 3, 4000, [0, 0], 30000],
+        "maxPrimaryBorrowCapacity": 100_000_000e8,
+        "settings": VaultSettings(**SETTINGS),
+    }, **kwargs))
+
+def test_settings_are_validated_once():
+    settings = VaultSettings(**SETTINGS)
+    assert settings.as_list() == SETTINGS_LIST
+    assert all(type(value) is int for value in settings.as_list())
+    with pytest.raises(AttributeError):
+        settings.maxBalancerPoolShare = 0
+    with pytest.raises(AttributeError):
+        settings.extra = 0
+
+    with pytest.raises(ValueError):
+        VaultSettings(**dict(SETTINGS, maxBalancerPoolShare=1e4 + 1))
+    with pytest.raises(ValueError):
+        VaultSettings(**dict(SETTINGS, settlementSlippageLimitPercent=1e8 + 1))
+    with pytest.raises(ValueError):
+        VaultSettings(**dict(SETTINGS, settlementCoolDownInMinutes=24 * 60 + 1))
+    with pytest.raises(ValueError):
+        VaultSettings(**dict(SETTINGS, balancerPoolSlippageLimitPercent=2**16))
+    with pytest.raises(ValueError):
+        VaultSettings(**dict(SETTINGS, maxUnderlyingSurplus=-1))
+    with pytest.raises(ValueError):
+        VaultSettings(**dict(SETTINGS, maxUnderlyingSurplus=0.5))
+    with pytest.raises(ValueError):
+        VaultSettings(**dict(SETTINGS, oracleWindowInSeconds=0))
+
+def test_replace_returns_new_settings():
+    settings = VaultSettings(**SETTINGS)
+    updated = settings.replace(maxBalancerPoolShare=0)
+    assert settings.maxBalancerPoolShare == 1500
+    assert updated.as_list() == SETTINGS_LIST[:5] + [0] + SETTINGS_LIST[6:]
+    assert VaultSettings.from_struct(updated.as_dict()) == updated
+    assert get_updated_vault_settings(settings.as_dict(), maxUnderlyingSurplus=0) == [0] + SETTINGS_LIST[1:]
+
+def test_settings_calldata_matches_encode_abi():
+    settings = VaultSettings(**SETTINGS)
+    selector = function_signature_to_4byte_selector("setStrategyVaultSettings({})".format(SETTINGS_TYPE))
+    assert settings.calldata() == selector + eth_abi.encode_abi([SETTINGS_TYPE], [SETTINGS_LIST])
+    assert settings.encode() is settings.encode()
+
+    fleet = [settings.replace(maxUnderlyingSurplus=i) for i in range(50)] + [settings]
+    assert encode_settings_calldata_many(fleet) == [s.calldata() for s in fleet]
+
+def test_config_init_params():
+    config = get_config()
+    assert config.init_params() == ["Balancer Stable ETH-stETH Strategy", 1, SETTINGS_LIST]
+    assert config.deployment_params("0x01") == [
+        config.auraRewardPool, [1, config.poolId, config.liquidityGauge, "0x01", 172800]
+    ]
+
+    initType = "(string,uint16,{})".format(SETTINGS_TYPE)
+    selector = function_signature_to_4byte_selector("initialize({})".format(initType))
+    assert config.initialize_calldata() == selector + eth_abi.encode_abi([initType], [config.init_params()])
+    assert config.initialize_calldata() is config.initialize_calldata()
+
+    updated = config.replace(maxBalancerPoolShare=0, settlementWindow=3600)
+    assert updated.settings.maxBalancerPoolShare == 0
+    assert updated.settlementWindow == 3600
+    assert config.settings.maxBalancerPoolShare == 1500
+
+    with pytest.raises(ValueError):
+        get_config(primaryCurrency=2**16)
+    with pytest.raises(ValueError):
+        get_config(settings=dict(SETTINGS, maxBalancerPoolShare=2e4))
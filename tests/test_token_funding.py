@@ -0,0 +1,36 @@
+import json
+from tests.fixtures import *
+from scripts.token_funding import TokenFunder
+
+chain = Chain()
+
+def test_fund_accounts_without_transactions(env, accounts):
+    funded = [accounts[1], accounts[2]]
+    amounts = {"USDC": 100e6, "DAI": 5e18, "WETH": 1e18, "ETH": 2e18}
+    before = [
+        (env.tokens["USDC"].balanceOf(a), env.tokens["DAI"].balanceOf(a), env.tokens["WETH"].balanceOf(a), a.balance())
+        for a in funded
+    ]
+    height = chain.height
+
+    env.fundAccounts(funded, amounts)
+    assert chain.height == height
+    for (a, (usdc, dai, weth, eth)) in zip(funded, before):
+        assert env.tokens["USDC"].balanceOf(a) == usdc + 100e6
+        assert env.tokens["DAI"].balanceOf(a) == dai + 5e18
+        assert env.tokens["WETH"].balanceOf(a) == weth + 1e18
+        assert a.balance() == eth + 2e18
+
+    # Funded balances can be spent
+    env.tokens["USDC"].transfer(accounts[3], 100e6, {"from": accounts[1]})
+    assert env.tokens["USDC"].balanceOf(accounts[3]) >= 100e6
+
+def test_balance_slots_are_cached(env, tmp_path):
+    cachePath = str(tmp_path / "slots.json")
+    funder = TokenFunder(cachePath)
+    assert funder.find_balance_slot(env.tokens["WETH"].address) == (3, False)
+    assert funder.find_balance_slot(env.tokens["DAI"].address) == (2, False)
+
+    slots = json.load(open(cachePath))
+    assert slots[env.tokens["WETH"].address.lower()] == {"slot": 3, "vyper": False}
+    assert TokenFunder(cachePath).find_balance_slot(env.tokens["DAI"].address) == (2, False)
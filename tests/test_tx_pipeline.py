@@ -0,0 +1,138 @@
+import pytest
+from scripts.tx_pipeline import TxPipeline
+
+class FakeTxn:
+    def __init__(self, chain, sender, nonce, status=1):
+        self.chain = chain
+        self.txid = "0x{:02x}".format(nonce)
+        self.sender = sender
+        self.nonce = nonce
+        self.status = status
+        self.revert_msg = None if status == 1 else "reverted"
+        self.contract_address = "0x{:040x}".format(len(chain.sent))
+
+    def wait(self, confs):
+        self.chain.mined.append(self)
+
+class FakeSender:
+    def __init__(self, address, nonce, chain=None):
+        self.address = address
+        self.nonce = nonce
+        self.chain = chain
+
+    def transfer(self, to, amount, data, nonce, required_confs):
+        return self.chain.method("transfer")(to, amount, data, {"from": self, "nonce": nonce, "required_confs": required_confs})
+
+class FakeChain:
+    def __init__(self):
+        self.sent = []
+        self.mined = []
+
+    def method(self, name, status=1):
+        def send(*args):
+            (tx,) = args[-1:]
+            txn = FakeTxn(self, tx["from"], tx["nonce"], status)
+            txn.call = (name, args[:-1])
+            # Nothing is mined until the pipeline collects the receipts
+            assert tx["required_confs"] == 0
+            self.sent.append(txn)
+            return txn
+        return send
+
+class FakePipeline(TxPipeline):
+    def chain_nonce(self, sender):
+        # FakeSender.nonce stands for the pending transaction count
+        return sender.nonce
+
+class FakeContainer:
+    def __init__(self, chain):
+        self.deploy = chain.method("deploy")
+
+    def at(self, address):
+        return ("contract", address)
+
+def test_independent_transactions_are_sent_back_to_back():
+    chain = FakeChain()
+    pipeline = FakePipeline()
+    (alice, bob) = (FakeSender("alice", 5), FakeSender("bob", 0))
+    for i in range(3):
+        pipeline.transact(chain.method("set"), i, sender=alice)
+    pipeline.transact(chain.method("set"), 3, sender=bob)
+    results = pipeline.run()
+
+    assert [txn.nonce for txn in chain.sent] == [5, 6, 7, 0]
+    assert results == chain.sent
+    # Nonces keep incrementing locally between runs
+    pipeline.transact(chain.method("set"), 4, sender=alice)
+    pipeline.run()
+    assert chain.sent[-1].nonce == 8
+
+def test_dependencies_wait_for_receipts():
+    chain = FakeChain()
+    pipeline = FakePipeline()
+    deployer = FakeSender("deployer", 0)
+    impl = pipeline.deploy(FakeContainer(chain), sender=deployer)
+    proxy = pipeline.deploy(FakeContainer(chain), impl, b"", sender=deployer)
+    other = pipeline.transact(chain.method("set"), 1, sender=deployer)
+    after = pipeline.transact(chain.method("set"), 2, sender=deployer, after=[other])
+    results = pipeline.run()
+
+    # impl and other are sent before any receipt is collected
+    assert [txn.call[0] for txn in chain.sent] == ["deploy", "set", "deploy", "set"]
+    assert chain.sent[2].call[1] == (impl.result, b"")
+    assert impl.result == ("contract", chain.sent[0].contract_address)
+    assert results == [impl.result, proxy.result, other.result, after.result]
+
+def test_transfer_sends_data():
+    chain = FakeChain()
+    pipeline = FakePipeline()
+    deployer = FakeSender("deployer", 2, chain)
+    for i in range(3):
+        pipeline.transfer(None, "0x600{}".format(i), sender=deployer)
+    results = pipeline.run()
+
+    assert [txn.nonce for txn in chain.sent] == [2, 3, 4]
+    assert [txn.call[1] for txn in chain.sent] == [(None, 0, "0x600{}".format(i)) for i in range(3)]
+    assert results == chain.sent
+
+def test_revert_raises():
+    chain = FakeChain()
+    pipeline = FakePipeline()
+    pipeline.transact(chain.method("set", status=0), sender=FakeSender("alice", 0))
+    with pytest.raises(ValueError):
+        pipeline.run()
+
+def test_failed_send_keeps_nonce():
+    def fail(tx):
+        raise ValueError("gas estimation failed")
+
+    chain = FakeChain()
+    pipeline = FakePipeline()
+    alice = FakeSender("alice", 3)
+    pipeline.transact(chain.method("set"), sender=alice)
+    pipeline.transact(fail, sender=alice)
+    with pytest.raises(ValueError):
+        pipeline.run()
+    # Transactions sent before the failure are still collected
+    assert chain.mined == chain.sent
+
+    # Mined and pending transactions are not re-read from the chain, the unused nonce
+    # goes to the next send
+    alice.nonce = 0
+    pipeline.transact(chain.method("set"), sender=alice)
+    pipeline.run()
+    assert [txn.nonce for txn in chain.sent] == [3, 4]
+
+def test_revert_before_failed_send_is_reported():
+    def fail(tx):
+        raise KeyError("send failed")
+
+    chain = FakeChain()
+    pipeline = FakePipeline()
+    pipeline.transact(chain.method("set", status=0), sender=FakeSender("alice", 0))
+    pipeline.transact(chain.method("set"), sender=FakeSender("bob", 0))
+    pipeline.transact(fail, sender=FakeSender("carol", 0))
+    with pytest.raises(ValueError) as e:
+        pipeline.run()
+    assert isinstance(e.value.__context__, KeyError)
+    assert len(chain.mined) == 2
@@ -0,0 +1,44 @@
+from tests.fixtures import *
+from scripts.view_cache import ViewCache, CachedCall
+
+chain = Chain()
+
+def test_view_calls_are_cached_per_block(env, accounts):
+    cache = ViewCache()
+    notional = cache.wrap(Contract.from_abi("Notional", env.notional.address, env.notional.abi))
+    dai = cache.wrap(Contract.from_abi("DAI", env.tokens["DAI"].address, env.tokens["DAI"].abi))
+
+    assert notional.getCurrencyAndRates(2) == env.notional.getCurrencyAndRates(2)
+    assert notional.getCurrencyAndRates(2) == env.notional.getCurrencyAndRates(2)
+    notional.getCurrencyAndRates(3)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # A mined transaction invalidates the cache
+    balance = dai.balanceOf(accounts[0])
+    env.tokens["DAI"].transfer(accounts[0], 100e18, {"from": env.whales["DAI_EOA"]})
+    assert dai.balanceOf(accounts[0]) == balance + 100e18
+    assert (cache.hits, cache.misses) == (1, 4)
+
+    # So does a revert, even if the block number does not change
+    notional.getCurrencyAndRates(2)
+    notional.getCurrencyAndRates(2)
+    assert (cache.hits, cache.misses) == (2, 5)
+    chain.revert()
+    assert dai.balanceOf(accounts[0]) == balance
+    notional.getCurrencyAndRates(2)
+    assert (cache.hits, cache.misses) == (2, 7)
+
+def test_explicit_block_is_not_cached(env):
+    cache = ViewCache()
+    notional = cache.wrap(Contract.from_abi("Notional", env.notional.address, env.notional.abi))
+    notional.getCurrencyAndRates(2, block_identifier=chain.height)
+    assert (cache.hits, cache.misses) == (0, 0)
+
+def test_override_is_not_cached():
+    calls = []
+    cache = ViewCache()
+    method = CachedCall(cache, lambda *args, **kwargs: calls.append((args, kwargs)))
+    override = {"0x" + "11" * 20: {"balance": hex(10**18)}}
+    method(2, override=override)
+    assert calls == [((2,), {"block_identifier": None, "override": override})]
+    assert (cache.hits, cache.misses) == (0, 0)
@@ -1,10 +1,9 @@
 import pytest
 import brownie
-from brownie import Wei, ZERO_ADDRESS, accounts, network, MockVault
+from brownie import Wei, ZERO_ADDRESS, accounts, MockVault
 from brownie.convert import to_bytes
 from brownie.network.state import Chain
 from scripts.common import DEX_ID, set_dex_flags, set_trade_type_flags
-from scripts.EnvironmentConfig import getEnvironment
 from tests.trading.helpers import balancer_trade_exact_in_single, balancer_trade_exact_in_batch
 
 chain = Chain()
@@ -15,11 +14,10 @@ def run_around_tests():
     yield
     chain.revert()
 
-def test_wstETH_to_WETH_exact_in_dynamic_slippage():
-    env = getEnvironment(network.show_active())
+def test_wstETH_to_WETH_exact_in_dynamic_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
-    env.tokens["wstETH"].transfer(mockVault, 1e18, {"from": env.whales["wstETH"]})
+    env.fundAccounts([mockVault], {"wstETH": 1e18})
 
     trade = balancer_trade_exact_in_single(
         env.tokens["wstETH"].address, 
@@ -47,11 +45,10 @@ def test_wstETH_to_WETH_exact_in_dynamic_slippage():
     assert ret.return_value[0] == wstETHBefore - env.tokens["wstETH"].balanceOf(mockVault)
     assert ret.return_value[1] == env.tokens["WETH"].balanceOf(mockVault) - wethBefore
 
-def test_wstETH_to_ETH_exact_in_dynamic_slippage():
-    env = getEnvironment(network.show_active())
+def test_wstETH_to_ETH_exact_in_dynamic_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
-    env.tokens["wstETH"].transfer(mockVault, 1e18, {"from": env.whales["wstETH"]})
+    env.fundAccounts([mockVault], {"wstETH": 1e18})
 
     trade = balancer_trade_exact_in_single(
         env.tokens["wstETH"].address, 
@@ -79,11 +76,10 @@ def test_wstETH_to_ETH_exact_in_dynamic_slippage():
     assert ret.return_value[0] == wstETHBefore - env.tokens["wstETH"].balanceOf(mockVault)
     assert ret.return_value[1] == mockVault.balance() - ethBefore
 
-def test_WETH_to_wstETH_exact_in_dynamic_slippage():
-    env = getEnvironment(network.show_active())
+def test_WETH_to_wstETH_exact_in_dynamic_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
-    env.tokens["WETH"].transfer(mockVault, 1e18, {"from": env.whales["WETH"]})
+    env.fundAccounts([mockVault], {"WETH": 1e18})
 
     trade = balancer_trade_exact_in_single(
         env.tokens["WETH"].address, 
@@ -111,11 +107,10 @@ def test_WETH_to_wstETH_exact_in_dynamic_slippage():
     assert ret.return_value[0] == wethBefore - env.tokens["WETH"].balanceOf(mockVault)
     assert ret.return_value[1] == env.tokens["wstETH"].balanceOf(mockVault) - wstETHBefore
 
-def test_ETH_to_wstETH_exact_in_dynamic_slippage():
-    env = getEnvironment(network.show_active())
+def test_ETH_to_wstETH_exact_in_dynamic_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
-    env.whales["ETH_EOA"].transfer(mockVault, 1e18)
+    env.fundAccounts([mockVault], {"ETH": 1e18})
 
     trade = balancer_trade_exact_in_single(
         ZERO_ADDRESS, 
@@ -143,11 +138,10 @@ def test_ETH_to_wstETH_exact_in_dynamic_slippage():
     assert ret.return_value[0] == ethBefore - mockVault.balance()
     assert ret.return_value[1] == env.tokens["wstETH"].balanceOf(mockVault) - wstETHBefore
 
-def test_wstETH_to_WETH_to_DAI_exact_in_dynamic_slippage():
-    env = getEnvironment(network.show_active())
+def test_wstETH_to_WETH_to_DAI_exact_in_dynamic_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
-    env.tokens["wstETH"].transfer(mockVault, 1e18, {"from": env.whales["wstETH"]})
+    env.fundAccounts([mockVault], {"wstETH": 1e18})
 
     sellAmount = env.tokens["wstETH"].balanceOf(mockVault)
     trade = balancer_trade_exact_in_batch(
@@ -193,11 +187,10 @@ def test_wstETH_to_WETH_to_DAI_exact_in_dynamic_slippage():
     assert ret.return_value[0] == wstETHBefore - env.tokens["wstETH"].balanceOf(mockVault)
     assert ret.return_value[1] == env.tokens["DAI"].balanceOf(mockVault) - daiBefore
 
-def test_wstETH_to_WETH_exact_in_static_slippage():
-    env = getEnvironment(network.show_active())
+def test_wstETH_to_WETH_exact_in_static_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
-    env.tokens["wstETH"].transfer(mockVault, 1e18, {"from": env.whales["wstETH"]})
+    env.fundAccounts([mockVault], {"wstETH": 1e18})
 
     trade = balancer_trade_exact_in_single(
         env.tokens["wstETH"].address, 
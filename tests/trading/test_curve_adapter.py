@@ -2,10 +2,9 @@
 import pytest
 import brownie
 import eth_abi
-from brownie import Wei, accounts, network, interface, MockVault
+from brownie import Wei, accounts, interface, MockVault
 from brownie.network.state import Chain
 from scripts.common import DEX_ID, TRADE_TYPE, set_dex_flags, set_trade_type_flags
-from scripts.EnvironmentConfig import getEnvironment
 
 chain = Chain()
 
@@ -38,8 +37,7 @@ def curve_trade_exact_in_batch(sellToken, buyToken, amount):
         )
     ]
 
-def test_stETH_to_weth_exact_in_dynamic_slippage():
-    env = getEnvironment(network.show_active())
+def test_stETH_to_weth_exact_in_dynamic_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
     env.tokens["stETH"].transfer(mockVault, 1e18, {"from": env.whales["stETH"]})
@@ -66,11 +64,10 @@ def test_stETH_to_weth_exact_in_dynamic_slippage():
     assert ret.return_value[0] == stETHBefore - env.tokens["stETH"].balanceOf(mockVault)
     assert ret.return_value[1] == env.tokens["WETH"].balanceOf(mockVault) - wethBefore
 
-def test_weth_to_stETH_exact_in_dynamic_slippage():
-    env = getEnvironment(network.show_active())
+def test_weth_to_stETH_exact_in_dynamic_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
-    env.tokens["WETH"].transfer(mockVault, 1e18, {"from": env.whales["WETH"]})
+    env.fundAccounts([mockVault], {"WETH": 1e18})
 
     trade = curve_trade_exact_in_single(
         env.tokens["WETH"].address, env.tokens["stETH"].address, env.tokens["WETH"].balanceOf(mockVault), 0
@@ -94,8 +91,7 @@ def test_weth_to_stETH_exact_in_dynamic_slippage():
     assert ret.return_value[0] == wethBefore - env.tokens["WETH"].balanceOf(mockVault)
     assert ret.return_value[1] == env.tokens["stETH"].balanceOf(mockVault) - stETHBefore
 
-def test_stETH_to_ETH_to_DAI_exact_in_dynamic_slippage():
-    env = getEnvironment(network.show_active())
+def test_stETH_to_ETH_to_DAI_exact_in_dynamic_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
     env.tokens["stETH"].transfer(mockVault, 1e18, {"from": env.whales["stETH"]})
@@ -122,8 +118,7 @@ def test_stETH_to_ETH_to_DAI_exact_in_dynamic_slippage():
     assert ret.return_value[0] == stETHBefore - env.tokens["stETH"].balanceOf(mockVault)
     assert ret.return_value[1] == env.tokens["DAI"].balanceOf(mockVault) - daiBefore
 
-def test_stETH_to_weth_exact_in_static_slippage():
-    env = getEnvironment(network.show_active())
+def test_stETH_to_weth_exact_in_static_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
     env.tokens["stETH"].transfer(mockVault, 1e18, {"from": env.whales["stETH"]})
@@ -0,0 +1,33 @@
+from brownie import accounts
+from brownie.network.state import Chain
+from scripts.flags import DexFlags, TradeTypeFlags
+from scripts.trading.permissions import PermissionMatrix, get_token_permissions
+
+chain = Chain()
+
+def test_declared_permissions_encode_flags():
+    permissions = get_token_permissions(True, ["BALANCER_V2", "CURVE"], ["EXACT_IN_SINGLE"])
+    assert permissions == (True, DexFlags.BALANCER_V2 | DexFlags.CURVE, TradeTypeFlags.EXACT_IN_SINGLE)
+    assert get_token_permissions(False) == (False, 0, 0)
+
+def test_apply_only_sends_changes(env):
+    vaults = [accounts[5].address, accounts[6].address]
+    (usdc, dai) = (env.tokens["USDC"].address, env.tokens["DAI"].address)
+    matrix = PermissionMatrix(env.tradingModule).add(
+        vaults, [usdc, dai], dexes=["UNISWAP_V3"], tradeTypes=["EXACT_IN_SINGLE", "EXACT_IN_BATCH"]
+    )
+    assert len(matrix.diff()) == 4
+
+    height = chain.height
+    assert len(matrix.apply(env.owner)) == 4
+    assert chain.height == height + 4
+    assert env.tradingModule.tokenWhitelist(vaults[0], usdc) == (True, 1 << 2, (1 << 0) | (1 << 2))
+    assert matrix.diff() == []
+
+    # Nothing is sent when the chain already matches the table
+    assert matrix.apply(env.owner) == []
+    assert chain.height == height + 4
+
+    matrix.add([vaults[1]], [dai], dexes=["CURVE"], tradeTypes=["EXACT_IN_SINGLE"])
+    assert [pair for (pair, _, _) in matrix.apply(env.owner)] == [(vaults[1], dai)]
+    assert env.tradingModule.tokenWhitelist(vaults[1], dai) == (True, 1 << 5, 1 << 0)
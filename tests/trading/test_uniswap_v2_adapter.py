@@ -1,10 +1,9 @@
 
 import pytest
 import brownie
-from brownie import Wei, ZERO_ADDRESS, accounts, network, MockVault
+from brownie import Wei, ZERO_ADDRESS, accounts, MockVault
 from brownie.network.state import Chain
 from scripts.common import DEX_ID, TRADE_TYPE, get_univ2_data, set_dex_flags, set_trade_type_flags
-from scripts.EnvironmentConfig import getEnvironment
 
 chain = Chain()
 
@@ -32,11 +31,10 @@ def univ2_trade_exact_in_single(env, sellToken, buyToken, amount, limit):
         get_univ2_data([pathSellToken, pathBuyToken])
     ]
 
-def test_USDC_to_WETH_exact_in_dynamic_slippage():
-    env = getEnvironment(network.show_active())
+def test_USDC_to_WETH_exact_in_dynamic_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
-    env.tokens["USDC"].transfer(mockVault, 100e6, {"from": env.whales["USDC"]})
+    env.fundAccounts([mockVault], {"USDC": 100e6})
 
     trade = univ2_trade_exact_in_single(
         env, env.tokens["USDC"].address, env.tokens["WETH"].address, env.tokens["USDC"].balanceOf(mockVault), 0
@@ -60,11 +58,10 @@ def test_USDC_to_WETH_exact_in_dynamic_slippage():
     assert ret.return_value[0] == usdcBefore - env.tokens["USDC"].balanceOf(mockVault)
     assert ret.return_value[1] == env.tokens["WETH"].balanceOf(mockVault) - wethBefore
 
-def test_USDC_to_ETH_exact_in_dynamic_slippage():
-    env = getEnvironment(network.show_active())
+def test_USDC_to_ETH_exact_in_dynamic_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
-    env.tokens["USDC"].transfer(mockVault, 100e6, {"from": env.whales["USDC"]})
+    env.fundAccounts([mockVault], {"USDC": 100e6})
 
     trade = univ2_trade_exact_in_single(
         env, env.tokens["USDC"].address, ZERO_ADDRESS, env.tokens["USDC"].balanceOf(mockVault), 0
@@ -88,11 +85,10 @@ def test_USDC_to_ETH_exact_in_dynamic_slippage():
     assert ret.return_value[0] == usdcBefore - env.tokens["USDC"].balanceOf(mockVault)
     assert ret.return_value[1] == mockVault.balance() - ethBefore
 
-def test_DAI_to_WETH_exact_in_dynamic_slippage():
-    env = getEnvironment(network.show_active())
+def test_DAI_to_WETH_exact_in_dynamic_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
-    env.tokens["DAI"].transfer(mockVault, 100e18, {"from": env.whales["DAI_EOA"]})
+    env.fundAccounts([mockVault], {"DAI": 100e18})
 
     trade = univ2_trade_exact_in_single(
         env, env.tokens["DAI"].address, env.tokens["WETH"].address, env.tokens["DAI"].balanceOf(mockVault), 0
@@ -116,11 +112,10 @@ def test_DAI_to_WETH_exact_in_dynamic_slippage():
     assert ret.return_value[0] == daiBefore - env.tokens["DAI"].balanceOf(mockVault)
     assert ret.return_value[1] == env.tokens["WETH"].balanceOf(mockVault) - wethBefore
 
-def test_WETH_to_USDC_exact_in_dynamic_slippage():
-    env = getEnvironment(network.show_active())
+def test_WETH_to_USDC_exact_in_dynamic_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
-    env.tokens["WETH"].transfer(mockVault, 1e18, {"from": env.whales["WETH"]})
+    env.fundAccounts([mockVault], {"WETH": 1e18})
 
     trade = univ2_trade_exact_in_single(
         env, env.tokens["WETH"].address, env.tokens["USDC"].address, env.tokens["WETH"].balanceOf(mockVault), 0
@@ -144,11 +139,10 @@ def test_WETH_to_USDC_exact_in_dynamic_slippage():
     assert ret.return_value[0] == wethBefore - env.tokens["WETH"].balanceOf(mockVault)
     assert ret.return_value[1] == env.tokens["USDC"].balanceOf(mockVault) - usdcBefore
 
-def test_ETH_to_USDC_exact_in_dynamic_slippage():
-    env = getEnvironment(network.show_active())
+def test_ETH_to_USDC_exact_in_dynamic_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
-    env.whales["ETH_EOA"].transfer(mockVault, 1e18)
+    env.fundAccounts([mockVault], {"ETH": 1e18})
 
     trade = univ2_trade_exact_in_single(
         env, ZERO_ADDRESS, env.tokens["USDC"].address, mockVault.balance(), 0
@@ -172,11 +166,10 @@ def test_ETH_to_USDC_exact_in_dynamic_slippage():
     assert ret.return_value[0] == ethBefore - mockVault.balance()
     assert ret.return_value[1] == env.tokens["USDC"].balanceOf(mockVault) - usdcBefore
 
-def test_USDC_to_WETH_exact_in_static_slippage():
-    env = getEnvironment(network.show_active())
+def test_USDC_to_WETH_exact_in_static_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
-    env.tokens["USDC"].transfer(mockVault, 2000e6, {"from": env.whales["USDC"]})
+    env.fundAccounts([mockVault], {"USDC": 2000e6})
 
     trade = univ2_trade_exact_in_single(
         env, 
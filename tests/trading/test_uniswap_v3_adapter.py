@@ -1,7 +1,7 @@
 
 import pytest
 import brownie
-from brownie import ZERO_ADDRESS, accounts, network, MockVault
+from brownie import ZERO_ADDRESS, accounts, MockVault
 from brownie.network.state import Chain
 from scripts.common import (
     DEX_ID, 
@@ -11,7 +11,6 @@ from scripts.common import (
     set_dex_flags, 
     set_trade_type_flags
 )
-from scripts.EnvironmentConfig import getEnvironment
 
 chain = Chain()
 
@@ -33,11 +32,10 @@ def univ3_trade_exact_in_batch(sellToken, buyToken, amount, path):
         TRADE_TYPE["EXACT_IN_BATCH"], sellToken, buyToken, amount, 0, deadline, get_univ3_batch_data(path)
     ]
 
-def test_USDC_to_WETH_exact_in_dynamic_slippage():
-    env = getEnvironment(network.show_active())
+def test_USDC_to_WETH_exact_in_dynamic_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
-    env.tokens["USDC"].transfer(mockVault, 100e6, {"from": env.whales["USDC"]})
+    env.fundAccounts([mockVault], {"USDC": 100e6})
 
     trade = univ3_trade_exact_in_single(
         env.tokens["USDC"].address, env.tokens["WETH"].address, env.tokens["USDC"].balanceOf(mockVault), 0, 3000
@@ -61,11 +59,10 @@ def test_USDC_to_WETH_exact_in_dynamic_slippage():
     assert ret.return_value[0] == usdcBefore - env.tokens["USDC"].balanceOf(mockVault)
     assert ret.return_value[1] == env.tokens["WETH"].balanceOf(mockVault) - wethBefore
 
-def test_USDC_to_ETH_exact_in_dynamic_slippage():
-    env = getEnvironment(network.show_active())
+def test_USDC_to_ETH_exact_in_dynamic_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
-    env.tokens["USDC"].transfer(mockVault, 100e6, {"from": env.whales["USDC"]})
+    env.fundAccounts([mockVault], {"USDC": 100e6})
 
     trade = univ3_trade_exact_in_single(
         env.tokens["USDC"].address, ZERO_ADDRESS, env.tokens["USDC"].balanceOf(mockVault), 0, 3000
@@ -89,11 +86,10 @@ def test_USDC_to_ETH_exact_in_dynamic_slippage():
     assert ret.return_value[0] == usdcBefore - env.tokens["USDC"].balanceOf(mockVault)
     assert ret.return_value[1] == mockVault.balance() - ethBefore
 
-def test_USDC_to_WETH_to_DAI_exact_in_dynamic_slippage():
-    env = getEnvironment(network.show_active())
+def test_USDC_to_WETH_to_DAI_exact_in_dynamic_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
-    env.tokens["USDC"].transfer(mockVault, 100e6, {"from": env.whales["USDC"]})
+    env.fundAccounts([mockVault], {"USDC": 100e6})
 
     trade = univ3_trade_exact_in_batch(
         env.tokens["USDC"].address, 
@@ -120,11 +116,10 @@ def test_USDC_to_WETH_to_DAI_exact_in_dynamic_slippage():
     assert ret.return_value[0] == usdcBefore - env.tokens["USDC"].balanceOf(mockVault)
     assert ret.return_value[1] == env.tokens["DAI"].balanceOf(mockVault) - daiBefore
 
-def test_WETH_to_USDC_exact_in_dynamic_slippage():
-    env = getEnvironment(network.show_active())
+def test_WETH_to_USDC_exact_in_dynamic_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
-    env.tokens["WETH"].transfer(mockVault, 1e18, {"from": env.whales["WETH"]})
+    env.fundAccounts([mockVault], {"WETH": 1e18})
 
     trade = univ3_trade_exact_in_single(
         env.tokens["WETH"].address, env.tokens["USDC"].address, env.tokens["WETH"].balanceOf(mockVault), 0, 3000
@@ -148,11 +143,10 @@ def test_WETH_to_USDC_exact_in_dynamic_slippage():
     assert ret.return_value[0] == wethBefore - env.tokens["WETH"].balanceOf(mockVault)
     assert ret.return_value[1] == env.tokens["USDC"].balanceOf(mockVault) - usdcBefore
 
-def test_ETH_to_USDC_exact_in_dynamic_slippage():
-    env = getEnvironment(network.show_active())
+def test_ETH_to_USDC_exact_in_dynamic_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
-    env.whales["ETH_EOA"].transfer(mockVault, 1e18)
+    env.fundAccounts([mockVault], {"ETH": 1e18})
 
     trade = univ3_trade_exact_in_single(
         ZERO_ADDRESS, env.tokens["USDC"].address, mockVault.balance(), 0, 3000
@@ -176,11 +170,10 @@ def test_ETH_to_USDC_exact_in_dynamic_slippage():
     assert ret.return_value[0] == ethBefore - mockVault.balance()
     assert ret.return_value[1] == env.tokens["USDC"].balanceOf(mockVault) - usdcBefore
 
-def test_ETH_to_USDC_to_DAI_exact_in_dynamic_slippage():
-    env = getEnvironment(network.show_active())
+def test_ETH_to_USDC_to_DAI_exact_in_dynamic_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
-    env.whales["ETH_EOA"].transfer(mockVault, 1e18)
+    env.fundAccounts([mockVault], {"ETH": 1e18})
 
     tradePath = [env.tokens["WETH"].address, 3000, env.tokens["USDC"].address, 3000, env.tokens["DAI"].address]
     trade = univ3_trade_exact_in_batch(ZERO_ADDRESS, env.tokens["DAI"].address, mockVault.balance(), tradePath)
@@ -209,11 +202,10 @@ def test_ETH_to_USDC_to_DAI_exact_in_dynamic_slippage():
     assert ret.return_value[0] == ethBefore - mockVault.balance()
     assert ret.return_value[1] == env.tokens["DAI"].balanceOf(mockVault) - daiBefore
 
-def test_USDC_to_WETH_exact_in_static_slippage():
-    env = getEnvironment(network.show_active())
+def test_USDC_to_WETH_exact_in_static_slippage(env):
     mockVault = MockVault.deploy(env.tradingModule, {"from": accounts[0]})
 
-    env.tokens["USDC"].transfer(mockVault, 2000e6, {"from": env.whales["USDC"]})
+    env.fundAccounts([mockVault], {"USDC": 2000e6})
 
     trade = univ3_trade_exact_in_single(
         env.tokens["USDC"].address, 